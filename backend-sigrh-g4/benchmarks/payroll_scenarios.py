@@ -0,0 +1,232 @@
+"""
+Escenarios del benchmark de liquidación (ver `benchmarks.payroll_benchmark`).
+
+Este módulo importa `src`, así que solo se importa después de configurar la
+URL de la base de datos.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Callable, Iterator
+from sqlalchemy import event, func
+from sqlmodel import Session, SQLModel, select
+from src.database.core import engine, init_db
+
+# Tablas que no importa `src.database.core` pero que referencia Employee
+from src.modules.face_recognition.models.face_recognition import FaceRecognition  # noqa: F401
+from src.modules.role.models.role_models import Role  # noqa: F401
+
+from src.modules.clock_events.models.models import ClockEvents
+from src.modules.clock_events.schemas.schemas import ClockEventRequest
+from src.modules.clock_events.services import services as clock_events_service
+from src.modules.employees.models.employee import Employee
+from src.modules.payroll_calculator import service
+from src.modules.payroll_calculator.schemas import (
+    PayrollBatchRequest,
+    PayrollMode,
+    PayrollRecalculateRequest,
+    PayrollRequest,
+)
+from benchmarks.payroll_synthetic import SyntheticPopulation, generate_population
+
+
+@dataclass
+class Measurement:
+    scenario: str
+    queries: int
+    commits: int
+    wall_seconds: float
+    peak_memory_mb: float
+
+
+class Counters:
+    def __init__(self):
+        self.queries = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self.on_query)
+        event.listen(engine, "commit", self.on_commit)
+
+    def on_query(self, *args) -> None:
+        self.queries += 1
+
+    def on_commit(self, *args) -> None:
+        self.commits += 1
+
+
+COUNTERS = Counters()
+
+
+@contextmanager
+def measure(scenario: str, results: list[Measurement]) -> Iterator[None]:
+    queries, commits = COUNTERS.queries, COUNTERS.commits
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(
+            Measurement(
+                scenario=scenario,
+                queries=COUNTERS.queries - queries,
+                commits=COUNTERS.commits - commits,
+                wall_seconds=round(wall, 4),
+                peak_memory_mb=round(peak / 1024 / 1024, 2),
+            )
+        )
+
+
+def prepare_database(args: argparse.Namespace) -> None:
+    if args.reset:
+        SQLModel.metadata.drop_all(engine)
+    init_db()
+    with Session(engine) as db:
+        if db.exec(select(func.count()).select_from(Employee)).one():
+            sys.exit("The database is not empty, use --reset to recreate it")
+
+
+def change_clock_events(
+    db: Session, population: SyntheticPopulation, count: int, seed: int
+) -> None:
+    """Simula correcciones del día a día a través del servicio de fichadas."""
+    rnd = random.Random(seed)
+    event_ids = db.exec(
+        select(ClockEvents.id).where(
+            ClockEvents.employee_id.in_(population.employee_ids)  # type: ignore
+        )
+    ).all()
+    for event_id in rnd.sample(list(event_ids), min(count, len(event_ids))):
+        clock_event = clock_events_service.get_clock_event_by_id(db, event_id)
+        if clock_event is None:
+            continue
+        if rnd.random() < 0.5:
+            clock_events_service.delete_clock_event(db, event_id)
+        else:
+            clock_events_service.patch_clock_event(
+                db,
+                event_id,
+                ClockEventRequest(
+                    employee_id=clock_event.employee_id,
+                    event_date=clock_event.event_date + timedelta(minutes=rnd.randint(-45, 45)),
+                    event_type=clock_event.event_type,
+                    source=clock_event.source,
+                    device_id=clock_event.device_id,
+                ),
+            )
+
+
+def run_scenario(
+    name: str,
+    results: list[Measurement],
+    action: Callable[[Session], object],
+    repeat: int,
+) -> None:
+    for _ in range(repeat):
+        # Sesión nueva por corrida, como en un request
+        with Session(engine) as db:
+            with measure(name, results):
+                action(db)
+
+
+def summarize(results: list[Measurement]) -> list[Measurement]:
+    """Mediana de tiempo y máximos de memoria por escenario."""
+    by_scenario: dict[str, list[Measurement]] = {}
+    for measurement in results:
+        by_scenario.setdefault(measurement.scenario, []).append(measurement)
+    summary = []
+    for scenario, runs in by_scenario.items():
+        walls = sorted(run.wall_seconds for run in runs)
+        summary.append(
+            Measurement(
+                scenario=scenario,
+                queries=max(run.queries for run in runs),
+                commits=max(run.commits for run in runs),
+                wall_seconds=walls[len(walls) // 2],
+                peak_memory_mb=max(run.peak_memory_mb for run in runs),
+            )
+        )
+    return summary
+
+
+def run(args: argparse.Namespace) -> None:
+    prepare_database(args)
+    with Session(engine) as db:
+        start = time.perf_counter()
+        population = generate_population(
+            db, args.employees, args.start_date, args.days, args.seed
+        )
+        generation_seconds = time.perf_counter() - start
+
+    results: list[Measurement] = []
+    start_date, end_date = population.start_date, population.end_date
+
+    run_scenario(
+        "single employee",
+        results,
+        lambda db: service.calculate_hours(
+            db,
+            PayrollRequest(
+                employee_id=population.employee_ids[0],
+                start_date=start_date,
+                end_date=end_date,
+            ),
+        ),
+        args.repeat,
+    )
+    for mode in args.modes:
+        run_scenario(
+            f"whole company ({mode})",
+            results,
+            lambda db, mode=mode: service.calculate_hours_batch(
+                db,
+                PayrollBatchRequest(
+                    start_date=start_date, end_date=end_date, mode=PayrollMode(mode)
+                ),
+            ),
+            args.repeat,
+        )
+
+    def incremental(db: Session) -> None:
+        change_clock_events(db, population, args.changed_events, args.seed)
+        with measure("incremental recompute", results):
+            service.recalculate_dirty_days(db, PayrollRecalculateRequest())
+
+    for _ in range(args.repeat):
+        with Session(engine) as db:
+            incremental(db)
+
+    summary = summarize(results)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "database": engine.name,
+                    "employees": args.employees,
+                    "days": args.days,
+                    "events": population.events,
+                    "results": [asdict(measurement) for measurement in summary],
+                },
+                indent=2,
+            )
+        )
+        return
+
+    print(
+        f"{engine.name}: {args.employees} employees, {args.days} days, "
+        f"{population.events} clock events (generated in {generation_seconds:.2f}s)"
+    )
+    print(f"{'scenario':<32}{'queries':>9}{'commits':>9}{'wall (s)':>11}{'peak (MB)':>11}")
+    for measurement in summary:
+        print(
+            f"{measurement.scenario:<32}{measurement.queries:>9}{measurement.commits:>9}"
+            f"{measurement.wall_seconds:>11.4f}{measurement.peak_memory_mb:>11.2f}"
+        )
@@ -0,0 +1,181 @@
+"""
+Generador de datos sintéticos para los benchmarks de liquidación.
+
+Crea un sector, un puesto, los tres tipos de turno y una población de
+empleados con fichadas realistas: jornadas normales, ausencias, salidas
+faltantes, fichadas duplicadas y turnos que cruzan la medianoche. Con la misma
+semilla genera siempre los mismos datos.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlmodel import Session, insert
+from src.modules.clock_events.models.models import ClockEvents
+from src.modules.clock_events.schemas.schemas import ClockEventTypes
+from src.modules.employees.models.country import Country
+from src.modules.employees.models.employee import Employee
+from src.modules.employees.models.job import Job
+from src.modules.employees.models.sector import Sector
+from src.modules.employees.models.state import State
+from src.modules.shift.models.models import Shift
+
+
+@dataclass(frozen=True)
+class ShiftProfile:
+    description: str
+    type: str
+    working_hours: float
+    working_days: int
+    # Hora habitual de entrada
+    start_hour: int
+
+
+SHIFT_PROFILES = (
+    ShiftProfile("Mañana", "matutino", 8, 5, 8),
+    ShiftProfile("Tarde", "vespertino", 8, 6, 16),
+    ShiftProfile("Noche", "nocturno", 8, 7, 22),
+)
+
+
+@dataclass(frozen=True)
+class EventProfile:
+    """Probabilidades por día de los casos que tiene que manejar el cálculo."""
+
+    absence: float = 0.06
+    missing_out: float = 0.04
+    duplicate_in: float = 0.03
+    duplicate_out: float = 0.03
+    # Fichada suelta (p. ej. salida al almuerzo) en medio de la jornada
+    stray_event: float = 0.05
+
+
+@dataclass(frozen=True)
+class SyntheticPopulation:
+    employee_ids: list[int]
+    start_date: date
+    end_date: date
+    events: int
+
+
+def clock_events_for_day(
+    rnd: random.Random, employee_id: int, day: date, shift: ShiftProfile, profile: EventProfile
+) -> list[dict]:
+    if day.weekday() >= shift.working_days or rnd.random() < profile.absence:
+        return []
+
+    def event(event_date: datetime, event_type: ClockEventTypes) -> dict:
+        return {
+            "employee_id": employee_id,
+            "event_date": event_date,
+            "event_type": event_type,
+            "source": "benchmark",
+            "device_id": "synthetic",
+        }
+
+    check_in = datetime.combine(day, time(shift.start_hour)) + timedelta(
+        minutes=rnd.randint(-30, 30), seconds=rnd.choice((0, 15, 30, 45))
+    )
+    # Entre media jornada y jornada larga: faltante, completa y horas extra
+    worked = timedelta(
+        minutes=rnd.choice((240, 420, 470, 480, 490, 520, 600)) + rnd.randint(0, 9)
+    )
+    check_out = check_in + worked
+
+    events = [event(check_in, ClockEventTypes.IN)]
+    if rnd.random() < profile.duplicate_in:
+        events.append(event(check_in + timedelta(seconds=20), ClockEventTypes.IN))
+    if rnd.random() < profile.stray_event:
+        events.append(event(check_in + worked / 2, ClockEventTypes.OUT))
+    if rnd.random() >= profile.missing_out:
+        events.append(event(check_out, ClockEventTypes.OUT))
+        if rnd.random() < profile.duplicate_out:
+            events.append(event(check_out + timedelta(seconds=30), ClockEventTypes.OUT))
+    return events
+
+
+def generate_population(
+    db: Session,
+    employees: int,
+    start_date: date,
+    days: int,
+    seed: int = 0,
+    profile: EventProfile = EventProfile(),
+) -> SyntheticPopulation:
+    """
+    Inserta la población en la base y devuelve los IDs creados. Las fichadas
+    cubren también el día siguiente al período, como en producción.
+    """
+    rnd = random.Random(seed)
+
+    country = Country(name=f"Benchmark {seed}")
+    db.add(country)
+    db.flush()
+    state = State(name="Benchmark", country_id=country.id)
+    sector = Sector(name=f"Benchmark {seed}")
+    db.add_all([state, sector])
+    db.flush()
+    job = Job(name="Benchmark", sector_id=sector.id)
+    db.add(job)
+    db.flush()
+
+    shifts = [
+        Shift(
+            description=profile_.description,
+            type=profile_.type,
+            working_hours=profile_.working_hours,
+            working_days=profile_.working_days,
+        )
+        for profile_ in SHIFT_PROFILES
+    ]
+    db.add_all(shifts)
+    db.flush()
+
+    employee_rows = [
+        {
+            "user_id": f"bench-{seed}-{i}",
+            "first_name": "Empleado",
+            "last_name": str(i),
+            "dni": f"bench-{seed}-{i}",
+            "type_dni": "DNI",
+            "personal_email": f"bench-{seed}-{i}@example.com",
+            "active": True,
+            "phone": f"{seed:04d}{i:08d}",
+            "salary": Decimal(1000),
+            "job_id": job.id,
+            "birth_date": date(1990, 1, 1),
+            "hire_date": start_date,
+            "address_street": "Calle",
+            "address_city": "Ciudad",
+            "address_cp": "1000",
+            "address_state_id": state.id,
+            "address_country_id": country.id,
+            "shift_id": shifts[i % len(shifts)].id,
+        }
+        for i in range(employees)
+    ]
+    employee_ids = list(
+        db.scalars(insert(Employee).returning(Employee.id), employee_rows)  # type: ignore
+    )
+
+    end_date = start_date + timedelta(days=days - 1)
+    event_rows = []
+    for i, employee_id in enumerate(employee_ids):
+        shift = SHIFT_PROFILES[i % len(SHIFT_PROFILES)]
+        for offset in range(days + 1):
+            event_rows.extend(
+                clock_events_for_day(
+                    rnd, employee_id, start_date + timedelta(days=offset), shift, profile
+                )
+            )
+    if event_rows:
+        db.execute(insert(ClockEvents.__table__), event_rows)  # type: ignore
+    db.commit()
+
+    return SyntheticPopulation(
+        employee_ids=employee_ids,
+        start_date=start_date,
+        end_date=end_date,
+        events=len(event_rows),
+    )
@@ -1,20 +1,42 @@
-from fastapi import APIRouter, status
+from dataclasses import asdict
+from fastapi import APIRouter, Response, status
 from src.database.core import DatabaseSession
 from src.cv_matching import matcher_service
 from src.cv_matching import schema
+from src.cv_matching.nlp_models import model_registry
 from typing import List
 
 
 matcher_router = APIRouter(prefix="/matcher", tags=["Skills matcher"])
 
 
+@matcher_router.get(
+    "/health",
+    status_code=status.HTTP_200_OK,
+    response_model=schema.MatcherHealthResponse,
+)
+def get_matcher_health(response: Response):
+    ready = model_registry.is_ready()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return schema.MatcherHealthResponse(
+        ready=ready,
+        lazy=model_registry.lazy,
+        models=[
+            schema.NlpModelStatus(**asdict(model_status))
+            for model_status in model_registry.status()
+        ],
+    )
+
+
 @matcher_router.get(
     "/{job_opportunity_id}",
     status_code=status.HTTP_200_OK,
     response_model=List[schema.MatcherResponse],
 )
-async def evaluate_candidates(db: DatabaseSession, job_opportunity_id: int):
-    return matcher_service.evaluate_candidates(
-        db,
-        job_opportunity_id,
-    )
+def evaluate_candidates(
+    db: DatabaseSession,
+    job_opportunity_id: int,
+    mode: schema.MatcherMode = schema.MatcherMode.STANDARD,
+):
+    return matcher_service.evaluate_candidates(db, job_opportunity_id, mode)
@@ -1,9 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from multiprocessing import get_context
+from os import cpu_count, getenv
+from threading import Lock
 from spacy.language import Language
-from spacy.tokens import Doc
-from spacy.tokens.span import Span
-from spacy.matcher import PhraseMatcher
-from sqlmodel import select
+from spacy.tokens import Doc, Token
+from sqlmodel import col, select
 from src.database.core import DatabaseSession
 from src.modules.opportunity.models.job_opportunity_models import JobOpportunityModel
 from src.modules.opportunity.schemas.job_opportunity_schemas import (
@@ -11,22 +14,35 @@ from src.modules.opportunity.schemas.job_opportunity_schemas import (
 )
 from src.modules.opportunity.services import opportunity_service
 from src.modules.postulation.models.postulation_models import Postulation
-from src.modules.cv_matching import matcher_schema
+from src.cv_matching import schema
+from src.cv_matching.models import PostulationCvText
+from src.cv_matching.phrase_matchers import CompiledPhrases, phrase_matcher_cache
+from src.cv_matching.nlp_models import ENGLISH_MODEL, SPANISH_MODEL, model_registry
 from fastapi import status, HTTPException
-from typing import List, Any
+from typing import Iterable, List, Any, cast
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.optimize import linear_sum_assignment
+import numpy
 import pymupdf
 import unicodedata
 import string
-import spacy
 import base64
+import hashlib
 import logging
 import re
-import itertools
+from dataclasses import dataclass
 from datetime import datetime
 from pypdf import PdfReader
 
 logger = logging.getLogger("uvicorn.error")
 
+PROCESS_WORKERS = int(getenv("MATCHER_PROCESS_WORKERS", str(cpu_count() or 1)))
+# Varios lotes por proceso para repartir mejor CVs más o menos largos
+SHARDS_PER_WORKER = 4
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_lock = Lock()
+
 
 def get_all_abilities(
     db: DatabaseSession, job_opportunity_id: int
@@ -67,9 +83,249 @@ def extract_text_from_pdf(base64_pdf: str) -> str:
     return texto
 
 
+def clean_cv_file(cv_file: str) -> str:
+    return cv_file.replace("\n", "").strip()
+
+
+def cv_content_hash(cv_file: str) -> str:
+    return hashlib.sha256(clean_cv_file(cv_file).encode("ascii")).hexdigest()
+
+
+def get_cached_cv_texts(
+    db: DatabaseSession, postulation_ids: list[int]
+) -> dict[int, PostulationCvText]:
+    return {
+        cv_text.postulation_id: cv_text
+        for cv_text in db.exec(
+            select(PostulationCvText).where(
+                col(PostulationCvText.postulation_id).in_(postulation_ids)
+            )
+        ).all()
+    }
+
+
+@dataclass(frozen=True)
+class CvWork:
+    """CV a evaluar: el texto guardado si sigue vigente o, si no, el PDF a extraer."""
+
+    postulation_id: int
+    cached_text: str | None
+    cv_file: str | None
+
+
+@dataclass(frozen=True)
+class CvEvaluation:
+    postulation_id: int
+    required_match: dict[str, Any]
+    desired_match: dict[str, Any]
+    # Texto extraído del PDF en esta evaluación; None si se usó el guardado
+    extracted_text: str | None
+
+
+@dataclass(frozen=True)
+class MatchCriteria:
+    job_opportunity_id: int
+    # Habilidades ya normalizadas
+    required_abilities: list[str]
+    desired_abilities: list[str]
+    required_percentage: float
+    desired_percentage: float
+
+
+@dataclass(frozen=True)
+class OpportunityMatcher:
+    """Todo lo que se prepara una vez por oferta para evaluar sus CVs."""
+
+    criteria: MatchCriteria
+    model: Language
+    required: list["AbilityAnalysis"]
+    desired: list["AbilityAnalysis"]
+    phrases: CompiledPhrases
+
+
+def get_cv_work(
+    postulation: Postulation, cached: dict[int, PostulationCvText]
+) -> CvWork:
+    """
+    Solo hace falta extraer el texto del PDF si no hay texto guardado o si
+    `cv_file` cambió desde la última extracción.
+    """
+    postulation_id = cast(int, postulation.id)
+    cv_text = cached.get(postulation_id)
+    if cv_text is not None and cv_text.content_hash == cv_content_hash(postulation.cv_file):
+        logger.info(f"Using cached CV text of postulation {postulation_id}")
+        return CvWork(postulation_id=postulation_id, cached_text=cv_text.text, cv_file=None)
+    return CvWork(postulation_id=postulation_id, cached_text=None, cv_file=postulation.cv_file)
+
+
+def save_cv_text(
+    db: DatabaseSession,
+    postulation: Postulation,
+    text: str,
+    cached: dict[int, PostulationCvText],
+) -> None:
+    """Deja el texto extraído en la sesión; se guarda con el commit de la evaluación."""
+    postulation_id = cast(int, postulation.id)
+    cv_text = cached.get(postulation_id)
+    if cv_text is None:
+        cv_text = PostulationCvText(postulation_id=postulation_id, content_hash="", text="")
+        cached[postulation_id] = cv_text
+    cv_text.content_hash = cv_content_hash(postulation.cv_file)
+    cv_text.text = text
+    cv_text.extracted_at = datetime.now()
+    db.add(cv_text)
+
+
+def get_model() -> Language:
+    try:
+        return load_spanish_model()
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Language model is not available",
+        )
+
+
+def build_opportunity_matcher(criteria: MatchCriteria, model: Language) -> OpportunityMatcher:
+    required = analyze_abilities(criteria.required_abilities, model)
+    desired = analyze_abilities(criteria.desired_abilities, model)
+    phrases = phrase_matcher_cache.get(
+        criteria.job_opportunity_id,
+        criteria.required_abilities + criteria.desired_abilities,
+        model,
+    )
+    return OpportunityMatcher(
+        criteria=criteria, model=model, required=required, desired=desired, phrases=phrases
+    )
+
+
+def evaluate_cv(work: CvWork, matcher: OpportunityMatcher) -> CvEvaluation:
+    extracted_text = None
+    if work.cached_text is not None:
+        normalized_text = work.cached_text
+    else:
+        extracted_text = normalize(extract_text_from_pdf(clean_cv_file(cast(str, work.cv_file))))
+        normalized_text = extracted_text
+    logger.info(f"Normalized PDF text:\n{normalized_text}")
+
+    cv_analysis = analyze_cv(normalized_text, matcher.model, matcher.phrases)
+    return CvEvaluation(
+        postulation_id=work.postulation_id,
+        required_match=match_abilities(
+            cv_analysis,
+            matcher.required,
+            similarity_threshold=0.79,
+            minimum_percentage=matcher.criteria.required_percentage,
+        ),
+        desired_match=match_abilities(
+            cv_analysis,
+            matcher.desired,
+            similarity_threshold=0.79,
+            minimum_percentage=matcher.criteria.desired_percentage,
+        ),
+        extracted_text=extracted_text,
+    )
+
+
+def evaluate_standard(criteria: MatchCriteria, works: list[CvWork]) -> list[CvEvaluation]:
+    matcher = build_opportunity_matcher(criteria, get_model())
+    return [evaluate_cv(work, matcher) for work in works]
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: el servidor ya tiene hilos y hacer fork de un proceso con
+            # hilos no es seguro. Cada worker carga el modelo al iniciar y lo
+            # conserva para las evaluaciones siguientes
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PROCESS_WORKERS,
+                mp_context=get_context("spawn"),
+                initializer=load_spanish_model,
+            )
+        return _process_pool
+
+
+def reset_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def evaluate_shard(criteria: MatchCriteria, shard: list[CvWork]) -> list[CvEvaluation]:
+    """
+    Corre en un proceso del pool, sin sesión de base de datos: el texto
+    extraído y los resultados los guarda el proceso padre.
+    """
+    matcher = build_opportunity_matcher(criteria, load_spanish_model())
+    return [evaluate_cv(work, matcher) for work in shard]
+
+
+def evaluate_parallel(criteria: MatchCriteria, works: list[CvWork]) -> list[CvEvaluation]:
+    if PROCESS_WORKERS < 2 or len(works) < 2:
+        return evaluate_standard(criteria, works)
+
+    shard_size = -(-len(works) // (PROCESS_WORKERS * SHARDS_PER_WORKER))
+    shards = [works[i : i + shard_size] for i in range(0, len(works), shard_size)]
+
+    pool = get_process_pool()
+    futures = [pool.submit(evaluate_shard, criteria, shard) for shard in shards]
+    try:
+        # Propaga el error del worker, si lo hubo. Se arma el resultado en
+        # el orden de las postulaciones, no en el de llegada
+        return [evaluation for future in futures for evaluation in future.result()]
+    except BrokenProcessPool:
+        # Un worker murió (p. ej. sin memoria o sin poder cargar el modelo):
+        # el pool ya no sirve, se recrea en la próxima evaluación
+        reset_process_pool()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def save_evaluation(
+    db: DatabaseSession,
+    postulation: Postulation,
+    evaluation: CvEvaluation,
+    cached: dict[int, PostulationCvText],
+) -> schema.MatcherResponse:
+    if evaluation.extracted_text is not None:
+        save_cv_text(db, postulation, evaluation.extracted_text, cached)
+
+    required_words_match = evaluation.required_match
+    desired_words_match = evaluation.desired_match
+    suitable = required_words_match["SUITABLE"] and desired_words_match["SUITABLE"]
+
+    postulation.evaluated_at = datetime.now()
+    postulation.suitable = suitable
+    postulation.ability_match = {
+        "required_words_found": required_words_match["WORDS_FOUND"],
+        "desired_words_found": desired_words_match["WORDS_FOUND"],
+        "required_words_not_found": required_words_match["WORDS_NOT_FOUND"],
+        "desired_words_not_found": desired_words_match["WORDS_NOT_FOUND"],
+    }
+
+    return schema.MatcherResponse(
+        postulation_id=postulation.id,
+        name=postulation.name,
+        surname=postulation.surname,
+        suitable=suitable,
+        required_words_found=required_words_match["WORDS_FOUND"],
+        desired_words_found=desired_words_match["WORDS_FOUND"],
+        required_words_not_found=required_words_match["WORDS_NOT_FOUND"],
+        desired_words_not_found=desired_words_match["WORDS_NOT_FOUND"],
+    )
+
+
 def evaluate_candidates(
-    db: DatabaseSession, job_opportunity_id: int
-) -> List[matcher_schema.MatcherResponse]:
+    db: DatabaseSession,
+    job_opportunity_id: int,
+    mode: schema.MatcherMode = schema.MatcherMode.STANDARD,
+) -> List[schema.MatcherResponse]:
     job_opportunity = db.exec(
         select(JobOpportunityModel).where(JobOpportunityModel.id == job_opportunity_id)
     ).one()
@@ -87,58 +343,30 @@ def evaluate_candidates(
             detail=f"No hay postulaciones para la oferta laboral {job_opportunity_id}",
         )
     abilities = get_all_abilities(db, job_opportunity_id)
-    model = load_spanish_model()
-
-    desired_abilities = extract_desirable_abilities(abilities)
-    required_abilities = extract_required_abilities(abilities)
-
-    normalized_required_words = normalize_words(required_abilities)
-    normalized_desired_words = normalize_words(desired_abilities)
-
-    response: list[matcher_schema.MatcherResponse] = []
-
-    for postulation in postulations:
-        normalized_text = normalize(
-            extract_text_from_pdf(postulation.cv_file.replace("\n", "").strip())
-        )
-        logger.info(f"Normalized PDF text:\n{normalized_text}")
-        required_words_match = match_abilities(
-            normalized_text,
-            normalized_required_words,
-            model,
-            similarity_threshold=0.79,
-            minimum_percentage=job_opportunity.required_skill_percentage,
-        )
-        desired_words_match = match_abilities(
-            normalized_text,
-            normalized_desired_words,
-            model,
-            similarity_threshold=0.79,
-            minimum_percentage=job_opportunity.desirable_skill_percentage,
-        )
-        suitable = required_words_match["SUITABLE"] and desired_words_match["SUITABLE"]
-
-        matcher = schema.MatcherResponse(
-            postulation_id=postulation.id,
-            name=postulation.name,
-            surname=postulation.surname,
-            suitable=suitable,
-            required_words_found=required_words_match["WORDS_FOUND"],
-            desired_words_found=desired_words_match["WORDS_FOUND"],
-            required_words_not_found=required_words_match["WORDS_NOT_FOUND"],
-            desired_words_not_found=desired_words_match["WORDS_NOT_FOUND"],
-        )
-        response.append(matcher)
-
-        postulation.evaluated_at = datetime.now()
-        postulation.suitable = suitable
-        postulation.ability_match = {
-            "required_words_found": required_words_match["WORDS_FOUND"],
-            "desired_words_found": desired_words_match["WORDS_FOUND"],
-            "required_words_not_found": required_words_match["WORDS_NOT_FOUND"],
-            "desired_words_not_found": desired_words_match["WORDS_NOT_FOUND"],
-        }
 
+    criteria = MatchCriteria(
+        job_opportunity_id=job_opportunity_id,
+        required_abilities=normalize_words(extract_required_abilities(abilities)),
+        desired_abilities=normalize_words(extract_desirable_abilities(abilities)),
+        required_percentage=job_opportunity.required_skill_percentage,
+        desired_percentage=job_opportunity.desirable_skill_percentage,
+    )
+    cached_cv_texts = get_cached_cv_texts(
+        db, [cast(int, postulation.id) for postulation in postulations]
+    )
+    works = [get_cv_work(postulation, cached_cv_texts) for postulation in postulations]
+
+    if mode == schema.MatcherMode.PARALLEL:
+        evaluations = evaluate_parallel(criteria, works)
+    else:
+        evaluations = evaluate_standard(criteria, works)
+
+    # Un solo escritor: los resultados (de este proceso o del pool) se
+    # guardan acá, con un único commit
+    response = [
+        save_evaluation(db, postulation, evaluation, cached_cv_texts)
+        for postulation, evaluation in zip(postulations, evaluations)
+    ]
     db.commit()
 
     return response
@@ -177,31 +405,161 @@ def normalize_words(words: list[str]) -> list[str]:
     return normalized_words
 
 
-def match_phrase(tokens: Doc, ability: str, model: Language) -> bool:
-    matcher = PhraseMatcher(model.vocab, attr="LOWER")
-    matcher.add("TerminologyList", [model.make_doc(ability)])
-
-    matches = matcher(tokens)
-    matches_list: list[Span] = []
-    if not matches:
-        logger.info(f"Did not find {ability} with PhraseMatcher")
-        return False
-
-    for match_id, start, end in matches:
-        span = tokens[start:end]
-        matches_list.append(span)
-        logger.info(f"Matched phrase: {span} (start: {start}, end: {end})")
-
-    if len(matches_list) > 0:
-        logger.info(f"Ability {ability} found with PhraseMatcher {len(matches_list)} times")
-        return True
-    else:
-        return False
+# Lemas propios que unifican sustantivos, abreviaturas y sinónimos técnicos
+CUSTOM_LEMMAS = {
+    "lic": "licenciatura",
+    "tec": "tecnicatura",
+    "ing": "ingenieria",
+    "definicion": "definir",
+    "capacitacion": "capacitar",
+    "definiciones": "definir",
+    "organizacion": "organizar",
+    "organizaciones": "organizar",
+    "resolucion": "resolver",
+    "resoluciones": "resolver",
+    "ejecucion": "ejecutar",
+    "ejecuciones": "ejecutar",
+    "educacion": "educar",
+    "educaciones": "educar",
+    "analisis": "analizar",
+    "construccion": "construir",
+    "construcciones": "construir",
+    "produccion": "producir",
+    "producciones": "producir",
+    "evaluacion": "evaluar",
+    "evaluaciones": "evaluar",
+    "informacion": "informar",
+    "revision": "revisar",
+    "revisiones": "revisar",
+    "desarrollo": "desarrollar",
+    "desarrollos": "desarrollar",
+    "programacion": "programar",
+    "programaciones": "programar",
+    "implementacion": "implementar",
+    "implementaciones": "implementar",
+    "diseno": "disenar",
+    "disenos": "disenar",
+    "configuracion": "configurar",
+    "configuraciones": "configurar",
+    "integracion": "integrar",
+    "integraciones": "integrar",
+    "mantenimiento": "mantener",
+    "automatizacion": "automatizar",
+    "automatizaciones": "automatizar",
+    "optimizacion": "optimizar",
+    "optimizaciones": "optimizar",
+    "pruebas": "probar",
+    "testing": "probar",
+    "despliegue": "desplegar",
+    "despliegues": "desplegar",
+    "soporte": "soportar",
+    "migracion": "migrar",
+    "migraciones": "migrar",
+    "documentacion": "documentar",
+    "depuracion": "depurar",
+    "refactorizacion": "refactorizar",
+    "innovacion": "innovar",
+    "actualizacion": "actualizar",
+    "prueba": "probar",
+    "integracioncontinua": "integrar",
+    "desplieguecontinuo": "desplegar",
+    "postgres": "sql",
+    "postgresql": "sql",
+    "mariadb": "sql",
+    "mysql": "sql",
+    "adm": "administrar",
+    "administracion": "administrar",
+    "administraciones": "administrar",
+    "comunicacion": "comunicar",
+    "comunicaciones": "comunicar",
+    "liderazgo": "liderar",
+    "gestion": "gestionar",
+    "gestiones": "gestionar",
+    "estrategia": "estrategizar",
+    "estrategias": "estrategizar",
+    "planificacion": "planificar",
+    "planificaciones": "planificar",
+    "innovaciones": "innovar",
+    "experiencia": "experimentar",
+    "coordinacion": "coordinar",
+    "coordinaciones": "coordinar",
+    "proyecto": "proyectar",
+    "proyectos": "proyectar",
+    "code": "codigo",
+}
+
+# Componentes del pipeline que el matcher no usa: solo hacen falta lemas,
+# categorías gramaticales y vectores
+UNUSED_COMPONENTS = ["parser", "ner"]
+
+
+@dataclass
+class CvAnalysis:
+    """Análisis de un CV, hecho una sola vez y compartido por todas las habilidades."""
+
+    tokens_text: set[str]
+    # Habilidades encontradas por el PhraseMatcher de la oferta
+    phrase_hits: set[str]
+    # Lemas normalizados (ver `normalized_lemmas`) y sus vectores unitarios
+    lemma_doc: Doc
+    vectors: numpy.ndarray
+    has_vector: numpy.ndarray
+
+
+@dataclass
+class AbilityAnalysis:
+    """Análisis de una habilidad ya normalizada, hecho una vez por evaluación."""
+
+    name: str
+    lemma_doc: Doc
+    # None si la habilidad no tiene lemas o alguno no tiene vector
+    vectors: numpy.ndarray | None
+
+
+def normalized_lemmas(doc: Doc) -> list[str]:
+    return [CUSTOM_LEMMAS.get(token.lemma_, token.lemma_) for token in doc if token.text.strip() and token.lemma_.strip() and not token.is_stop and token.pos_ != "ADP"]
+
+
+def analyze_cv(text: str, model: Language, phrases: CompiledPhrases) -> CvAnalysis:
+    """
+    Corre el pipeline una sola vez sobre el CV. Los docs derivados solo
+    necesitan el tokenizador: los vectores no dependen del contexto.
+    """
+    tokens_text = [token.text for token in model.make_doc(text) if token.text.strip()]
+    logger.info(f"Tokens: {tokens_text}")
+    doc = model(" ".join(tokens_text), disable=UNUSED_COMPONENTS)
+
+    lemmas = normalized_lemmas(doc)
+    logger.info(f"Norm tokens: {lemmas}")
+    lemma_doc = model.make_doc(" ".join(lemmas))
+    vectors = unit_vectors(lemma_doc, model.vocab.vectors_length)
+    return CvAnalysis(
+        tokens_text=set(tokens_text),
+        phrase_hits=phrases.find(doc),
+        lemma_doc=lemma_doc,
+        vectors=vectors,
+        has_vector=vectors.any(axis=1),
+    )
+
+
+def analyze_abilities(abilities: list[str], model: Language) -> list[AbilityAnalysis]:
+    analyses: list[AbilityAnalysis] = []
+    for ability, doc in zip(abilities, model.pipe(abilities, disable=UNUSED_COMPONENTS)):
+        lemma_doc = model.make_doc(" ".join(normalized_lemmas(doc)))
+        usable = len(lemma_doc) > 0 and all(token.has_vector for token in lemma_doc)
+        analyses.append(
+            AbilityAnalysis(
+                name=ability,
+                lemma_doc=lemma_doc,
+                vectors=unit_vectors(lemma_doc, model.vocab.vectors_length) if usable else None,
+            )
+        )
+    return analyses
 
 
-def match_abilities(text: str, abilities: list[str], model: Language, *, similarity_threshold: float, minimum_percentage: float):
+def match_abilities(cv: CvAnalysis, abilities: list[AbilityAnalysis], *, similarity_threshold: float, minimum_percentage: float):
     """
-    Verifica si las habilidades se encuentran en `text`, usando el umbral de similaridad especificado.
+    Verifica si las habilidades se encuentran en el CV, usando el umbral de similaridad especificado.
     Devuelve las listas de palabras encontradas y no encontradas y el valor booleano Suitable en base
     al mínimo porcentaje requerido del total de habilidades.
     """
@@ -209,192 +567,139 @@ def match_abilities(text: str, abilities: list[str], model: Language, *, similar
     if minimum_percentage < 0:
         raise ValueError("minimum_percentage must be a positive value or zero")
 
-    logger.info(f"Finding required abilities {abilities} with threshold {similarity_threshold} and minimum percentage {minimum_percentage}")
+    logger.info(f"Finding required abilities {[ability.name for ability in abilities]} with threshold {similarity_threshold} and minimum percentage {minimum_percentage}")
 
-    doc: Doc = model(text)
-    tokens_text = [token.text for token in doc if token.text.strip()]
-    doc = model(" ".join(tokens_text))
-    logger.info(f"Tokens: {tokens_text}")
+    found = [False] * len(abilities)
+    semantic_indexes: list[int] = []
 
+    for i, ability in enumerate(abilities):
+        logger.info(f"Matching ability {ability.name}")
 
+        if ability.name in cv.tokens_text:
+            found[i] = True
+            logger.info(f"Found ability {ability.name} in tokens")
+        elif ability.name in cv.phrase_hits:
+            found[i] = True
+            logger.info(f"Found ability {ability.name} with PhraseMatcher")
+        else:
+            semantic_indexes.append(i)
+
+    if semantic_indexes:
+        semantic_found = match_semantic_abilities(
+            cv, [abilities[i] for i in semantic_indexes], similarity_threshold
+        )
+        for i, ability_found in zip(semantic_indexes, semantic_found):
+            found[i] = ability_found
 
     result: dict[str, Any] = {
-        "WORDS_FOUND": [],
-        "WORDS_NOT_FOUND": [],
+        "WORDS_FOUND": [ability.name for ability, ok in zip(abilities, found) if ok],
+        "WORDS_NOT_FOUND": [ability.name for ability, ok in zip(abilities, found) if not ok],
         "SUITABLE": False
     }
-
-    for ability in abilities:
-        logger.info(f"Matching ability {ability}")
-
-        if ability in tokens_text:
-            result["WORDS_FOUND"].append(ability)
-            logger.info(f"Found ability {ability} in tokens")
-        elif match_phrase(doc, ability, model):
-            result["WORDS_FOUND"].append(ability)
-        else:
-            custom_lemmas = {
-            "lic": "licenciatura",
-            "tec": "tecnicatura",
-            "ing": "ingenieria",
-            "definicion": "definir",
-            "capacitacion": "capacitar",
-            "definiciones": "definir",
-            "organizacion": "organizar",
-            "organizaciones": "organizar",
-            "resolucion": "resolver",
-            "resoluciones": "resolver",
-            "ejecucion": "ejecutar",
-            "ejecuciones": "ejecutar",
-            "educacion": "educar",
-            "educaciones": "educar",
-            "analisis": "analizar",
-            "construccion": "construir",
-            "construcciones": "construir",
-            "produccion": "producir",
-            "producciones": "producir",
-            "evaluacion": "evaluar",
-            "evaluaciones": "evaluar",
-            "informacion": "informar",
-            "revision": "revisar",
-            "revisiones": "revisar",
-            "desarrollo": "desarrollar",
-            "desarrollos": "desarrollar",
-            "programacion": "programar",
-            "programaciones": "programar",
-            "implementacion": "implementar",
-            "implementaciones": "implementar",
-            "diseno": "disenar",
-            "disenos": "disenar",
-            "configuracion": "configurar",
-            "configuraciones": "configurar",
-            "integracion": "integrar",
-            "integraciones": "integrar",
-            "mantenimiento": "mantener",
-            "automatizacion": "automatizar",
-            "automatizaciones": "automatizar",
-            "optimizacion": "optimizar",
-            "optimizaciones": "optimizar",
-            "pruebas": "probar",
-            "testing": "probar",
-            "despliegue": "desplegar",
-            "despliegues": "desplegar",
-            "soporte": "soportar",
-            "migracion": "migrar",
-            "migraciones": "migrar",
-            "documentacion": "documentar",
-            "depuracion": "depurar",
-            "refactorizacion": "refactorizar",
-            "innovacion": "innovar",
-            "actualizacion": "actualizar",
-            "prueba": "probar",
-            "integracioncontinua": "integrar",
-            "desplieguecontinuo": "desplegar",
-            "postgres": "sql",
-            "postgresql": "sql",
-            "mariadb": "sql",
-            "mysql": "sql",
-            "adm": "administrar",
-            "administracion": "administrar",
-            "administraciones": "administrar",
-            "comunicacion": "comunicar",
-            "comunicaciones": "comunicar",
-            "liderazgo": "liderar",
-            "gestion": "gestionar",
-            "gestiones": "gestionar",
-            "estrategia": "estrategizar",
-            "estrategias": "estrategizar",
-            "planificacion": "planificar",
-            "planificaciones": "planificar",
-            "innovaciones": "innovar",
-            "experiencia": "experimentar",
-            "coordinacion": "coordinar",
-            "coordinaciones": "coordinar",
-            "proyecto": "proyectar",
-            "proyectos": "proyectar",
-            "code": "codigo"
-            }
-            doc_norm: Doc = doc.copy()
-            doc_norm_text = [custom_lemmas.get(token.lemma_, token.lemma_) for token in doc_norm if token.text.strip() and token.lemma_.strip() and not token.is_stop and token.pos_ != "ADP"]
-            doc_norm = model(" ".join(doc_norm_text))
-            logger.info(f"Norm tokens: {doc_norm_text}")
-
-            ability_doc: Doc = model(ability)
-            ability_doc_text = [custom_lemmas.get(token.lemma_, token.lemma_) for token in ability_doc if token.text.strip() and token.lemma_.strip() and not token.is_stop and token.pos_ != "ADP"]
-            ability_doc = model(" ".join(ability_doc_text))
-
-            if not ability_doc or len(ability_doc) == 0 or not all([token.has_vector for token in ability_doc]):
-                result["WORDS_NOT_FOUND"].append(ability)
-                logger.info(f"Skipping ability {ability} because it's empty or doesn't have a vector")
-                continue
-
-            token_groups: list[Span] = create_token_groups(doc_norm, len(ability_doc))
-            similarities: dict[Span, float] = {}
-            for token in token_groups:
-                if not token.text.strip():
-                    logger.info(f"Tried to evaluate similarity of empty token {token}")
-                    continue
-                elif not token.has_vector:
-                    logger.info(f"Tried to evaluate similarity of token without vector: {token}")
-                    continue
-                sum = 0
-                for token_i, ability_doc_i in zip(token, ability_doc):
-                    sum += token_i.similarity(ability_doc_i)
-                similarities[token] = sum / len(token)
-            logger.info(f"Similarities: {similarities}")
-
-            max_item = max(similarities.items(), key=lambda item: item[1])
-            max_key = max_item[0]
-            max_value = max_item[1]
-
-            if similarities and max_value >= similarity_threshold:
-                result["WORDS_FOUND"].append(ability)
-                logger.info(f"Matched ability \"{ability}\" ({ability_doc_text}) with max similarity {max_value} to \"{max_key}\"")
-            else:
-                result["WORDS_NOT_FOUND"].append(ability)
-                logger.info(f"Didn't match ability \"{ability}\" ({ability_doc_text}) with max similarity {max_value} to \"{max_key}\"")
-
-    processed_abilities = result["WORDS_FOUND"] + result["WORDS_NOT_FOUND"]
-    for ability in abilities:
-        if ability not in processed_abilities:
-            result["WORDS_NOT_FOUND"].append(ability)
-
     result["SUITABLE"] = (
         len(result["WORDS_FOUND"]) / len(abilities)
     ) >= minimum_percentage / 100
     return result
 
 
-def create_token_groups(doc: Doc, word_amount: int) -> list[Span]:
-    output_spans: list[Span] = []
-
-    for i in range(len(doc) - word_amount + 1):
-        token_group = doc[i : i + word_amount]
-        output_spans.append(token_group)
+def unit_vectors(tokens: Iterable[Token], width: int) -> numpy.ndarray:
+    """
+    Matriz (tokens x dimensiones) con los vectores de `tokens` normalizados
+    (norma L2 = 1). Los tokens sin vector quedan en cero.
+    """
+    vectors = numpy.array(
+        [token.vector for token in tokens], dtype=numpy.float32
+    ).reshape(-1, width)
+    norms = numpy.linalg.norm(vectors, axis=1, keepdims=True)
+    return numpy.divide(vectors, norms, out=numpy.zeros_like(vectors), where=norms > 0)
 
-        tokens_text = [token.text for token in token_group]
 
-        if word_amount >= 10:
-            logger.info(f"Skipping token group \"{tokens_text}\" permutations because word amount is too large ({word_amount})")
-        elif word_amount > 1:
-            perms = set(itertools.permutations(tokens_text))
-            for perm in perms:
-                if list(perm) == tokens_text:
-                    continue
-                new_doc = Doc(doc.vocab, words=list(perm))
-                new_span = new_doc[0:len(new_doc)]
-                output_spans.append(new_span)
+def best_window(
+    similarity: numpy.ndarray, has_vector: numpy.ndarray
+) -> tuple[int, float] | None:
+    """
+    Ventana de tokens del CV más parecida a una habilidad, a partir de la
+    matriz de similitudes coseno (tokens de la habilidad x tokens del CV).
+
+    El puntaje de una ventana es el promedio de la mejor asignación uno a uno
+    entre los tokens de la habilidad y los de la ventana, así el orden de las
+    palabras no importa y no hace falta probar permutaciones. Devuelve el
+    índice de la ventana y su puntaje, o None si ninguna ventana tiene tokens
+    con vector.
+    """
+    size, length = similarity.shape
+    if length < size:
+        return None
+
+    # windows[i, j, m]: similitud del token j de la habilidad con el token m de la ventana i
+    windows = sliding_window_view(similarity, size, axis=1).transpose(1, 0, 2)
+    comparable = numpy.flatnonzero(sliding_window_view(has_vector, size).any(axis=1))
+    if not comparable.size:
+        return None
+
+    # Cota superior de cada ventana: cada token de la habilidad con su mejor
+    # token, aunque se repitan. Las ventanas se resuelven de mayor a menor
+    # cota y se corta cuando ninguna puede superar a la mejor encontrada.
+    bounds = windows[comparable].max(axis=2).mean(axis=1)
+    best: tuple[int, float] | None = None
+    for position in numpy.argsort(-bounds, kind="stable"):
+        if best is not None and bounds[position] <= best[1]:
+            break
+        window = windows[comparable[position]]
+        rows, columns = linear_sum_assignment(window, maximize=True)
+        score = float(window[rows, columns].mean())
+        if best is None or score > best[1]:
+            best = (int(comparable[position]), score)
+    return best
+
+
+def match_semantic_abilities(
+    cv: CvAnalysis, abilities: list[AbilityAnalysis], similarity_threshold: float
+) -> list[bool]:
+    """
+    Busca las habilidades por similitud semántica sobre los lemas del CV. Los
+    vectores de todas las habilidades se apilan en una matriz y las
+    similitudes con cada token del CV salen de un solo producto de matrices.
+    """
+    usable = [ability for ability in abilities if ability.vectors is not None]
+    similarity = (
+        numpy.vstack([cast(numpy.ndarray, ability.vectors) for ability in usable])
+        @ cv.vectors.T
+        if usable
+        else None
+    )
+
+    found: list[bool] = []
+    offset = 0
+    for ability in abilities:
+        if ability.vectors is None or similarity is None:
+            found.append(False)
+            logger.info(f"Skipping ability {ability.name} because it's empty or doesn't have a vector")
+            continue
+
+        size = len(ability.vectors)
+        best = best_window(similarity[offset : offset + size], cv.has_vector)
+        offset += size
+        if best is None:
+            found.append(False)
+            logger.info(f"Didn't match ability \"{ability.name}\" ({ability.lemma_doc.text}): no comparable tokens")
+            continue
+
+        max_key = cv.lemma_doc[best[0] : best[0] + size]
+        max_value = best[1]
+        if max_value >= similarity_threshold:
+            found.append(True)
+            logger.info(f"Matched ability \"{ability.name}\" ({ability.lemma_doc.text}) with max similarity {max_value} to \"{max_key}\"")
+        else:
+            found.append(False)
+            logger.info(f"Didn't match ability \"{ability.name}\" ({ability.lemma_doc.text}) with max similarity {max_value} to \"{max_key}\"")
 
-    logger.info(
-           f"Total token groups (including permutations): {len(output_spans)}. "
-           f"Groups: {[span.text for span in output_spans]}"
-       )
-    return output_spans
+    return found
 
 
-def load_spanish_model():
-    return spacy.load("es_core_news_lg")
+def load_spanish_model() -> Language:
+    return model_registry.get(SPANISH_MODEL)
 
 
-def load_english_model():
-    return spacy.load("en_core_web_lg")
+def load_english_model() -> Language:
+    return model_registry.get(ENGLISH_MODEL)
@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Text
+from sqlmodel import Column, Field, SQLModel
+
+
+class PostulationCvText(SQLModel, table=True):
+    """
+    Texto normalizado del CV de una postulación. Se guarda junto con el hash
+    del archivo del que se extrajo: mientras `cv_file` no cambie, las
+    evaluaciones usan este texto y no vuelven a parsear el PDF.
+    """
+
+    __tablename__: str = "postulation_cv_text"  # type: ignore
+
+    postulation_id: int = Field(
+        foreign_key="postulation.id", primary_key=True, ondelete="CASCADE"
+    )
+    # SHA-256 de `cv_file` (base64, sin saltos de línea)
+    content_hash: str = Field(max_length=64)
+    text: str = Field(sa_column=Column(Text, nullable=False))
+    extracted_at: datetime = Field(default_factory=datetime.now)
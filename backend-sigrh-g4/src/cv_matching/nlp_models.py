@@ -0,0 +1,109 @@
+"""
+Registro de modelos de spaCy compartidos por el proceso.
+
+Cargar `es_core_news_lg` lleva varios segundos y cientos de MB, así que cada
+modelo se carga una sola vez por worker y se reutiliza en todos los requests.
+Por defecto los modelos de `NLP_MODELS` se cargan durante el `lifespan` de la
+app; con `NLP_LAZY_LOAD=true` (útil en contenedores de desarrollo) se cargan
+recién la primera vez que se piden.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from os import getenv
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+logger = logging.getLogger("uvicorn.error")
+
+SPANISH_MODEL = "es_core_news_lg"
+ENGLISH_MODEL = "en_core_web_lg"
+
+
+@dataclass(frozen=True)
+class ModelStatus:
+    name: str
+    loaded: bool
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ModelRegistry:
+    def __init__(self, names: list[str], lazy: bool = False):
+        self.names = names
+        self.lazy = lazy
+        self._models: dict[str, "Language"] = {}
+        self._load_seconds: dict[str, float] = {}
+        self._errors: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> "Language":
+        """Devuelve el modelo, cargándolo si todavía no está en memoria."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        # Un solo hilo carga; los demás esperan y reciben el mismo objeto
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+            return model
+
+    def _load(self, name: str) -> "Language":
+        # spaCy tarda en importarse: solo lo paga quien carga un modelo
+        import spacy
+
+        logger.info(f"Loading spaCy model {name}...")
+        started = time.perf_counter()
+        try:
+            model = spacy.load(name)
+        except Exception as e:
+            self._errors[name] = str(e)
+            logger.error(f"Could not load spaCy model {name}")
+            logger.error(e)
+            raise
+        self._load_seconds[name] = time.perf_counter() - started
+        self._errors.pop(name, None)
+        self._models[name] = model
+        logger.info(f"Loaded spaCy model {name} in {self._load_seconds[name]:.1f}s")
+        return model
+
+    def preload(self) -> None:
+        """Carga los modelos configurados. Un modelo que falla no frena al resto."""
+        for name in self.names:
+            try:
+                self.get(name)
+            except Exception:
+                continue
+
+    def is_ready(self) -> bool:
+        if self.lazy:
+            return not self._errors
+        return all(name in self._models for name in self.names)
+
+    def status(self) -> list[ModelStatus]:
+        names = list(dict.fromkeys([*self.names, *self._models, *self._errors]))
+        return [
+            ModelStatus(
+                name=name,
+                loaded=name in self._models,
+                load_seconds=self._load_seconds.get(name),
+                error=self._errors.get(name),
+            )
+            for name in names
+        ]
+
+
+def configured_models() -> list[str]:
+    names = getenv("NLP_MODELS", SPANISH_MODEL)
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+model_registry = ModelRegistry(
+    configured_models(),
+    lazy=str(getenv("NLP_LAZY_LOAD", "false")).lower() == "true",
+)
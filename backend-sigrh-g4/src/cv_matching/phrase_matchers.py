@@ -0,0 +1,89 @@
+"""
+PhraseMatcher compilado por oferta laboral.
+
+Cada oferta tiene un solo `PhraseMatcher` con todas sus habilidades
+(requeridas y deseables), que se arma la primera vez que se evalúa y se
+reutiliza para todos los CVs: cada CV se recorre una sola vez y devuelve todas
+las habilidades encontradas. `update_opportunity` descarta el de la oferta al
+cambiarla; además el matcher guarda las habilidades con las que se armó y se
+vuelve a armar si no coinciden (p. ej. si se renombró una habilidad o si la
+oferta se modificó desde otro worker).
+"""
+
+import logging
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.matcher import PhraseMatcher
+    from spacy.tokens import Doc
+    from spacy.vocab import Vocab
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass(frozen=True)
+class CompiledPhrases:
+    abilities: tuple[str, ...]
+    vocab: "Vocab"
+    matcher: "PhraseMatcher"
+
+    def find(self, doc: "Doc") -> set[str]:
+        """Habilidades que aparecen en `doc`, en una sola pasada."""
+        found: set[str] = set()
+        for match_id, start, end in self.matcher(doc):
+            ability = self.vocab.strings[match_id]
+            found.add(ability)
+            logger.info(f"Matched phrase {ability}: {doc[start:end]} (start: {start}, end: {end})")
+        return found
+
+
+def compile_phrases(abilities: tuple[str, ...], model: "Language") -> CompiledPhrases:
+    # spaCy se importa acá: el servicio de ofertas usa el cache solo para
+    # invalidarlo y no debe cargar spaCy
+    from spacy.matcher import PhraseMatcher
+
+    matcher = PhraseMatcher(model.vocab, attr="LOWER")
+    for ability in abilities:
+        pattern = model.make_doc(ability)
+        if len(pattern):
+            matcher.add(ability, [pattern])
+    return CompiledPhrases(abilities=abilities, vocab=model.vocab, matcher=matcher)
+
+
+class PhraseMatcherCache:
+    def __init__(self) -> None:
+        self._matchers: dict[int, CompiledPhrases] = {}
+        self._lock = Lock()
+
+    def get(
+        self, job_opportunity_id: int, abilities: Iterable[str], model: "Language"
+    ) -> CompiledPhrases:
+        key = tuple(sorted(set(abilities)))
+        with self._lock:
+            compiled = self._matchers.get(job_opportunity_id)
+            if (
+                compiled is None
+                or compiled.abilities != key
+                or compiled.vocab is not model.vocab
+            ):
+                logger.info(
+                    f"Compiling PhraseMatcher of job opportunity {job_opportunity_id} "
+                    f"with {len(key)} abilities"
+                )
+                compiled = compile_phrases(key, model)
+                self._matchers[job_opportunity_id] = compiled
+            return compiled
+
+    def invalidate(self, job_opportunity_id: int | None = None) -> None:
+        """Descarta el matcher de una oferta, o todos si no se indica ninguna."""
+        with self._lock:
+            if job_opportunity_id is None:
+                self._matchers.clear()
+            else:
+                self._matchers.pop(job_opportunity_id, None)
+
+
+phrase_matcher_cache = PhraseMatcherCache()
@@ -1,7 +1,15 @@
+from enum import Enum
 from pydantic import BaseModel
 from typing import Optional
 
 
+class MatcherMode(str, Enum):
+    # Un CV a la vez en el proceso del request
+    STANDARD = "standard"
+    # CVs repartidos en un pool de procesos, cada uno con el modelo cargado
+    PARALLEL = "parallel"
+
+
 class MatcherResponse(BaseModel):
     postulation_id: Optional[int]
     name: str
@@ -11,3 +19,16 @@ class MatcherResponse(BaseModel):
     desired_words_found: list[str]
     required_words_not_found: list[str]
     desired_words_not_found: list[str]
+
+
+class NlpModelStatus(BaseModel):
+    name: str
+    loaded: bool
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class MatcherHealthResponse(BaseModel):
+    ready: bool
+    lazy: bool
+    models: list[NlpModelStatus]
@@ -0,0 +1,105 @@
+-- Script de actualización para bases PostgreSQL creadas antes de los cambios de liquidación.
+-- `init_db` crea las tablas que faltan pero no agrega columnas a las que ya existen.
+-- Se puede ejecutar más de una vez: cada paso verifica si ya se aplicó.
+
+BEGIN;
+
+-- Índices de las consultas de liquidación por empleado y rango de fechas
+CREATE INDEX IF NOT EXISTS ix_clock_events_employee_id_event_date ON public.clock_events USING btree (employee_id, event_date);
+CREATE INDEX IF NOT EXISTS ix_employee_hours_employee_id_work_date ON public.employee_hours USING btree (employee_id, work_date);
+
+-- Corridas del cálculo de horas y motivo de cada fila calculada
+CREATE TABLE IF NOT EXISTS public.payroll_run (
+    id serial PRIMARY KEY,
+    kind character varying(16) NOT NULL,
+    mode character varying(16) NOT NULL,
+    start_date date NOT NULL,
+    end_date date NOT NULL,
+    parameters json,
+    started_at timestamp without time zone NOT NULL,
+    finished_at timestamp without time zone,
+    calculation_ms integer NOT NULL,
+    employees integer NOT NULL,
+    rows_deleted integer NOT NULL,
+    rows_created integer NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_payroll_run_started_at ON public.payroll_run USING btree (started_at);
+
+ALTER TABLE public.employee_hours
+    ADD COLUMN IF NOT EXISTS run_id integer,
+    ADD COLUMN IF NOT EXISTS reason_code character varying(16);
+CREATE INDEX IF NOT EXISTS ix_employee_hours_run_id ON public.employee_hours USING btree (run_id);
+ALTER TABLE public.employee_hours DROP CONSTRAINT IF EXISTS employee_hours_run_id_fkey;
+ALTER TABLE public.employee_hours
+    ADD CONSTRAINT employee_hours_run_id_fkey FOREIGN KEY (run_id) REFERENCES public.payroll_run(id) ON DELETE SET NULL;
+
+-- Cierre de períodos: totales por empleado y horas asociadas al período cerrado
+CREATE TABLE IF NOT EXISTS public.payroll_period (
+    id serial PRIMARY KEY,
+    start_date date NOT NULL,
+    end_date date NOT NULL,
+    closed_at timestamp without time zone NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_payroll_period_start_date ON public.payroll_period USING btree (start_date);
+CREATE INDEX IF NOT EXISTS ix_payroll_period_end_date ON public.payroll_period USING btree (end_date);
+
+CREATE TABLE IF NOT EXISTS public.payroll_period_summary (
+    id serial PRIMARY KEY,
+    period_id integer NOT NULL REFERENCES public.payroll_period(id),
+    employee_id integer NOT NULL REFERENCES public.employee(id) ON DELETE CASCADE,
+    worked_seconds integer NOT NULL,
+    overtime_seconds integer NOT NULL,
+    absence_days integer NOT NULL,
+    concept_counts json,
+    UNIQUE (period_id, employee_id)
+);
+CREATE INDEX IF NOT EXISTS ix_payroll_period_summary_period_id ON public.payroll_period_summary USING btree (period_id);
+
+ALTER TABLE public.employee_hours ADD COLUMN IF NOT EXISTS period_id integer;
+CREATE INDEX IF NOT EXISTS ix_employee_hours_period_id ON public.employee_hours USING btree (period_id);
+ALTER TABLE public.employee_hours DROP CONSTRAINT IF EXISTS employee_hours_period_id_fkey;
+ALTER TABLE public.employee_hours
+    ADD CONSTRAINT employee_hours_period_id_fkey FOREIGN KEY (period_id) REFERENCES public.payroll_period(id);
+
+-- Días con fichadas modificadas, pendientes del recálculo incremental
+CREATE TABLE IF NOT EXISTS public.payroll_dirty_day (
+    employee_id integer NOT NULL REFERENCES public.employee(id) ON DELETE CASCADE,
+    work_date date NOT NULL,
+    marked_at timestamp without time zone NOT NULL,
+    PRIMARY KEY (employee_id, work_date)
+);
+
+-- Feriados y cierres de la empresa; `version` sube en cada modificación
+CREATE TABLE IF NOT EXISTS public.holiday (
+    id serial PRIMARY KEY,
+    day date NOT NULL,
+    description character varying(100) NOT NULL,
+    country_id integer NOT NULL REFERENCES public.country(id) ON DELETE CASCADE,
+    state_id integer REFERENCES public.state(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS ix_holiday_day ON public.holiday USING btree (day);
+
+CREATE TABLE IF NOT EXISTS public.company_closure (
+    id serial PRIMARY KEY,
+    start_date date NOT NULL,
+    end_date date NOT NULL,
+    description character varying(100) NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_company_closure_start_date ON public.company_closure USING btree (start_date);
+CREATE INDEX IF NOT EXISTS ix_company_closure_end_date ON public.company_closure USING btree (end_date);
+
+-- El DEFAULT solo completa las filas existentes: el modelo no lo declara
+ALTER TABLE public.holiday ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE public.holiday ALTER COLUMN version DROP DEFAULT;
+ALTER TABLE public.company_closure ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE public.company_closure ALTER COLUMN version DROP DEFAULT;
+
+-- Texto extraído del CV de cada postulación
+CREATE TABLE IF NOT EXISTS public.postulation_cv_text (
+    postulation_id integer PRIMARY KEY REFERENCES public.postulation(id) ON DELETE CASCADE,
+    content_hash character varying(64) NOT NULL,
+    text text NOT NULL,
+    extracted_at timestamp without time zone NOT NULL
+);
+
+COMMIT;
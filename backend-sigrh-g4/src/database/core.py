@@ -21,9 +21,17 @@ from src.modules.employees.models.sector import Sector
 from src.modules.employees.models.state import State
 from src.modules.employees.models.work_history import WorkHistory
 from src.modules.postulation.models.postulation_models import Postulation
+from src.cv_matching.models import PostulationCvText
 from src.modules.shift.models.models import Shift
 from src.modules.configuration.config_models import Configuration
 from src.modules.leave.models.leave_models import Leave
+from src.modules.holiday.models.models import CompanyClosure, Holiday
+from src.modules.payroll_calculator.models import (
+    PayrollDirtyDay,
+    PayrollPeriod,
+    PayrollPeriodSummary,
+    PayrollRun,
+)
 from src.modules.opportunity.models.job_opportunity_models import (
     JobOpportunityAbility,
     JobOpportunityModel,
@@ -69,6 +77,12 @@ def get_session():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    # Los modelos de NLP se cargan una vez por worker, antes de recibir
+    # requests. Se importa acá para que usar la base no cargue spaCy
+    from src.cv_matching.nlp_models import model_registry
+
+    if not model_registry.lazy:
+        model_registry.preload()
     yield
 
 
@@ -183,6 +183,43 @@ ALTER SEQUENCE public.clock_events_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.clock_events_id_seq OWNED BY public.clock_events.id;
 
 
+--
+-- Name: company_closure; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.company_closure (
+    id integer NOT NULL,
+    start_date date NOT NULL,
+    end_date date NOT NULL,
+    description character varying(100) NOT NULL,
+    version integer NOT NULL
+);
+
+
+ALTER TABLE public.company_closure OWNER TO postgres;
+
+--
+-- Name: company_closure_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.company_closure_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.company_closure_id_seq OWNER TO postgres;
+
+--
+-- Name: company_closure_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.company_closure_id_seq OWNED BY public.company_closure.id;
+
+
 --
 -- Name: concept; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -380,7 +417,10 @@ CREATE TABLE public.employee_hours (
     sumary_time time without time zone,
     extra_hours time without time zone,
     payroll_status public.paytype NOT NULL,
-    notes character varying NOT NULL
+    notes character varying NOT NULL,
+    run_id integer,
+    reason_code character varying(16),
+    period_id integer
 );
 
 
@@ -465,6 +505,44 @@ ALTER SEQUENCE public.face_recognition_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.face_recognition_id_seq OWNED BY public.face_recognition.id;
 
 
+--
+-- Name: holiday; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.holiday (
+    id integer NOT NULL,
+    day date NOT NULL,
+    description character varying(100) NOT NULL,
+    country_id integer NOT NULL,
+    state_id integer,
+    version integer NOT NULL
+);
+
+
+ALTER TABLE public.holiday OWNER TO postgres;
+
+--
+-- Name: holiday_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.holiday_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.holiday_id_seq OWNER TO postgres;
+
+--
+-- Name: holiday_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.holiday_id_seq OWNED BY public.holiday.id;
+
+
 --
 -- Name: job; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -636,6 +714,138 @@ ALTER SEQUENCE public.leave_type_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.leave_type_id_seq OWNED BY public.leave_type.id;
 
 
+--
+-- Name: payroll_dirty_day; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.payroll_dirty_day (
+    employee_id integer NOT NULL,
+    work_date date NOT NULL,
+    marked_at timestamp without time zone NOT NULL
+);
+
+
+ALTER TABLE public.payroll_dirty_day OWNER TO postgres;
+
+--
+-- Name: payroll_period; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.payroll_period (
+    id integer NOT NULL,
+    start_date date NOT NULL,
+    end_date date NOT NULL,
+    closed_at timestamp without time zone NOT NULL
+);
+
+
+ALTER TABLE public.payroll_period OWNER TO postgres;
+
+--
+-- Name: payroll_period_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.payroll_period_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.payroll_period_id_seq OWNER TO postgres;
+
+--
+-- Name: payroll_period_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.payroll_period_id_seq OWNED BY public.payroll_period.id;
+
+
+--
+-- Name: payroll_period_summary; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.payroll_period_summary (
+    id integer NOT NULL,
+    period_id integer NOT NULL,
+    employee_id integer NOT NULL,
+    worked_seconds integer NOT NULL,
+    overtime_seconds integer NOT NULL,
+    absence_days integer NOT NULL,
+    concept_counts json
+);
+
+
+ALTER TABLE public.payroll_period_summary OWNER TO postgres;
+
+--
+-- Name: payroll_period_summary_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.payroll_period_summary_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.payroll_period_summary_id_seq OWNER TO postgres;
+
+--
+-- Name: payroll_period_summary_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.payroll_period_summary_id_seq OWNED BY public.payroll_period_summary.id;
+
+
+--
+-- Name: payroll_run; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.payroll_run (
+    id integer NOT NULL,
+    kind character varying(16) NOT NULL,
+    mode character varying(16) NOT NULL,
+    start_date date NOT NULL,
+    end_date date NOT NULL,
+    parameters json,
+    started_at timestamp without time zone NOT NULL,
+    finished_at timestamp without time zone,
+    calculation_ms integer NOT NULL,
+    employees integer NOT NULL,
+    rows_deleted integer NOT NULL,
+    rows_created integer NOT NULL
+);
+
+
+ALTER TABLE public.payroll_run OWNER TO postgres;
+
+--
+-- Name: payroll_run_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.payroll_run_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.payroll_run_id_seq OWNER TO postgres;
+
+--
+-- Name: payroll_run_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.payroll_run_id_seq OWNED BY public.payroll_run.id;
+
+
 --
 -- Name: permission; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -697,6 +907,20 @@ CREATE TABLE public.postulation (
 
 ALTER TABLE public.postulation OWNER TO postgres;
 
+--
+-- Name: postulation_cv_text; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.postulation_cv_text (
+    postulation_id integer NOT NULL,
+    content_hash character varying(64) NOT NULL,
+    text text NOT NULL,
+    extracted_at timestamp without time zone NOT NULL
+);
+
+
+ALTER TABLE public.postulation_cv_text OWNER TO postgres;
+
 --
 -- Name: postulation_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
 --
@@ -925,6 +1149,13 @@ ALTER TABLE ONLY public.ability ALTER COLUMN id SET DEFAULT nextval('public.abil
 ALTER TABLE ONLY public.clock_events ALTER COLUMN id SET DEFAULT nextval('public.clock_events_id_seq'::regclass);
 
 
+--
+-- Name: company_closure id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.company_closure ALTER COLUMN id SET DEFAULT nextval('public.company_closure_id_seq'::regclass);
+
+
 --
 -- Name: concept id; Type: DEFAULT; Schema: public; Owner: postgres
 --
@@ -967,6 +1198,13 @@ ALTER TABLE ONLY public.employee_hours ALTER COLUMN id SET DEFAULT nextval('publ
 ALTER TABLE ONLY public.face_recognition ALTER COLUMN id SET DEFAULT nextval('public.face_recognition_id_seq'::regclass);
 
 
+--
+-- Name: holiday id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.holiday ALTER COLUMN id SET DEFAULT nextval('public.holiday_id_seq'::regclass);
+
+
 --
 -- Name: job id; Type: DEFAULT; Schema: public; Owner: postgres
 --
@@ -995,6 +1233,27 @@ ALTER TABLE ONLY public.leave ALTER COLUMN id SET DEFAULT nextval('public.leave_
 ALTER TABLE ONLY public.leave_type ALTER COLUMN id SET DEFAULT nextval('public.leave_type_id_seq'::regclass);
 
 
+--
+-- Name: payroll_period id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period ALTER COLUMN id SET DEFAULT nextval('public.payroll_period_id_seq'::regclass);
+
+
+--
+-- Name: payroll_period_summary id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period_summary ALTER COLUMN id SET DEFAULT nextval('public.payroll_period_summary_id_seq'::regclass);
+
+
+--
+-- Name: payroll_run id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_run ALTER COLUMN id SET DEFAULT nextval('public.payroll_run_id_seq'::regclass);
+
+
 --
 -- Name: permission id; Type: DEFAULT; Schema: public; Owner: postgres
 --
@@ -1068,6 +1327,14 @@ ALTER TABLE ONLY public.clock_events
     ADD CONSTRAINT clock_events_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: company_closure company_closure_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.company_closure
+    ADD CONSTRAINT company_closure_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: concept concept_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1148,6 +1415,14 @@ ALTER TABLE ONLY public.face_recognition
     ADD CONSTRAINT face_recognition_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: holiday holiday_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.holiday
+    ADD CONSTRAINT holiday_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: job_opportunity_ability job_opportunity_ability_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1188,6 +1463,46 @@ ALTER TABLE ONLY public.leave_type
     ADD CONSTRAINT leave_type_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: payroll_dirty_day payroll_dirty_day_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_dirty_day
+    ADD CONSTRAINT payroll_dirty_day_pkey PRIMARY KEY (employee_id, work_date);
+
+
+--
+-- Name: payroll_period payroll_period_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period
+    ADD CONSTRAINT payroll_period_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: payroll_period_summary payroll_period_summary_period_id_employee_id_key; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period_summary
+    ADD CONSTRAINT payroll_period_summary_period_id_employee_id_key UNIQUE (period_id, employee_id);
+
+
+--
+-- Name: payroll_period_summary payroll_period_summary_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period_summary
+    ADD CONSTRAINT payroll_period_summary_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: payroll_run payroll_run_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_run
+    ADD CONSTRAINT payroll_run_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: permission permission_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1196,6 +1511,14 @@ ALTER TABLE ONLY public.permission
     ADD CONSTRAINT permission_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: postulation_cv_text postulation_cv_text_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.postulation_cv_text
+    ADD CONSTRAINT postulation_cv_text_pkey PRIMARY KEY (postulation_id);
+
+
 --
 -- Name: postulation postulation_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1259,6 +1582,27 @@ ALTER TABLE ONLY public.work_history
 CREATE INDEX ix_ability_id ON public.ability USING btree (id);
 
 
+--
+-- Name: ix_clock_events_employee_id_event_date; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_clock_events_employee_id_event_date ON public.clock_events USING btree (employee_id, event_date);
+
+
+--
+-- Name: ix_company_closure_end_date; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_company_closure_end_date ON public.company_closure USING btree (end_date);
+
+
+--
+-- Name: ix_company_closure_start_date; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_company_closure_start_date ON public.company_closure USING btree (start_date);
+
+
 --
 -- Name: ix_country_id; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1280,6 +1624,27 @@ CREATE UNIQUE INDEX ix_country_name ON public.country USING btree (name);
 CREATE INDEX ix_document_id ON public.document USING btree (id);
 
 
+--
+-- Name: ix_employee_hours_employee_id_work_date; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_employee_hours_employee_id_work_date ON public.employee_hours USING btree (employee_id, work_date);
+
+
+--
+-- Name: ix_employee_hours_period_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_employee_hours_period_id ON public.employee_hours USING btree (period_id);
+
+
+--
+-- Name: ix_employee_hours_run_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_employee_hours_run_id ON public.employee_hours USING btree (run_id);
+
+
 --
 -- Name: ix_employee_id; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1294,6 +1659,13 @@ CREATE INDEX ix_employee_id ON public.employee USING btree (id);
 CREATE INDEX ix_face_recognition_id ON public.face_recognition USING btree (id);
 
 
+--
+-- Name: ix_holiday_day; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_holiday_day ON public.holiday USING btree (day);
+
+
 --
 -- Name: ix_job_id; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1378,6 +1750,34 @@ CREATE INDEX ix_leave_type_id ON public.leave_type USING btree (id);
 CREATE UNIQUE INDEX ix_leave_type_type ON public.leave_type USING btree (type);
 
 
+--
+-- Name: ix_payroll_period_end_date; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_payroll_period_end_date ON public.payroll_period USING btree (end_date);
+
+
+--
+-- Name: ix_payroll_period_start_date; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_payroll_period_start_date ON public.payroll_period USING btree (start_date);
+
+
+--
+-- Name: ix_payroll_period_summary_period_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_payroll_period_summary_period_id ON public.payroll_period_summary USING btree (period_id);
+
+
+--
+-- Name: ix_payroll_run_started_at; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX ix_payroll_run_started_at ON public.payroll_run USING btree (started_at);
+
+
 --
 -- Name: ix_permission_id; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1503,6 +1903,22 @@ ALTER TABLE ONLY public.employee_hours
     ADD CONSTRAINT employee_hours_employee_id_fkey FOREIGN KEY (employee_id) REFERENCES public.employee(id) ON DELETE CASCADE;
 
 
+--
+-- Name: employee_hours employee_hours_period_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.employee_hours
+    ADD CONSTRAINT employee_hours_period_id_fkey FOREIGN KEY (period_id) REFERENCES public.payroll_period(id);
+
+
+--
+-- Name: employee_hours employee_hours_run_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.employee_hours
+    ADD CONSTRAINT employee_hours_run_id_fkey FOREIGN KEY (run_id) REFERENCES public.payroll_run(id) ON DELETE SET NULL;
+
+
 --
 -- Name: employee_hours employee_hours_shift_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1543,6 +1959,22 @@ ALTER TABLE ONLY public.face_recognition
     ADD CONSTRAINT face_recognition_employee_id_fkey FOREIGN KEY (employee_id) REFERENCES public.employee(id);
 
 
+--
+-- Name: holiday holiday_country_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.holiday
+    ADD CONSTRAINT holiday_country_id_fkey FOREIGN KEY (country_id) REFERENCES public.country(id) ON DELETE CASCADE;
+
+
+--
+-- Name: holiday holiday_state_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.holiday
+    ADD CONSTRAINT holiday_state_id_fkey FOREIGN KEY (state_id) REFERENCES public.state(id) ON DELETE CASCADE;
+
+
 --
 -- Name: job_opportunity_ability job_opportunity_ability_ability_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1591,6 +2023,30 @@ ALTER TABLE ONLY public.leave
     ADD CONSTRAINT leave_leave_type_id_fkey FOREIGN KEY (leave_type_id) REFERENCES public.leave_type(id);
 
 
+--
+-- Name: payroll_dirty_day payroll_dirty_day_employee_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_dirty_day
+    ADD CONSTRAINT payroll_dirty_day_employee_id_fkey FOREIGN KEY (employee_id) REFERENCES public.employee(id) ON DELETE CASCADE;
+
+
+--
+-- Name: payroll_period_summary payroll_period_summary_employee_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period_summary
+    ADD CONSTRAINT payroll_period_summary_employee_id_fkey FOREIGN KEY (employee_id) REFERENCES public.employee(id) ON DELETE CASCADE;
+
+
+--
+-- Name: payroll_period_summary payroll_period_summary_period_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.payroll_period_summary
+    ADD CONSTRAINT payroll_period_summary_period_id_fkey FOREIGN KEY (period_id) REFERENCES public.payroll_period(id);
+
+
 --
 -- Name: postulation postulation_address_country_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1607,6 +2063,14 @@ ALTER TABLE ONLY public.postulation
     ADD CONSTRAINT postulation_address_state_id_fkey FOREIGN KEY (address_state_id) REFERENCES public.state(id);
 
 
+--
+-- Name: postulation_cv_text postulation_cv_text_postulation_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.postulation_cv_text
+    ADD CONSTRAINT postulation_cv_text_postulation_id_fkey FOREIGN KEY (postulation_id) REFERENCES public.postulation(id) ON DELETE CASCADE;
+
+
 --
 -- Name: postulation postulation_job_opportunity_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -30,6 +30,7 @@ from src.modules.concept.controllers.controller import concept_router
 from src.modules.shift.controllers.controller import shift_router
 from src.modules.payroll_calculator.controller import payroll_router
 from src.modules.leave.controllers.leave_controller import leave_router
+from src.modules.holiday.controllers.controller import holiday_router
 
 from src.modules.configuration.config_controller import config_router
 
@@ -69,4 +70,5 @@ app.include_router(concept_router)
 app.include_router(shift_router)
 app.include_router(payroll_router)
 app.include_router(leave_router)
+app.include_router(holiday_router)
 app.include_router(config_router)
@@ -9,6 +9,7 @@ from src.modules.clock_events.models.models import ClockEvents
 from src.modules.employees.models.employee import Employee
 from src.modules.employees.models.job import Job
 from src.modules.employees.services.utils import get_employee_by_id
+from src.modules.payroll_calculator.dirty_days import mark_dirty_days
 import logging
 from sqlalchemy.orm import selectinload
 
@@ -70,6 +71,7 @@ def post_clock_event(db: DatabaseSession, request: ClockEventRequest) -> ClockEv
             )
         db_clock_event = ClockEvents(**request.model_dump())
         db.add(db_clock_event)
+        mark_dirty_days(db, employee, [db_clock_event.event_date])
         db.commit()
         db.refresh(db_clock_event)
         return db_clock_event
@@ -101,10 +103,12 @@ def patch_clock_event(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Employee id provided doesn't match",
             )
+        previous_date = db_clock_event.event_date
         for attr, value in request.model_dump(exclude_unset=True).items():
             if hasattr(db_clock_event, attr):
                 setattr(db_clock_event, attr, value)
         db.add(db_clock_event)
+        mark_dirty_days(db, employee, [previous_date, db_clock_event.event_date])
         db.commit()
         return db_clock_event
     except IntegrityError as e:
@@ -123,6 +127,7 @@ def delete_clock_event(db: DatabaseSession, clock_event_id: int):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Clock event not found"
             )
+        mark_dirty_days(db, db_clock_event.employee, [db_clock_event.event_date])
         db.delete(db_clock_event)
         db.commit()
     except IntegrityError as e:
@@ -0,0 +1,61 @@
+from threading import Lock
+from typing import Iterable
+from sqlmodel import Session, select
+from src.database.core import DatabaseSession
+from src.modules.concept.models.models import Concept
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ConceptCache:
+    """
+    Cache en proceso de los IDs de concepto por descripción.
+
+    Los conceptos se cargan en una sola consulta la primera vez que se piden
+    y se mantienen hasta que `invalidate` los descarta (lo hace el servicio de
+    conceptos al crear, modificar o borrar). Los conceptos faltantes se crean
+    en una sesión propia y se confirman en el momento, así el cache nunca
+    apunta a filas de una transacción que después puede deshacerse.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] | None = None
+        self._lock = Lock()
+
+    def get_ids(
+        self, db: DatabaseSession, descriptions: Iterable[str]
+    ) -> dict[str, int]:
+        descriptions = list(descriptions)
+        with self._lock:
+            if self._ids is None or any(d not in self._ids for d in descriptions):
+                # Otro proceso pudo haberlos creado: recargar antes de crear
+                self._ids = self._load(db)
+
+            missing = [d for d in dict.fromkeys(descriptions) if d not in self._ids]
+            if missing:
+                self._ids.update(self._create(db, missing))
+
+            return {d: self._ids[d] for d in descriptions}
+
+    def get_id(self, db: DatabaseSession, description: str) -> int:
+        return self.get_ids(db, [description])[description]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._ids = None
+
+    def _load(self, db: DatabaseSession) -> dict[str, int]:
+        rows = db.exec(select(Concept.id, Concept.description)).all()
+        return {description: concept_id for concept_id, description in rows}
+
+    def _create(self, db: DatabaseSession, descriptions: list[str]) -> dict[str, int]:
+        logger.info(f"Creating missing concepts {descriptions}")
+        with Session(db.get_bind()) as session:
+            concepts = [Concept(description=description) for description in descriptions]
+            session.add_all(concepts)
+            session.commit()
+            return {concept.description: concept.id for concept in concepts}
+
+
+concept_cache = ConceptCache()
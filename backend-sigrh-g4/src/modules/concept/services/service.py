@@ -4,6 +4,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from src.database.core import DatabaseSession
 from src.modules.concept.models.models import Concept
+from src.modules.concept.services.concept_cache import concept_cache
 from src.modules.concept.schemas.schemas import ConceptRequest
 import logging
 
@@ -27,6 +28,7 @@ def post_concept(db: DatabaseSession, request: ConceptRequest) -> Concept:
         db.add(db_concept)
         db.commit()
         db.refresh(db_concept)
+        concept_cache.invalidate()
         return db_concept
     except IntegrityError as e:
         db.rollback()
@@ -52,6 +54,7 @@ def patch_concept(
 
         db.add(db_concept)
         db.commit()
+        concept_cache.invalidate()
         return db_concept
     except IntegrityError as e:
         db.rollback()
@@ -76,6 +79,7 @@ def delete_concept(db: DatabaseSession, concept_id: int):
             )
         db.delete(db_concept)
         db.commit()
+        concept_cache.invalidate()
     except IntegrityError as e:
         db.rollback()
         logging.error(e)
@@ -1,6 +1,7 @@
 from typing import List
 from fastapi import APIRouter, status
 from src.database.core import DatabaseSession
+from src.modules.employee_hours.models.models import payType
 from src.modules.employee_hours.schemas import schemas
 from src.modules.employee_hours.services import services
 
@@ -33,6 +34,30 @@ async def create_employee_hours(
     return services.post_employee_hours(db, request)
 
 
+@employee_hours_router.post(
+    "/overtime/approve",
+    response_model=schemas.OvertimeBulkResponse,
+    status_code=status.HTTP_200_OK,
+)
+def approve_overtime(db: DatabaseSession, request: schemas.OvertimeBulkRequest):
+    """
+    Aprueba en bloque las horas extra pendientes (pasan a pagables).
+    """
+    return services.bulk_update_overtime(db, request, payType.PAYABLE)
+
+
+@employee_hours_router.post(
+    "/overtime/reject",
+    response_model=schemas.OvertimeBulkResponse,
+    status_code=status.HTTP_200_OK,
+)
+def reject_overtime(db: DatabaseSession, request: schemas.OvertimeBulkRequest):
+    """
+    Rechaza en bloque las horas extra pendientes (pasan a no pagables).
+    """
+    return services.bulk_update_overtime(db, request, payType.NOT_PAYABLE)
+
+
 @employee_hours_router.patch(
     "/{employee_hours_id}",
     response_model=schemas.EmployeeHoursPatchResponse,
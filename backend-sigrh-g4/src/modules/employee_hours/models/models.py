@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 from datetime import time, date
 from enum import Enum
@@ -23,6 +24,10 @@ class payType(str, Enum):
 
 class EmployeeHours(SQLModel, table=True):
     __tablename__ = "employee_hours"  # type: ignore
+    # Las consultas de liquidación filtran por empleado y rango de fechas
+    __table_args__ = (
+        Index("ix_employee_hours_employee_id_work_date", "employee_id", "work_date"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     employee_id: int | None = Field(
@@ -39,6 +44,16 @@ class EmployeeHours(SQLModel, table=True):
     extra_hours: Optional[time] = Field(default=None, nullable=True)
     payroll_status: payType = Field(default=None)
     notes: str
+    # Corrida del cálculo que generó la fila (None si se cargó a mano)
+    run_id: int | None = Field(
+        default=None, foreign_key="payroll_run.id", index=True, ondelete="SET NULL"
+    )
+    # Motivo de la fila calculada (ver `payroll_calculator.reasons`)
+    reason_code: str | None = Field(default=None, max_length=16)
+    # Período cerrado al que pertenece la fila; cerrada, ya no se recalcula
+    period_id: int | None = Field(
+        default=None, foreign_key="payroll_period.id", index=True
+    )
 
     employee: "Employee" = Relationship(back_populates="employee_hours")
     concept: "Concept" = Relationship(back_populates="employee_hours")
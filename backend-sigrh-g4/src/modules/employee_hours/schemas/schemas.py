@@ -1,7 +1,8 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
 from datetime import date, time
 from enum import Enum
+from src.modules.payroll_calculator import reasons
 
 
 class RegisterType(str, Enum):
@@ -64,3 +65,32 @@ class EmployeeHoursResponse(BaseModel):
     sumary_time: time
     work_date: date
     payroll_status: str
+    extra_hours: Optional[time] = None
+    run_id: Optional[int] = None
+    reason_code: Optional[str] = None
+
+    @model_validator(mode="after")
+    def describe_reason(self):
+        # Las filas calculadas guardan un código: el texto se arma al leer
+        self.notes = reasons.describe(self.reason_code, self.notes, self.extra_hours)
+        return self
+
+
+class OvertimeBulkRequest(BaseModel):
+    """
+    Horas extra pendientes a aprobar o rechazar: una lista de IDs o filtros
+    por rango de fechas (opcionalmente por empleados o sector).
+    """
+
+    ids: Optional[List[int]] = Field(default=None, min_length=1)
+    employee_ids: Optional[List[int]] = None
+    sector_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class OvertimeBulkResponse(BaseModel):
+    payroll_status: str
+    updated: int
+    # IDs pedidos que no estaban pendientes de validación (o no existen)
+    skipped: int = 0
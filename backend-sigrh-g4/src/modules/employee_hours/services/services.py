@@ -1,12 +1,19 @@
 from typing import Sequence
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import select
+from sqlmodel import col, select, update
 from src.database.core import DatabaseSession
 from src.modules.concept.models.models import Concept
-from src.modules.employee_hours.schemas.schemas import EmployeeHoursRequest, EmployeeHoursPatchRequest
-from src.modules.employee_hours.models.models import EmployeeHours
+from src.modules.employee_hours.schemas.schemas import (
+    EmployeeHoursRequest,
+    EmployeeHoursPatchRequest,
+    OvertimeBulkRequest,
+    OvertimeBulkResponse,
+)
+from src.modules.employee_hours.models.models import EmployeeHours, payType
 from src.modules.employees.models.employee import Employee
+from src.modules.employees.models.job import Job
+from src.modules.employees.services import sector_service
 from src.modules.employees.services.utils import get_employee_by_id
 from src.modules.concept.services.service import get_concept_by_id
 from src.modules.shift.models.models import Shift
@@ -124,3 +131,81 @@ def validate_employee_hours(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Shift id doesn't match"
         )
+
+
+def validate_overtime_bulk_request(
+    db: DatabaseSession, request: OvertimeBulkRequest
+) -> None:
+    if request.ids is None and (request.start_date is None or request.end_date is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either ids or start_date and end_date are required",
+        )
+    has_filters = bool(request.employee_ids) or any(
+        value is not None
+        for value in (request.sector_id, request.start_date, request.end_date)
+    )
+    if request.ids is not None and has_filters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids cannot be combined with filters",
+        )
+    if request.start_date and request.end_date and request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    if request.sector_id is not None:
+        sector_service.get_sector_by_id(db, request.sector_id)
+
+
+def bulk_update_overtime(
+    db: DatabaseSession, request: OvertimeBulkRequest, payroll_status: payType
+) -> OvertimeBulkResponse:
+    """
+    Aprueba o rechaza horas extra pendientes con un único UPDATE. Solo cambian
+    las filas que siguen pendientes de validación, así repetir el pedido no
+    pisa decisiones ya tomadas.
+    """
+    validate_overtime_bulk_request(db, request)
+
+    stmt = update(EmployeeHours).where(
+        EmployeeHours.payroll_status == payType.PENDING_VALIDATION
+    )
+    if request.ids is not None:
+        stmt = stmt.where(col(EmployeeHours.id).in_(request.ids))
+    else:
+        stmt = stmt.where(
+            col(EmployeeHours.work_date).between(request.start_date, request.end_date)
+        )
+        if request.employee_ids:
+            stmt = stmt.where(col(EmployeeHours.employee_id).in_(request.employee_ids))
+        if request.sector_id is not None:
+            sector_employees = (
+                select(Employee.id)
+                .join(Job, col(Employee.job_id) == col(Job.id))
+                .where(Job.sector_id == request.sector_id)
+            )
+            stmt = stmt.where(col(EmployeeHours.employee_id).in_(sector_employees))
+
+    try:
+        result = db.execute(
+            stmt.values(payroll_status=payroll_status).execution_options(
+                synchronize_session=False
+            )
+        )
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        logging.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An unexpected error occurred",
+        )
+
+    updated = result.rowcount
+    return OvertimeBulkResponse(
+        payroll_status=payroll_status.value,
+        updated=updated,
+        skipped=len(set(request.ids)) - updated if request.ids is not None else 0,
+    )
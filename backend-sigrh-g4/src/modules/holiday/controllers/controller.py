@@ -0,0 +1,71 @@
+from typing import List, Optional
+from fastapi import APIRouter, status
+from src.database.core import DatabaseSession
+from src.modules.holiday.schemas import schemas
+from src.modules.holiday.services import service
+
+holiday_router = APIRouter(prefix="/holiday", tags=["Holiday"])
+
+
+@holiday_router.get(
+    "/", response_model=List[schemas.HolidayResponse], status_code=status.HTTP_200_OK
+)
+def read_holidays(db: DatabaseSession, year: Optional[int] = None):
+    return service.get_holidays(db, year)
+
+
+@holiday_router.post(
+    "/", response_model=schemas.HolidayResponse, status_code=status.HTTP_201_CREATED
+)
+def create_holiday(db: DatabaseSession, request: schemas.HolidayRequest):
+    return service.post_holiday(db, request)
+
+
+@holiday_router.get(
+    "/closures",
+    response_model=List[schemas.CompanyClosureResponse],
+    status_code=status.HTTP_200_OK,
+)
+def read_closures(db: DatabaseSession):
+    return service.get_closures(db)
+
+
+@holiday_router.post(
+    "/closures",
+    response_model=schemas.CompanyClosureResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_closure(db: DatabaseSession, request: schemas.CompanyClosureRequest):
+    return service.post_closure(db, request)
+
+
+@holiday_router.patch(
+    "/closures/{closure_id}",
+    response_model=schemas.CompanyClosureResponse,
+    status_code=status.HTTP_200_OK,
+)
+def update_closure(
+    db: DatabaseSession, closure_id: int, request: schemas.CompanyClosureRequest
+):
+    return service.patch_closure(db, closure_id, request)
+
+
+@holiday_router.delete("/closures/{closure_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_closure(db: DatabaseSession, closure_id: int):
+    return service.delete_closure(db, closure_id)
+
+
+@holiday_router.patch(
+    "/{holiday_id}",
+    response_model=schemas.HolidayResponse,
+    status_code=status.HTTP_200_OK,
+)
+def update_holiday(
+    db: DatabaseSession, holiday_id: int, request: schemas.HolidayRequest
+):
+    return service.patch_holiday(db, holiday_id, request)
+
+
+@holiday_router.delete("/{holiday_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_holiday(db: DatabaseSession, holiday_id: int):
+    return service.delete_holiday(db, holiday_id)
@@ -0,0 +1,36 @@
+from sqlmodel import Field, SQLModel
+from datetime import date
+from typing import Optional
+
+
+class Holiday(SQLModel, table=True):
+    """
+    Feriado de un país o, si tiene `state_id`, solo de una provincia. Aplica a
+    los empleados según el país y la provincia de su domicilio.
+    """
+
+    __tablename__ = "holiday"  # type: ignore
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    day: date = Field(index=True)
+    description: str = Field(max_length=100)
+    country_id: int = Field(foreign_key="country.id", ondelete="CASCADE")
+    state_id: Optional[int] = Field(
+        default=None, foreign_key="state.id", nullable=True, ondelete="CASCADE"
+    )
+    # Sube en cada modificación: el cache de calendarios la usa para detectar
+    # cambios hechos desde otro worker (ver `calendar_cache`)
+    version: int = Field(default=1)
+
+
+class CompanyClosure(SQLModel, table=True):
+    """Cierre de la empresa (vacaciones colectivas, inventario): no hábil para todos."""
+
+    __tablename__ = "company_closure"  # type: ignore
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    start_date: date = Field(index=True)
+    end_date: date = Field(index=True)
+    description: str = Field(max_length=100)
+    # Igual que en `Holiday`
+    version: int = Field(default=1)
@@ -0,0 +1,31 @@
+from datetime import date
+from typing import Optional
+from pydantic import BaseModel
+
+
+class HolidayRequest(BaseModel):
+    day: date
+    description: str
+    country_id: int
+    state_id: Optional[int] = None
+
+
+class HolidayResponse(BaseModel):
+    id: int
+    day: date
+    description: str
+    country_id: int
+    state_id: Optional[int] = None
+
+
+class CompanyClosureRequest(BaseModel):
+    start_date: date
+    end_date: date
+    description: str
+
+
+class CompanyClosureResponse(BaseModel):
+    id: int
+    start_date: date
+    end_date: date
+    description: str
@@ -0,0 +1,181 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from os import getenv
+from threading import Lock
+from time import monotonic
+from typing import Iterable, Optional, Sequence
+from sqlalchemy import Integer, func, literal, null, union_all
+from sqlmodel import col, select
+from src.database.core import DatabaseSession
+from src.modules.holiday.models.models import CompanyClosure, Holiday
+
+# (country_id, state_id) del domicilio del empleado
+Region = tuple[Optional[int], Optional[int]]
+# Los cierres de la empresa aplican a todos los empleados
+COMPANY_WIDE: Region = (None, None)
+# Un año cacheado se vuelve a leer entero pasado este tiempo, aunque su firma
+# no haya cambiado (cubre escrituras hechas por fuera del servicio de feriados)
+TTL_SECONDS = float(getenv("HOLIDAY_CACHE_TTL_SECONDS", "300"))
+
+
+@dataclass(frozen=True, slots=True)
+class HolidayCalendar:
+    """
+    Días no hábiles (feriados y cierres) de una región a partir de `first_day`,
+    como bitmap: el bit `i` corresponde al día `first_day + i`. Es inmutable y
+    se puede enviar a otros procesos.
+    """
+
+    first_ordinal: int
+    days: int
+    bits: bytes
+
+    def is_holiday(self, day: date) -> bool:
+        index = day.toordinal() - self.first_ordinal
+        if index < 0 or index >= self.days:
+            return False
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def mask(self, days: Sequence[date]) -> list[bool]:
+        return [self.is_holiday(day) for day in days]
+
+
+class YearCalendar:
+    """Bitmaps de días no hábiles de un año, uno por región que tiene alguno."""
+
+    def __init__(self, year: int) -> None:
+        self.first_day = date(year, 1, 1)
+        self.days = (date(year + 1, 1, 1) - self.first_day).days
+        self.last_day = self.first_day + timedelta(days=self.days - 1)
+        self._regions: dict[Region, int] = {}
+        self.signature: tuple = ()
+        self.loaded_at = 0.0
+
+    def mark(self, region: Region, start_date: date, end_date: date) -> None:
+        first = max((start_date - self.first_day).days, 0)
+        last = min((end_date - self.first_day).days, self.days - 1)
+        if first > last:
+            return
+        run = ((1 << (last - first + 1)) - 1) << first
+        self._regions[region] = self._regions.get(region, 0) | run
+
+    def bits_for(self, country_id: Optional[int], state_id: Optional[int]) -> int:
+        bits = self._regions.get(COMPANY_WIDE, 0)
+        if country_id is not None:
+            bits |= self._regions.get((country_id, None), 0)
+            if state_id is not None:
+                bits |= self._regions.get((country_id, state_id), 0)
+        return bits
+
+
+class CalendarCache:
+    """
+    Cache en proceso de los días no hábiles por año.
+
+    Cada año se carga con una sola consulta (feriados y cierres juntos) la
+    primera vez que se pide. El servicio de feriados llama a `invalidate` al
+    crear, modificar o borrar, pero eso solo limpia el proceso que atendió la
+    escritura: antes de usar un año cacheado se compara su firma con la de la
+    base, y pasado `TTL_SECONDS` se recarga igual.
+
+    La firma es cantidad, suma de ids y suma de `version` de los feriados y
+    cierres que tocan el año. Modificar una fila sube su `version`, crear o
+    borrar cambia la cantidad, y borrar una y crear otra cambia la suma de ids
+    (los ids nuevos son siempre mayores).
+    """
+
+    def __init__(self) -> None:
+        self._years: dict[int, YearCalendar] = {}
+        self._lock = Lock()
+
+    def get_calendars(
+        self,
+        db: DatabaseSession,
+        regions: Iterable[Region],
+        start_date: date,
+        end_date: date,
+    ) -> dict[Region, HolidayCalendar]:
+        """Un calendario por región, que cubre los años de `start_date` a `end_date`."""
+        with self._lock:
+            years = []
+            for year in range(start_date.year, end_date.year + 1):
+                cached = self._years.get(year)
+                if cached is None or not self._is_fresh(db, cached):
+                    cached = self._years[year] = self._load(db, year)
+                years.append(cached)
+
+        first_ordinal = years[0].first_day.toordinal()
+        days = sum(year.days for year in years)
+        calendars = {}
+        for country_id, state_id in set(regions):
+            bits, offset = 0, 0
+            for year in years:
+                bits |= year.bits_for(country_id, state_id) << offset
+                offset += year.days
+            calendars[(country_id, state_id)] = HolidayCalendar(
+                first_ordinal=first_ordinal,
+                days=days,
+                bits=bits.to_bytes((days + 7) // 8, "little"),
+            )
+        return calendars
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._years.clear()
+
+    def _is_fresh(self, db: DatabaseSession, calendar: YearCalendar) -> bool:
+        if monotonic() - calendar.loaded_at > TTL_SECONDS:
+            return False
+        return self._signature(db, calendar) == calendar.signature
+
+    def _signature(self, db: DatabaseSession, calendar: YearCalendar) -> tuple:
+        """Resumen barato de los feriados y cierres que tocan el año."""
+        first_day, last_day = calendar.first_day, calendar.last_day
+        holidays = select(
+            literal(0),
+            func.count(col(Holiday.id)),
+            func.coalesce(func.sum(Holiday.id), 0),
+            func.coalesce(func.sum(Holiday.version), 0),
+        ).where(col(Holiday.day).between(first_day, last_day))
+        closures = select(
+            literal(1),
+            func.count(col(CompanyClosure.id)),
+            func.coalesce(func.sum(CompanyClosure.id), 0),
+            func.coalesce(func.sum(CompanyClosure.version), 0),
+        ).where(
+            CompanyClosure.start_date <= last_day,
+            CompanyClosure.end_date >= first_day,
+        )
+        rows = db.execute(union_all(holidays, closures)).all()
+        return tuple(tuple(row[1:]) for row in sorted(rows, key=lambda row: row[0]))
+
+    def _load(self, db: DatabaseSession, year: int) -> YearCalendar:
+        calendar = YearCalendar(year)
+        # La firma se toma antes de leer: si cambia en el medio, la próxima
+        # lectura no coincide y el año se recarga
+        calendar.signature = self._signature(db, calendar)
+        calendar.loaded_at = monotonic()
+        first_day, last_day = calendar.first_day, calendar.last_day
+        holidays = select(
+            Holiday.day,
+            Holiday.day,
+            Holiday.country_id,
+            Holiday.state_id,
+        ).where(col(Holiday.day).between(first_day, last_day))
+        closures = select(
+            CompanyClosure.start_date,
+            CompanyClosure.end_date,
+            null().cast(Integer),
+            null().cast(Integer),
+        ).where(
+            CompanyClosure.start_date <= last_day,
+            CompanyClosure.end_date >= first_day,
+        )
+        for start_date, end_date, country_id, state_id in db.execute(
+            union_all(holidays, closures)
+        ):
+            calendar.mark((country_id, state_id), start_date, end_date)
+        return calendar
+
+
+calendar_cache = CalendarCache()
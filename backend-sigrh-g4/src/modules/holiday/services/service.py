@@ -0,0 +1,144 @@
+from datetime import date
+from typing import Any, Sequence, cast
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from src.database.core import DatabaseSession
+from src.modules.employees.services import country_service, state_service
+from src.modules.holiday.models.models import CompanyClosure, Holiday
+from src.modules.holiday.schemas.schemas import CompanyClosureRequest, HolidayRequest
+from src.modules.holiday.services.calendar_cache import calendar_cache
+import logging
+
+
+def validate_holiday_region(db: DatabaseSession, request: HolidayRequest) -> None:
+    country_service.get_country_by_id(db, request.country_id)
+    if request.state_id is not None:
+        state = state_service.get_state_by_id(db, request.state_id)
+        if state.country_id != request.country_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The state does not belong to the country",
+            )
+
+
+def get_holiday_by_id(db: DatabaseSession, id: int) -> Holiday:
+    holiday = db.get(Holiday, id)
+    if not holiday:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Holiday id was not found"
+        )
+    return holiday
+
+
+def get_holidays(db: DatabaseSession, year: int | None = None) -> Sequence[Holiday]:
+    query = select(Holiday).order_by(cast(Any, Holiday.day))
+    if year is not None:
+        query = query.where(
+            cast(Any, Holiday.day).between(date(year, 1, 1), date(year, 12, 31))
+        )
+    return db.exec(query).all()
+
+
+def post_holiday(db: DatabaseSession, request: HolidayRequest) -> Holiday:
+    validate_holiday_region(db, request)
+    try:
+        db_holiday = Holiday(**request.model_dump())
+        db.add(db_holiday)
+        db.commit()
+        db.refresh(db_holiday)
+        calendar_cache.invalidate()
+        return db_holiday
+    except IntegrityError as e:
+        db.rollback()
+        logging.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An unexpected error occurred",
+        )
+
+
+def patch_holiday(
+    db: DatabaseSession, holiday_id: int, request: HolidayRequest
+) -> Holiday:
+    db_holiday = get_holiday_by_id(db, holiday_id)
+    validate_holiday_region(db, request)
+    try:
+        for attr, value in request.model_dump(exclude_unset=True).items():
+            if hasattr(db_holiday, attr):
+                setattr(db_holiday, attr, value)
+        # Se incrementa en el UPDATE: dos modificaciones simultáneas suman dos
+        db_holiday.version = cast(Any, Holiday.version) + 1
+        db.add(db_holiday)
+        db.commit()
+        calendar_cache.invalidate()
+        return db_holiday
+    except IntegrityError as e:
+        db.rollback()
+        logging.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An unexpected error occurred",
+        )
+
+
+def delete_holiday(db: DatabaseSession, holiday_id: int):
+    db_holiday = get_holiday_by_id(db, holiday_id)
+    db.delete(db_holiday)
+    db.commit()
+    calendar_cache.invalidate()
+
+
+def validate_closure(request: CompanyClosureRequest) -> None:
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+
+
+def get_closure_by_id(db: DatabaseSession, id: int) -> CompanyClosure:
+    closure = db.get(CompanyClosure, id)
+    if not closure:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Closure id was not found"
+        )
+    return closure
+
+
+def get_closures(db: DatabaseSession) -> Sequence[CompanyClosure]:
+    return db.exec(
+        select(CompanyClosure).order_by(cast(Any, CompanyClosure.start_date))
+    ).all()
+
+
+def post_closure(db: DatabaseSession, request: CompanyClosureRequest) -> CompanyClosure:
+    validate_closure(request)
+    db_closure = CompanyClosure(**request.model_dump())
+    db.add(db_closure)
+    db.commit()
+    db.refresh(db_closure)
+    calendar_cache.invalidate()
+    return db_closure
+
+
+def patch_closure(
+    db: DatabaseSession, closure_id: int, request: CompanyClosureRequest
+) -> CompanyClosure:
+    validate_closure(request)
+    db_closure = get_closure_by_id(db, closure_id)
+    for attr, value in request.model_dump(exclude_unset=True).items():
+        if hasattr(db_closure, attr):
+            setattr(db_closure, attr, value)
+    db_closure.version = cast(Any, CompanyClosure.version) + 1
+    db.add(db_closure)
+    db.commit()
+    calendar_cache.invalidate()
+    return db_closure
+
+
+def delete_closure(db: DatabaseSession, closure_id: int):
+    db_closure = get_closure_by_id(db, closure_id)
+    db.delete(db_closure)
+    db.commit()
+    calendar_cache.invalidate()
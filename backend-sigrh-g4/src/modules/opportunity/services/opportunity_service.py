@@ -15,6 +15,7 @@ from src.modules.opportunity.schemas.job_opportunity_schemas import (
 )
 from src.modules.ability.models.ability_models import AbilityModel
 from src.modules.ability.schemas.ability_schemas import AbilityPublic
+from src.cv_matching.phrase_matchers import phrase_matcher_cache
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 import logging
@@ -251,6 +252,7 @@ def update_opportunity(
         db.add(opportunity)
         db.commit()
         db.refresh(opportunity)
+        phrase_matcher_cache.invalidate(opportunity_id)
 
         return get_opportunity_with_abilities(db, opportunity.id)
 
@@ -281,6 +283,7 @@ def delete_opportunity(db: DatabaseSession, opportunity_id: int):
         db.commit()
         db.delete(opportunity)
         db.commit()
+        phrase_matcher_cache.invalidate(opportunity_id)
     except IntegrityError as e:
         logger.info(e)
         db.rollback()
@@ -0,0 +1,16 @@
+# Descripciones de los conceptos que genera el cálculo de horas.
+NON_WORKING_DAY = "Día no hábil."
+ABSENT_WITHOUT_CHECK_IN = "Ausente sin entrada registrada"
+PRESENT_WITHOUT_CHECK_OUT = "Presente sin salida registrada"
+FULL_WORKDAY = "Jornada laboral completa"
+MISSING_TIME = "Tiempo faltante"
+OVERTIME = "Horas extra"
+
+PAYROLL_CONCEPTS = (
+    NON_WORKING_DAY,
+    ABSENT_WITHOUT_CHECK_IN,
+    PRESENT_WITHOUT_CHECK_OUT,
+    FULL_WORKDAY,
+    MISSING_TIME,
+    OVERTIME,
+)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, status
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from src.database.core import DatabaseSession
 from src.modules.payroll_calculator import schemas
-from src.modules.payroll_calculator import service
+from src.modules.payroll_calculator import export, periods, runs, service, simulation
+from src.modules.payroll_calculator.jobs import payroll_jobs
 
 payroll_router = APIRouter(prefix="/payroll", tags=["Payroll Calculation"])
 
@@ -10,21 +13,156 @@ payroll_router = APIRouter(prefix="/payroll", tags=["Payroll Calculation"])
     response_model=list[schemas.PayrollPendingValidationResponse],
     status_code=status.HTTP_200_OK,
 )
-async def get_pending_validation_hours(db: DatabaseSession, request: schemas.PayrollPendingValidationRequest):
+def get_pending_validation_hours(db: DatabaseSession, request: schemas.PayrollPendingValidationRequest):
     return service.get_pending_validation_hours(db, request)
 
 @payroll_router.post(
     "/calculate",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def calculate_hours(db: DatabaseSession, request: schemas.PayrollRequest):
+def calculate_hours(db: DatabaseSession, request: schemas.PayrollRequest):
     return service.calculate_hours(db, request)
 
 
+@payroll_router.post(
+    "/calculate/batch",
+    response_model=schemas.PayrollBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+def calculate_hours_batch(db: DatabaseSession, request: schemas.PayrollBatchRequest):
+    return service.calculate_hours_batch(db, request)
+
+
+@payroll_router.post(
+    "/simulate",
+    response_model=schemas.PayrollSimulationResponse,
+    status_code=status.HTTP_200_OK,
+)
+def simulate_payroll(db: DatabaseSession, request: schemas.PayrollSimulationRequest):
+    return simulation.simulate_payroll(db, request)
+
+
+@payroll_router.post(
+    "/jobs",
+    response_model=schemas.PayrollJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_payroll_job(request: schemas.PayrollBatchRequest):
+    return payroll_jobs.submit(request).to_response()
+
+
+@payroll_router.get(
+    "/jobs/{job_id}",
+    response_model=schemas.PayrollJobResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_payroll_job(job_id: str):
+    return payroll_jobs.get(job_id).to_response()
+
+
+@payroll_router.post(
+    "/jobs/{job_id}/cancel",
+    response_model=schemas.PayrollJobResponse,
+    status_code=status.HTTP_200_OK,
+)
+def cancel_payroll_job(job_id: str):
+    return payroll_jobs.cancel(job_id).to_response()
+
+
+@payroll_router.post(
+    "/calculate/dirty",
+    response_model=schemas.PayrollRecalculateResponse,
+    status_code=status.HTTP_200_OK,
+)
+def recalculate_dirty_days(db: DatabaseSession, request: schemas.PayrollRecalculateRequest):
+    return service.recalculate_dirty_days(db, request)
+
+
 @payroll_router.post(
     "/hours",
     response_model=list[schemas.PayrollResponse],
     status_code=status.HTTP_200_OK,
 )
-async def get_hours_by_date_range(db: DatabaseSession, request: schemas.PayrollRequest):
+def get_hours_by_date_range(db: DatabaseSession, request: schemas.PayrollRequest):
     return service.get_hours_by_date_range(db, request)
+
+
+@payroll_router.post(
+    "/periods/close",
+    response_model=schemas.PayrollPeriodResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def close_period(db: DatabaseSession, request: schemas.PayrollPeriodCloseRequest):
+    return periods.close_period(db, request)
+
+
+@payroll_router.get(
+    "/periods",
+    response_model=list[schemas.PayrollPeriodResponse],
+    status_code=status.HTTP_200_OK,
+)
+def get_periods(db: DatabaseSession):
+    return periods.get_periods(db)
+
+
+@payroll_router.get(
+    "/periods/{period_id}/summaries",
+    response_model=list[schemas.PayrollPeriodSummaryResponse],
+    status_code=status.HTTP_200_OK,
+)
+def get_period_summaries(db: DatabaseSession, period_id: int):
+    return periods.get_period_summaries(db, period_id)
+
+
+@payroll_router.get(
+    "/runs",
+    response_model=list[schemas.PayrollRunResponse],
+    status_code=status.HTTP_200_OK,
+)
+def get_runs(
+    db: DatabaseSession,
+    limit: int = Query(default=50, ge=1, le=500),
+    before_id: Optional[int] = None,
+):
+    return runs.get_runs(db, limit, before_id)
+
+
+@payroll_router.get(
+    "/runs/{run_id}",
+    response_model=schemas.PayrollRunResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_run(db: DatabaseSession, run_id: int):
+    return runs.get_run_by_id(db, run_id)
+
+
+EXPORT_MEDIA_TYPES = {
+    schemas.PayrollExportFormat.CSV: "text/csv; charset=utf-8",
+    schemas.PayrollExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@payroll_router.post(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def export_hours(db: DatabaseSession, request: schemas.PayrollExportRequest):
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    export.validate_export_request(db, request)
+
+    batches = export.iter_export_rows(request)
+    if request.format == schemas.PayrollExportFormat.XLSX:
+        content = export.stream_xlsx(batches)
+    else:
+        content = export.stream_csv(batches)
+    filename = f"payroll_{request.start_date}_{request.end_date}.{request.format.value}"
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[request.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
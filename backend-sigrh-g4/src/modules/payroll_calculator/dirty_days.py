@@ -0,0 +1,79 @@
+"""
+Marcas de días pendientes de recálculo.
+
+Los servicios de fichadas marcan en `payroll_dirty_day` los días que cambiaron
+y el recálculo incremental las consume. El módulo solo depende de los modelos y
+del motor en memoria, así que importarlo no carga el servicio de liquidación.
+"""
+
+from datetime import date, datetime
+from typing import Iterable, Optional
+from sqlmodel import and_, col, delete, or_
+from src.database.core import DatabaseSession
+from src.modules.employees.models.employee import Employee
+from src.modules.payroll_calculator import engine
+from src.modules.payroll_calculator.models import PayrollDirtyDay
+
+
+def mark_dirty_days(
+    db: DatabaseSession, employee: Optional[Employee], event_dates: Iterable[datetime]
+) -> None:
+    """
+    Marca como pendientes de recálculo los días afectados por fichadas nuevas,
+    modificadas o borradas. No hace commit: se guarda junto con la fichada.
+    Las fichadas sin empleado no afectan ningún cálculo y no marcan nada.
+    """
+    if employee is None:
+        return
+    work_dates: set[date] = set()
+    for event_date in event_dates:
+        if employee.shift is None:
+            work_dates.add(event_date.date())
+        else:
+            work_dates.update(
+                engine.affected_work_dates(employee.shift.type, event_date.date())
+            )
+    for work_date in work_dates:
+        # merge: si el día ya estaba marcado solo se actualiza `marked_at`
+        db.merge(PayrollDirtyDay(employee_id=employee.id, work_date=work_date))
+
+
+def delete_dirty_days(
+    db: DatabaseSession, days_by_employee: dict[int, list[date]], marked_before: datetime
+) -> None:
+    """
+    Quita las marcas de los días ya recalculados. Las marcas posteriores al
+    inicio del cálculo se conservan para la próxima corrida.
+    """
+    if not days_by_employee:
+        return
+    db.execute(
+        delete(PayrollDirtyDay).where(
+            or_(
+                *(
+                    and_(
+                        PayrollDirtyDay.employee_id == employee_id,
+                        col(PayrollDirtyDay.work_date).in_(days),
+                    )
+                    for employee_id, days in days_by_employee.items()
+                )
+            ),
+            col(PayrollDirtyDay.marked_at) <= marked_before,
+        )
+    )
+
+
+def delete_dirty_days_in_range(
+    db: DatabaseSession,
+    employee_ids: list[int],
+    start_date: date,
+    end_date: date,
+    marked_before: datetime,
+) -> None:
+    db.execute(
+        delete(PayrollDirtyDay).where(
+            col(PayrollDirtyDay.employee_id).in_(employee_ids),
+            col(PayrollDirtyDay.work_date).between(start_date, end_date),
+            col(PayrollDirtyDay.marked_at) <= marked_before,
+        )
+    )
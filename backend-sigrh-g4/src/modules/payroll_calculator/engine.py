@@ -0,0 +1,388 @@
+"""
+Motor de evaluación de turnos.
+
+Todo el módulo trabaja sobre datos en memoria (sin sesión de base de datos):
+recibe las fichadas ya ordenadas de un empleado y los atributos de su turno,
+y devuelve un `DayResult` por cada fila de `employee_hours` a generar. El
+servicio se encarga de cargar los datos y de persistir el resultado.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Callable, Iterable, Sequence
+from src.modules.clock_events.schemas.schemas import ClockEventTypes
+from src.modules.employee_hours.models.models import RegisterType, payType
+from src.modules.payroll_calculator import concepts, reasons
+
+if TYPE_CHECKING:
+    from src.modules.holiday.services.calendar_cache import HolidayCalendar
+
+
+@dataclass(frozen=True, slots=True)
+class ClockEvent:
+    event_date: datetime
+    event_type: ClockEventTypes
+
+
+@dataclass(frozen=True, slots=True)
+class ShiftSpec:
+    id: int
+    type: str
+    working_hours: float
+    working_days: int
+
+
+@dataclass(frozen=True, slots=True)
+class ShiftRules:
+    """
+    Parámetros de evaluación. La jornada se considera completa si el tiempo
+    trabajado está dentro de `working_hours` ± `tolerance`.
+    """
+
+    tolerance: timedelta = timedelta(minutes=30)
+
+
+@dataclass(frozen=True, slots=True)
+class DayResult:
+    work_date: date
+    concept: str
+    register_type: RegisterType
+    payroll_status: payType
+    check_count: int
+    first_check_in: time | None = None
+    last_check_out: time | None = None
+    sumary_time: time | None = None
+    extra_hours: time | None = None
+    # Código de `reasons`; `notes` solo lleva el detalle que no sale de las columnas
+    reason: str = ""
+    notes: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class ShiftTypeRule:
+    """
+    Dónde puede caer la salida de un turno: `out_day_offsets` son los días
+    (relativos al día de la entrada) en los que vale la última salida de la
+    jornada. Las salidas intermedias (pausas) pueden caer en cualquier día
+    hasta el último de `out_day_offsets`.
+    """
+
+    out_day_offsets: tuple[int, ...]
+
+    @property
+    def max_out_offset(self) -> int:
+        return max(self.out_day_offsets)
+
+
+SHIFT_TYPE_RULES: dict[str, ShiftTypeRule] = {
+    # Entrada y salida en el mismo día
+    "matutino": ShiftTypeRule(out_day_offsets=(0,)),
+    # La salida puede caer el mismo día o pasada la medianoche
+    "vespertino": ShiftTypeRule(out_day_offsets=(0, 1)),
+    # La salida siempre cae el día siguiente
+    "nocturno": ShiftTypeRule(out_day_offsets=(1,)),
+}
+DEFAULT_SHIFT_TYPE = "nocturno"
+
+
+def get_shift_type_rule(shift_type: str) -> ShiftTypeRule:
+    return SHIFT_TYPE_RULES.get(
+        shift_type.strip().lower(), SHIFT_TYPE_RULES[DEFAULT_SHIFT_TYPE]
+    )
+
+
+def affected_work_dates(shift_type: str, event_day: date) -> list[date]:
+    """
+    Días cuyo cálculo depende de una fichada del día `event_day`: el propio día
+    y, en los turnos que cruzan la medianoche, el día en que empezó el turno.
+    """
+    offsets = get_shift_type_rule(shift_type).out_day_offsets
+    return sorted({event_day} | {event_day - timedelta(days=offset) for offset in offsets})
+
+
+@dataclass(slots=True)
+class DayContext:
+    """Datos ya resueltos de un día de un empleado, insumo de las reglas."""
+
+    day: date
+    shift: ShiftSpec
+    rules: ShiftRules
+    is_working_day: bool
+    check_count: int
+    check_in: datetime | None = None
+    check_out: datetime | None = None
+    # Suma de los intervalos entrada-salida del día; si falta, de entrada a salida
+    worked: timedelta | None = None
+
+
+DayRule = Callable[[DayContext], list[DayResult] | None]
+
+
+def minutes_to_time(minutes: int) -> time:
+    return time(hour=minutes // 60, minute=minutes % 60)
+
+
+def non_working_day_rule(ctx: DayContext) -> list[DayResult] | None:
+    if ctx.is_working_day:
+        return None
+    return [
+        DayResult(
+            work_date=ctx.day,
+            concept=concepts.NON_WORKING_DAY,
+            register_type=RegisterType.DIA_NO_HABIL,
+            payroll_status=payType.NOT_PAYABLE,
+            check_count=0,
+            reason=reasons.NON_WORKING_DAY,
+        )
+    ]
+
+
+def absent_rule(ctx: DayContext) -> list[DayResult] | None:
+    if ctx.check_in is not None:
+        return None
+    return [
+        DayResult(
+            work_date=ctx.day,
+            concept=concepts.ABSENT_WITHOUT_CHECK_IN,
+            register_type=RegisterType.AUSENCIA,
+            payroll_status=payType.NOT_PAYABLE,
+            check_count=0,
+            reason=reasons.ABSENT,
+        )
+    ]
+
+
+def missing_check_out_rule(ctx: DayContext) -> list[DayResult] | None:
+    if ctx.check_out is not None:
+        return None
+    return [
+        DayResult(
+            work_date=ctx.day,
+            concept=concepts.PRESENT_WITHOUT_CHECK_OUT,
+            register_type=RegisterType.PRESENCIA,
+            payroll_status=payType.NOT_PAYABLE,
+            check_count=ctx.check_count,
+            first_check_in=ctx.check_in.time() if ctx.check_in else None,
+            reason=reasons.NO_CHECK_OUT,
+        )
+    ]
+
+
+def worked_time_rule(ctx: DayContext) -> list[DayResult] | None:
+    if ctx.check_in is None or ctx.check_out is None:
+        return None
+
+    worked = ctx.worked if ctx.worked is not None else ctx.check_out - ctx.check_in
+    worked_seconds = int(worked.total_seconds())
+    # El rango se valida en minutos completos, los segundos no suman
+    worked_minutes = worked_seconds // 60
+    nominal_minutes = round(ctx.shift.working_hours * 60)
+    tolerance_minutes = int(ctx.rules.tolerance.total_seconds()) // 60
+
+    common = dict(
+        work_date=ctx.day,
+        register_type=RegisterType.PRESENCIA,
+        check_count=ctx.check_count,
+        first_check_in=ctx.check_in.time(),
+        last_check_out=ctx.check_out.time(),
+    )
+
+    if worked_minutes < nominal_minutes - tolerance_minutes:
+        missing = nominal_minutes - worked_minutes
+        return [
+            DayResult(
+                concept=concepts.MISSING_TIME,
+                payroll_status=payType.NOT_PAYABLE,
+                sumary_time=time(
+                    hour=worked_seconds // 3600,
+                    minute=worked_seconds % 3600 // 60,
+                    second=worked_seconds % 60,
+                ),
+                reason=reasons.MISSING_TIME,
+                notes=reasons.missing_time_notes(missing),
+                **common,
+            )
+        ]
+
+    if worked_minutes <= nominal_minutes + tolerance_minutes:
+        return [
+            DayResult(
+                concept=concepts.FULL_WORKDAY,
+                payroll_status=payType.PAYABLE,
+                sumary_time=time(
+                    hour=worked_seconds // 3600,
+                    minute=worked_seconds % 3600 // 60,
+                    second=worked_seconds % 60,
+                ),
+                reason=reasons.FULL_WORKDAY,
+                **common,
+            )
+        ]
+
+    # Horas extra: se paga la jornada nominal y el excedente queda a validar
+    extra = worked_minutes - nominal_minutes
+    return [
+        DayResult(
+            concept=concepts.FULL_WORKDAY,
+            payroll_status=payType.PAYABLE,
+            sumary_time=minutes_to_time(nominal_minutes),
+            reason=reasons.FULL_WORKDAY,
+            **common,
+        ),
+        DayResult(
+            concept=concepts.OVERTIME,
+            payroll_status=payType.PENDING_VALIDATION,
+            extra_hours=minutes_to_time(extra),
+            reason=reasons.OVERTIME,
+            **common,
+        ),
+    ]
+
+
+# Se evalúan en orden: la primera regla que devuelve filas define el día
+DEFAULT_DAY_RULES: tuple[DayRule, ...] = (
+    non_working_day_rule,
+    absent_rule,
+    missing_check_out_rule,
+    worked_time_rule,
+)
+
+MAX_SHIFT_DURATION = timedelta(hours=24)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkInterval:
+    """Tramo trabajado: una entrada y la última salida que la cierra."""
+
+    start: datetime
+    end: datetime | None
+    # Fichadas que forman el tramo (entradas repetidas y salidas válidas)
+    event_count: int
+
+
+def pair_intervals(
+    events: Iterable[ClockEvent], max_out_offset: int
+) -> dict[date, list[WorkInterval]]:
+    """
+    Arma los tramos entrada-salida de un empleado en una sola pasada sobre sus
+    fichadas ordenadas y los agrupa por el día de la entrada:
+
+    - Una entrada abre un tramo, salvo que la fichada anterior sea otra entrada
+      del mismo día (entrada repetida).
+    - Una salida cierra el tramo abierto o, si ya estaba cerrado, lo extiende
+      (salida repetida o suelta), siempre que caiga a menos de 24 h de la
+      entrada y no más de `max_out_offset` días después.
+    - Las salidas que no cumplen eso, o sin entrada previa, se descartan.
+    """
+    intervals: dict[date, list[WorkInterval]] = defaultdict(list)
+    start: datetime | None = None
+    end: datetime | None = None
+    event_count = 0
+    previous: ClockEvent | None = None
+
+    for event in events:
+        is_in = event.event_type == ClockEventTypes.IN
+        repeated_in = (
+            is_in
+            and previous is not None
+            and previous.event_type == ClockEventTypes.IN
+            and previous.event_date.date() == event.event_date.date()
+        )
+        if is_in and not repeated_in:
+            if start is not None:
+                intervals[start.date()].append(WorkInterval(start, end, event_count))
+            start, end, event_count = event.event_date, None, 1
+        elif start is not None:
+            if is_in:
+                event_count += 1
+            else:
+                elapsed = event.event_date - start
+                out_offset = (event.event_date.date() - start.date()).days
+                if (
+                    timedelta(0) < elapsed < MAX_SHIFT_DURATION
+                    and out_offset <= max_out_offset
+                ):
+                    end = event.event_date
+                    event_count += 1
+        previous = event
+
+    if start is not None:
+        intervals[start.date()].append(WorkInterval(start, end, event_count))
+    return intervals
+
+
+def is_working_day(
+    shift: ShiftSpec, day: date, holidays: "HolidayCalendar | None" = None
+) -> bool:
+    # working_days = 5 -> lunes a viernes, 6 -> lunes a sábado, 7 -> todos los días
+    if day.weekday() >= shift.working_days:
+        return False
+    # Feriados y cierres de la empresa: una consulta al bitmap por día
+    return holidays is None or not holidays.is_holiday(day)
+
+
+def evaluate_shift(
+    shift: ShiftSpec,
+    events: Iterable[ClockEvent],
+    date_range: Sequence[date],
+    rules: ShiftRules = ShiftRules(),
+    day_rules: Sequence[DayRule] = DEFAULT_DAY_RULES,
+    holidays: "HolidayCalendar | None" = None,
+) -> list[DayResult]:
+    """
+    Evalúa los días de `date_range` de un empleado. `events` debe venir ordenado
+    por fecha e incluir el día siguiente al último del rango para los turnos
+    que cruzan la medianoche. El tiempo trabajado es la suma de los tramos
+    entrada-salida del día, sin las pausas. `holidays` son los días no hábiles de la región
+    del empleado, además de los que no cubre su turno.
+    """
+    type_rule = get_shift_type_rule(shift.type)
+    intervals_by_day = pair_intervals(events, type_rule.max_out_offset)
+
+    results: list[DayResult] = []
+    for day in date_range:
+        check_in = None
+        check_out = None
+        worked = None
+        check_count = 0
+
+        intervals = intervals_by_day.get(day)
+        if intervals:
+            check_in = intervals[0].start
+            check_count = sum(interval.event_count for interval in intervals)
+            # La jornada la cierra la salida del último tramo
+            last_end = intervals[-1].end
+            if (
+                last_end is not None
+                and (last_end.date() - day).days in type_rule.out_day_offsets
+            ):
+                worked = sum(
+                    (
+                        interval.end - interval.start
+                        for interval in intervals
+                        if interval.end is not None
+                    ),
+                    timedelta(0),
+                )
+                if worked < MAX_SHIFT_DURATION:
+                    check_out = last_end
+                else:
+                    worked = None
+
+        ctx = DayContext(
+            day=day,
+            shift=shift,
+            rules=rules,
+            is_working_day=is_working_day(shift, day, holidays),
+            check_count=check_count,
+            check_in=check_in,
+            check_out=check_out,
+            worked=worked,
+        )
+        for day_rule in day_rules:
+            day_results = day_rule(ctx)
+            if day_results is not None:
+                results.extend(day_results)
+                break
+    return results
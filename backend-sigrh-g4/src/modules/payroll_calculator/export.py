@@ -0,0 +1,220 @@
+"""
+Exportación de horas liquidadas en CSV y XLSX.
+
+Las filas se leen con un cursor del lado del servidor, en lotes, y se escriben
+a medida que llegan: la memoria usada no depende del tamaño del período y la
+descarga empieza enseguida. El XLSX se arma con `zipfile` (sin dependencias),
+con celdas de texto en línea para no tener que juntar todas las cadenas.
+"""
+
+import csv
+import io
+import zipfile
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Iterable, Iterator, cast
+from xml.sax.saxutils import escape
+from sqlmodel import Session, col, select
+from src.database.core import DatabaseSession, engine
+from src.modules.concept.models.models import Concept
+from src.modules.employee_hours.models.models import EmployeeHours
+from src.modules.employees.models.employee import Employee
+from src.modules.employees.models.job import Job
+from src.modules.employees.services import sector_service
+from src.modules.payroll_calculator import reasons
+from src.modules.payroll_calculator.schemas import PayrollExportRequest
+from src.modules.shift.models.models import Shift
+
+# Filas por lote leído de la base y por bloque escrito a la respuesta
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_COLUMNS = (
+    ("employee_id", Employee.id),
+    ("dni", Employee.dni),
+    ("first_name", Employee.first_name),
+    ("last_name", Employee.last_name),
+    ("work_date", EmployeeHours.work_date),
+    ("concept", Concept.description),
+    ("register_type", EmployeeHours.register_type),
+    ("payroll_status", EmployeeHours.payroll_status),
+    ("shift", Shift.description),
+    ("shift_type", Shift.type),
+    ("check_count", EmployeeHours.check_count),
+    ("first_check_in", EmployeeHours.first_check_in),
+    ("last_check_out", EmployeeHours.last_check_out),
+    ("sumary_time", EmployeeHours.sumary_time),
+    ("extra_hours", EmployeeHours.extra_hours),
+    ("reason_code", EmployeeHours.reason_code),
+    ("notes", EmployeeHours.notes),
+    ("run_id", EmployeeHours.run_id),
+)
+HEADER = [name for name, _ in EXPORT_COLUMNS]
+_EXTRA_HOURS = HEADER.index("extra_hours")
+_REASON_CODE = HEADER.index("reason_code")
+_NOTES = HEADER.index("notes")
+
+
+def validate_export_request(db: DatabaseSession, request: PayrollExportRequest) -> None:
+    """Valida los filtros antes de empezar a responder (después ya no hay status)."""
+    if request.sector_id is not None:
+        sector_service.get_sector_by_id(db, request.sector_id)
+
+
+def export_query(request: PayrollExportRequest):
+    stmt = (
+        select(*(column for _, column in EXPORT_COLUMNS))
+        .join(Employee, cast(Any, EmployeeHours.employee_id == Employee.id))
+        .join(Concept, cast(Any, EmployeeHours.concept_id == Concept.id))
+        .join(Shift, cast(Any, EmployeeHours.shift_id == Shift.id))
+        .where(col(EmployeeHours.work_date).between(request.start_date, request.end_date))
+        .order_by(
+            cast(Any, EmployeeHours.employee_id),
+            cast(Any, EmployeeHours.work_date),
+            cast(Any, EmployeeHours.id),
+        )
+    )
+    if request.employee_ids:
+        stmt = stmt.where(col(EmployeeHours.employee_id).in_(request.employee_ids))
+    if request.sector_id is not None:
+        stmt = stmt.join(Job, cast(Any, Employee.job_id == Job.id)).where(
+            Job.sector_id == request.sector_id
+        )
+    if request.shift_id is not None:
+        stmt = stmt.where(EmployeeHours.shift_id == request.shift_id)
+    return stmt
+
+
+def iter_export_rows(request: PayrollExportRequest) -> Iterator[list[tuple]]:
+    """
+    Lotes de filas del export. Usa su propia sesión: la del request ya está
+    cerrada cuando la respuesta se termina de enviar.
+    """
+    with Session(engine) as db:
+        # stream_results: cursor del lado del servidor en PostgreSQL
+        result = db.execute(
+            export_query(request).execution_options(
+                stream_results=True, yield_per=EXPORT_BATCH_SIZE
+            )
+        )
+        for partition in result.partitions():
+            yield [describe_row(row) for row in partition]
+
+
+def describe_row(row: Any) -> tuple:
+    """Completa `notes` con el texto del código de motivo, como en la API."""
+    values = list(row)
+    values[_NOTES] = reasons.describe(
+        row[_REASON_CODE], row[_NOTES], row[_EXTRA_HOURS]
+    )
+    return tuple(values)
+
+
+def format_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def stream_csv(batches: Iterable[list[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM para que Excel abra bien los acentos
+    buffer.write("\ufeff")
+    writer.writerow(HEADER)
+    for batch in batches:
+        writer.writerows([format_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Destino no posicionable del zip: acumula lo escrito hasta que se lo drena."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Liquidacion" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+XLSX_SHEET_END = "</sheetData></worksheet>"
+
+
+def xlsx_row(values: Iterable[Any]) -> str:
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c t=\"n\"><v>{value}</v></c>")
+        elif value is None:
+            cells.append("<c/>")
+        else:
+            text = escape(format_value(value))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def stream_xlsx(batches: Iterable[list[tuple]]) -> Iterator[bytes]:
+    output = _ChunkWriter()
+    with zipfile.ZipFile(output, mode="w", compression=zipfile.ZIP_DEFLATED) as xlsx:
+        xlsx.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+        xlsx.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        xlsx.writestr("xl/workbook.xml", XLSX_WORKBOOK)
+        xlsx.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+        yield output.drain()
+
+        # La hoja se comprime a medida que se escribe; force_zip64 porque el
+        # tamaño final no se conoce de antemano
+        with xlsx.open("xl/worksheets/sheet1.xml", mode="w", force_zip64=True) as sheet:
+            sheet.write((XLSX_SHEET_START + xlsx_row(HEADER)).encode("utf-8"))
+            for batch in batches:
+                sheet.write("".join(xlsx_row(row) for row in batch).encode("utf-8"))
+                yield output.drain()
+            sheet.write(XLSX_SHEET_END.encode("utf-8"))
+    yield output.drain()
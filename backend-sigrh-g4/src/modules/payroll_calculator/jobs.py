@@ -0,0 +1,151 @@
+"""
+Cola de trabajos de liquidación en segundo plano.
+
+Los cálculos largos (cierre de mes, toda la población) se ejecutan en un pool
+de hilos del propio proceso, cada uno con su propia sesión, para no bloquear a
+los workers de la API. El estado de los trabajos vive en memoria del proceso.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from os import getenv
+from threading import Event, Lock
+from uuid import uuid4
+from fastapi import HTTPException, status
+from sqlmodel import Session
+from src.database.core import engine
+from src.modules.payroll_calculator import service
+from src.modules.payroll_calculator.schemas import (
+    PayrollBatchRequest,
+    PayrollBatchResponse,
+    PayrollJobResponse,
+    PayrollJobStatus,
+)
+import logging
+
+logger = logging.getLogger("uvicorn.info")
+
+MAX_WORKERS = int(getenv("PAYROLL_JOB_WORKERS", "2"))
+# Trabajos terminados que se conservan para consultar su resultado
+MAX_FINISHED_JOBS = 100
+
+FINISHED_STATUSES = (
+    PayrollJobStatus.COMPLETED,
+    PayrollJobStatus.FAILED,
+    PayrollJobStatus.CANCELLED,
+)
+
+
+class PayrollJob:
+    def __init__(self, request: PayrollBatchRequest):
+        self.id = uuid4().hex
+        self.request = request
+        self.status = PayrollJobStatus.QUEUED
+        self.processed_employees = 0
+        self.total_employees: int | None = None
+        self.result: PayrollBatchResponse | None = None
+        self.error: str | None = None
+        self.created_at = datetime.now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.cancel_requested = Event()
+        self.future: Future | None = None
+
+    def on_progress(self, processed: int, total: int) -> None:
+        self.processed_employees = processed
+        self.total_employees = total
+        if self.cancel_requested.is_set():
+            raise service.PayrollCancelled()
+
+    def to_response(self) -> PayrollJobResponse:
+        return PayrollJobResponse(
+            job_id=self.id,
+            status=self.status,
+            processed_employees=self.processed_employees,
+            total_employees=self.total_employees,
+            result=self.result,
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
+class PayrollJobQueue:
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="payroll-job"
+        )
+        self._jobs: OrderedDict[str, PayrollJob] = OrderedDict()
+        self._lock = Lock()
+
+    def submit(self, request: PayrollBatchRequest) -> PayrollJob:
+        job = PayrollJob(request)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> PayrollJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+            )
+        return job
+
+    def cancel(self, job_id: str) -> PayrollJob:
+        job = self.get(job_id)
+        if job.status in FINISHED_STATUSES:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job already {job.status.value}",
+            )
+        job.cancel_requested.set()
+        # Si todavía no arrancó se saca de la cola; si está corriendo se corta
+        # en el próximo aviso de progreso y no se guarda nada
+        if job.future is not None and job.future.cancel():
+            job.status = PayrollJobStatus.CANCELLED
+            job.finished_at = datetime.now()
+        return job
+
+    def _run(self, job: PayrollJob) -> None:
+        if job.cancel_requested.is_set():
+            job.status = PayrollJobStatus.CANCELLED
+            job.finished_at = datetime.now()
+            return
+
+        job.status = PayrollJobStatus.RUNNING
+        job.started_at = datetime.now()
+        try:
+            with Session(engine) as db:
+                job.result = service.calculate_hours_batch(
+                    db, job.request, on_progress=job.on_progress
+                )
+            job.status = PayrollJobStatus.COMPLETED
+        except service.PayrollCancelled:
+            job.status = PayrollJobStatus.CANCELLED
+        except HTTPException as e:
+            job.error = str(e.detail)
+            job.status = PayrollJobStatus.FAILED
+        except Exception as e:
+            logger.exception(f"Payroll job {job.id} failed")
+            job.error = str(e)
+            job.status = PayrollJobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now()
+
+    def _prune(self) -> None:
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in FINISHED_STATUSES
+        ]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+payroll_jobs = PayrollJobQueue()
@@ -0,0 +1,80 @@
+from sqlalchemy import UniqueConstraint
+from sqlmodel import JSON, Column, Field, SQLModel
+from datetime import date, datetime
+from typing import Any
+
+
+class PayrollDirtyDay(SQLModel, table=True):
+    """
+    Día de un empleado cuyas fichadas cambiaron desde el último cálculo.
+    Lo marcan los servicios de `clock_events` y lo consume el recálculo incremental.
+    """
+
+    __tablename__ = "payroll_dirty_day"  # type: ignore
+
+    employee_id: int = Field(
+        foreign_key="employee.id", primary_key=True, ondelete="CASCADE"
+    )
+    work_date: date = Field(primary_key=True)
+    # Se actualiza cada vez que se vuelve a marcar el día
+    marked_at: datetime = Field(default_factory=datetime.now)
+
+
+class PayrollPeriod(SQLModel, table=True):
+    """
+    Período liquidado y cerrado. Sus horas quedan asociadas al período
+    (`employee_hours.period_id`) y no se recalculan.
+    """
+
+    __tablename__ = "payroll_period"  # type: ignore
+
+    id: int | None = Field(default=None, primary_key=True)
+    start_date: date = Field(index=True)
+    end_date: date = Field(index=True)
+    closed_at: datetime = Field(default_factory=datetime.now)
+
+
+class PayrollPeriodSummary(SQLModel, table=True):
+    """
+    Totales de un empleado en un período cerrado. Se escribe una sola vez al
+    cerrar el período y no se modifica: los reportes históricos leen de acá en
+    lugar de sumar las filas diarias de `employee_hours`.
+    """
+
+    __tablename__ = "payroll_period_summary"  # type: ignore
+    __table_args__ = (UniqueConstraint("period_id", "employee_id"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    period_id: int = Field(foreign_key="payroll_period.id", index=True)
+    employee_id: int = Field(foreign_key="employee.id", ondelete="CASCADE")
+    worked_seconds: int = Field(default=0)
+    # Solo las horas extra aprobadas (pagables) al momento del cierre
+    overtime_seconds: int = Field(default=0)
+    absence_days: int = Field(default=0)
+    # Cantidad de filas por concepto: {concept_id: cantidad}
+    concept_counts: dict[str, int] = Field(sa_column=Column(JSON), default_factory=dict)
+
+
+class PayrollRun(SQLModel, table=True):
+    """
+    Corrida del cálculo de horas. Se guarda en la misma transacción que las
+    filas que genera: cada `employee_hours` calculada apunta a su corrida.
+    """
+
+    __tablename__ = "payroll_run"  # type: ignore
+
+    id: int | None = Field(default=None, primary_key=True)
+    # "range" (rango completo) o "dirty" (solo días con fichadas modificadas)
+    kind: str = Field(max_length=16)
+    mode: str = Field(max_length=16)
+    start_date: date
+    end_date: date
+    # Pedido que originó la corrida (filtros, empleados, modo)
+    parameters: dict[str, Any] = Field(sa_column=Column(JSON), default_factory=dict)
+    started_at: datetime = Field(default_factory=datetime.now, index=True)
+    finished_at: datetime | None = Field(default=None)
+    # Lectura de fichadas y evaluación de las reglas, antes de escribir, en ms
+    calculation_ms: int = Field(default=0)
+    employees: int = Field(default=0)
+    rows_deleted: int = Field(default=0)
+    rows_created: int = Field(default=0)
@@ -0,0 +1,230 @@
+"""
+Cierre de períodos de liquidación.
+
+Al cerrar un período sus horas quedan asociadas a él (`period_id`), con el
+estado de pago que tenían, y se guardan, por empleado, los totales ya
+calculados en `payroll_period_summary`. Esos totales no se vuelven a derivar
+de `employee_hours` ni se modifican después del cierre.
+"""
+
+from collections import defaultdict
+from datetime import date, time
+from typing import Any, Sequence, cast
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlmodel import col, func, insert, select, update
+from src.database.core import DatabaseSession
+from src.modules.employee_hours.models.models import (
+    EmployeeHours,
+    RegisterType,
+    payType,
+)
+from src.modules.payroll_calculator.models import PayrollPeriod, PayrollPeriodSummary
+from src.modules.payroll_calculator.schemas import PayrollPeriodCloseRequest
+
+# Filas leídas por vuelta al agregar períodos grandes
+AGGREGATE_BATCH_SIZE = 5000
+# Clave del advisory lock de PostgreSQL que serializa los cierres
+PERIOD_CLOSE_LOCK_KEY = 0x5052_434C
+
+
+def time_to_seconds(value: time | None) -> int:
+    if value is None:
+        return 0
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def get_closed_periods(
+    db: DatabaseSession, start_date: date, end_date: date
+) -> Sequence[PayrollPeriod]:
+    """Períodos cerrados que se superponen con el rango."""
+    return db.exec(
+        select(PayrollPeriod)
+        .where(
+            PayrollPeriod.start_date <= end_date,
+            PayrollPeriod.end_date >= start_date,
+        )
+        .order_by(cast(Any, PayrollPeriod.start_date))
+    ).all()
+
+
+def is_in_closed_period(periods: Sequence[PayrollPeriod], day: date) -> bool:
+    return any(period.start_date <= day <= period.end_date for period in periods)
+
+
+def ensure_period_open(
+    db: DatabaseSession,
+    start_date: date,
+    end_date: date,
+    exclude_period_id: int | None = None,
+) -> None:
+    closed = [
+        period
+        for period in get_closed_periods(db, start_date, end_date)
+        if period.id != exclude_period_id
+    ]
+    if closed:
+        period = closed[0]
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"The period {period.start_date} - {period.end_date} is closed",
+        )
+
+
+def aggregate_employee_hours(
+    db: DatabaseSession, start_date: date, end_date: date
+) -> dict[int, dict[str, Any]]:
+    """
+    Suma en una pasada las horas del rango por empleado. Se leen solo las
+    columnas necesarias, en lotes, sin armar objetos del ORM.
+    """
+    rows = db.exec(
+        select(
+            EmployeeHours.employee_id,
+            EmployeeHours.concept_id,
+            EmployeeHours.register_type,
+            EmployeeHours.payroll_status,
+            EmployeeHours.sumary_time,
+            EmployeeHours.extra_hours,
+        )
+        .where(
+            col(EmployeeHours.work_date).between(start_date, end_date),
+            # Las filas sin empleado no tienen a quién sumarse
+            col(EmployeeHours.employee_id).is_not(None),
+        )
+        .execution_options(yield_per=AGGREGATE_BATCH_SIZE)
+    )
+
+    totals: dict[int, dict[str, Any]] = defaultdict(
+        lambda: {
+            "worked_seconds": 0,
+            "overtime_seconds": 0,
+            "absence_days": 0,
+            "concept_counts": defaultdict(int),
+        }
+    )
+    for employee_id, concept_id, register_type, payroll_status, sumary, extra in rows:
+        employee_totals = totals[employee_id]
+        employee_totals["worked_seconds"] += time_to_seconds(sumary)
+        if payroll_status == payType.PAYABLE:
+            employee_totals["overtime_seconds"] += time_to_seconds(extra)
+        if register_type == RegisterType.AUSENCIA:
+            employee_totals["absence_days"] += 1
+        employee_totals["concept_counts"][str(concept_id)] += 1
+    return totals
+
+
+def lock_period_close(db: DatabaseSession) -> None:
+    """
+    Serializa los cierres hasta el fin de la transacción. En PostgreSQL usa un
+    advisory lock; en otras bases el re-chequeo posterior al `flush` alcanza,
+    porque la escritura ya toma un lock de toda la base.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": PERIOD_CLOSE_LOCK_KEY}
+        )
+
+
+def close_period(
+    db: DatabaseSession, request: PayrollPeriodCloseRequest
+) -> PayrollPeriod:
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    lock_period_close(db)
+    ensure_period_open(db, request.start_date, request.end_date)
+
+    pending = db.exec(
+        select(func.count())
+        .select_from(EmployeeHours)
+        .where(
+            col(EmployeeHours.work_date).between(request.start_date, request.end_date),
+            EmployeeHours.payroll_status == payType.PENDING_VALIDATION,
+        )
+    ).one()
+    if pending:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"There are {pending} hours pending validation in the period",
+        )
+
+    try:
+        totals = aggregate_employee_hours(db, request.start_date, request.end_date)
+
+        period = PayrollPeriod(start_date=request.start_date, end_date=request.end_date)
+        db.add(period)
+        db.flush()
+        # Otro cierre superpuesto pudo confirmarse entre el chequeo y el insert
+        ensure_period_open(
+            db, request.start_date, request.end_date, exclude_period_id=period.id
+        )
+
+        summaries = [
+            {
+                "period_id": period.id,
+                "employee_id": employee_id,
+                "worked_seconds": employee_totals["worked_seconds"],
+                "overtime_seconds": employee_totals["overtime_seconds"],
+                "absence_days": employee_totals["absence_days"],
+                "concept_counts": dict(employee_totals["concept_counts"]),
+            }
+            for employee_id, employee_totals in sorted(totals.items())
+        ]
+        if summaries:
+            db.execute(insert(PayrollPeriodSummary.__table__), summaries)  # type: ignore
+
+        # Las horas quedan en el período, sin tocar su estado de pago: el
+        # cálculo ya no las borra ni las reemplaza
+        db.execute(
+            update(EmployeeHours)
+            .where(
+                col(EmployeeHours.work_date).between(
+                    request.start_date, request.end_date
+                ),
+                col(EmployeeHours.period_id).is_(None),
+            )
+            .values(period_id=period.id)
+        )
+        db.commit()
+        db.refresh(period)
+        return period
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error closing period: {str(e)}",
+        )
+
+
+def get_periods(db: DatabaseSession) -> Sequence[PayrollPeriod]:
+    return db.exec(
+        select(PayrollPeriod).order_by(cast(Any, PayrollPeriod.start_date).desc())
+    ).all()
+
+
+def get_period_by_id(db: DatabaseSession, period_id: int) -> PayrollPeriod:
+    period = db.get(PayrollPeriod, period_id)
+    if not period:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"The period {period_id} was not found",
+        )
+    return period
+
+
+def get_period_summaries(
+    db: DatabaseSession, period_id: int
+) -> Sequence[PayrollPeriodSummary]:
+    get_period_by_id(db, period_id)
+    return db.exec(
+        select(PayrollPeriodSummary)
+        .where(PayrollPeriodSummary.period_id == period_id)
+        .order_by(cast(Any, PayrollPeriodSummary.employee_id))
+    ).all()
@@ -0,0 +1,41 @@
+"""
+Códigos de motivo de las filas que genera el cálculo de horas.
+
+Cada fila de `employee_hours` calculada guarda un código corto en
+`reason_code` en lugar del texto completo en `notes`. El texto se arma al
+leer con `describe`; en `notes` solo se guarda el detalle que no se puede
+derivar de las otras columnas (el tiempo faltante).
+"""
+
+from datetime import time
+
+NON_WORKING_DAY = "non_working"
+ABSENT = "absent"
+NO_CHECK_OUT = "no_check_out"
+MISSING_TIME = "missing_time"
+FULL_WORKDAY = "full_workday"
+OVERTIME = "overtime"
+
+MESSAGES = {
+    NON_WORKING_DAY: "Día no hábil",
+    ABSENT: "El empleado no registró entrada en el día.",
+    NO_CHECK_OUT: "El empleado registró entrada pero no salida.",
+    FULL_WORKDAY: "El empleado completó su jornada laboral.",
+}
+
+
+def missing_time_notes(missing_minutes: int) -> str:
+    return f"Le faltaron {missing_minutes // 60}h {missing_minutes % 60}m para completar la jornada"
+
+
+def overtime_notes(extra_minutes: int) -> str:
+    return f"El empleado realizó {extra_minutes // 60}h {extra_minutes % 60}m extra"
+
+
+def describe(reason_code: str | None, notes: str, extra_hours: time | None) -> str:
+    """Texto de una fila: el guardado en `notes` o el que corresponde a su código."""
+    if notes or reason_code is None:
+        return notes
+    if reason_code == OVERTIME and extra_hours is not None:
+        return overtime_notes(extra_hours.hour * 60 + extra_hours.minute)
+    return MESSAGES.get(reason_code, "")
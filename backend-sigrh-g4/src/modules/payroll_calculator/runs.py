@@ -0,0 +1,70 @@
+"""
+Historial de corridas del cálculo de horas.
+
+Cada corrida queda registrada en `payroll_run` con sus parámetros, tiempos y
+cantidad de filas borradas y creadas, y cada fila de `employee_hours` que
+genera guarda su `run_id`: para revisar una liquidación no hace falta volver
+a calcular.
+"""
+
+from datetime import date, datetime
+from typing import Any, Optional, Sequence, cast
+from fastapi import HTTPException, status
+from sqlmodel import col, select
+from src.database.core import DatabaseSession
+from src.modules.payroll_calculator.models import PayrollRun
+
+
+def record_run(
+    db: DatabaseSession,
+    kind: str,
+    mode: str,
+    start_date: date,
+    end_date: date,
+    parameters: Optional[dict[str, Any]],
+    started_at: datetime,
+    calculation_ms: int,
+    employees: int,
+    rows_deleted: int,
+    rows_created: int,
+) -> int:
+    """
+    Inserta la corrida, ya con sus totales, en la transacción del cálculo (un
+    solo INSERT) y devuelve su ID para las filas que se van a insertar.
+    """
+    run = PayrollRun(
+        kind=kind,
+        mode=mode,
+        start_date=start_date,
+        end_date=end_date,
+        parameters=parameters or {},
+        started_at=started_at,
+        finished_at=datetime.now(),
+        calculation_ms=calculation_ms,
+        employees=employees,
+        rows_deleted=rows_deleted,
+        rows_created=rows_created,
+    )
+    db.add(run)
+    db.flush()
+    return cast(int, run.id)
+
+
+def get_runs(
+    db: DatabaseSession, limit: int, before_id: Optional[int] = None
+) -> Sequence[PayrollRun]:
+    """Corridas de la más nueva a la más vieja; `before_id` pagina por clave."""
+    query = select(PayrollRun).order_by(col(PayrollRun.id).desc()).limit(limit)
+    if before_id is not None:
+        query = query.where(col(PayrollRun.id) < before_id)
+    return db.exec(query).all()
+
+
+def get_run_by_id(db: DatabaseSession, run_id: int) -> PayrollRun:
+    run = db.get(PayrollRun, run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"The payroll run {run_id} was not found",
+        )
+    return run
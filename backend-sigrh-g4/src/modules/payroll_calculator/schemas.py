@@ -1,8 +1,10 @@
-from datetime import date, time
+from datetime import date, datetime, time
+from enum import Enum
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from src.modules.employees.models.employee import Employee
+from src.modules.payroll_calculator import reasons
 
 class PayrollRequest(BaseModel):
     employee_id: int
@@ -10,6 +12,150 @@ class PayrollRequest(BaseModel):
     end_date: date
 
 
+class PayrollMode(str, Enum):
+    # Un empleado a la vez con el motor de reglas
+    STANDARD = "standard"
+    # Toda la población junta con pandas/NumPy, para períodos y poblaciones grandes
+    VECTORIZED = "vectorized"
+    # Un empleado a la vez, repartidos en un pool de procesos
+    PARALLEL = "parallel"
+
+
+class PayrollBatchRequest(BaseModel):
+    employee_ids: Optional[List[int]] = None
+    sector_id: Optional[int] = None
+    shift_id: Optional[int] = None
+    start_date: date
+    end_date: date
+    mode: PayrollMode = PayrollMode.STANDARD
+
+
+class PayrollBatchEmployeeSummary(BaseModel):
+    employee_id: int
+    rows_created: int
+
+
+class PayrollBatchResponse(BaseModel):
+    start_date: date
+    end_date: date
+    rows_created: int
+    employees: list[PayrollBatchEmployeeSummary]
+
+
+class PayrollJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class PayrollJobResponse(BaseModel):
+    job_id: str
+    status: PayrollJobStatus
+    processed_employees: int
+    # Se conoce recién cuando el trabajo arranca y resuelve los empleados
+    total_employees: Optional[int] = None
+    result: Optional[PayrollBatchResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class PayrollRecalculateRequest(BaseModel):
+    # Sin IDs se recalculan los días pendientes de todos los empleados
+    employee_ids: Optional[List[int]] = None
+
+
+class PayrollRecalculateResponse(BaseModel):
+    days_recalculated: int
+    rows_created: int
+    employees: list[PayrollBatchEmployeeSummary]
+
+
+class PayrollRuleVariant(BaseModel):
+    name: str
+    tolerance_minutes: int = Field(ge=0, le=240)
+    # Si se indica, reemplaza las horas nominales de todos los turnos
+    working_hours: Optional[float] = Field(default=None, gt=0, le=24)
+
+
+class PayrollSimulationRequest(BaseModel):
+    employee_ids: Optional[List[int]] = None
+    sector_id: Optional[int] = None
+    shift_id: Optional[int] = None
+    start_date: date
+    end_date: date
+    variants: list[PayrollRuleVariant] = Field(min_length=1, max_length=10)
+
+
+class PayrollSimulationTotals(BaseModel):
+    rows: int
+    full_workdays: int
+    missing_time_days: int
+    overtime_days: int
+    without_check_out_days: int
+    absence_days: int
+    non_working_days: int
+    worked_seconds: int
+    overtime_seconds: int
+
+
+class PayrollSimulationVariantResult(BaseModel):
+    name: str
+    totals: PayrollSimulationTotals
+    # Días (empleado y fecha) cuyo resultado cambia respecto de las reglas actuales
+    changed_days: int
+    changed_employees: int
+
+
+class PayrollSimulationResponse(BaseModel):
+    start_date: date
+    end_date: date
+    employees: int
+    baseline: PayrollSimulationTotals
+    variants: list[PayrollSimulationVariantResult]
+
+
+class PayrollExportFormat(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+class PayrollExportRequest(BaseModel):
+    employee_ids: Optional[List[int]] = None
+    sector_id: Optional[int] = None
+    shift_id: Optional[int] = None
+    start_date: date
+    end_date: date
+    format: PayrollExportFormat = PayrollExportFormat.CSV
+
+
+class PayrollPeriodCloseRequest(BaseModel):
+    start_date: date
+    end_date: date
+
+
+class PayrollPeriodResponse(BaseModel):
+    id: int
+    start_date: date
+    end_date: date
+    closed_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class PayrollPeriodSummaryResponse(BaseModel):
+    employee_id: int
+    worked_seconds: int
+    overtime_seconds: int
+    absence_days: int
+    concept_counts: dict[int, int]
+
+    model_config = {"from_attributes": True}
+
+
 class ConceptSchema(BaseModel):
     id: int | None
     description: str
@@ -42,9 +188,17 @@ class EmployeeHoursSchema(BaseModel):
     extra_hours: time | None
     payroll_status: str
     notes: str
+    run_id: int | None = None
+    reason_code: str | None = None
 
     model_config = {"from_attributes": True}
 
+    @model_validator(mode="after")
+    def describe_reason(self):
+        # Las filas calculadas guardan un código: el texto se arma al leer
+        self.notes = reasons.describe(self.reason_code, self.notes, self.extra_hours)
+        return self
+
 class PayrollResponse(BaseModel):
     employee_hours: EmployeeHoursSchema
     concept: ConceptSchema
@@ -54,9 +208,31 @@ class PayrollPendingValidationRequest(BaseModel):
     employee_id: Optional[List[int]] = None
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    # Paginación: work_date e id de la última fila de la página anterior
+    after_work_date: Optional[date] = None
+    after_id: Optional[int] = None
+    # Siempre se pagina: sin `limit` se devuelven las primeras 100 filas
+    limit: int = Field(default=100, ge=1, le=1000)
 
 class PayrollPendingValidationResponse(BaseModel):
     employee: Employee
     employee_hours: EmployeeHoursSchema
     concept: ConceptSchema
     shift: ShiftSchema
+
+
+class PayrollRunResponse(BaseModel):
+    id: int
+    kind: str
+    mode: str
+    start_date: date
+    end_date: date
+    parameters: dict
+    started_at: datetime
+    finished_at: datetime | None
+    calculation_ms: int
+    employees: int
+    rows_deleted: int
+    rows_created: int
+
+    model_config = {"from_attributes": True}
@@ -1,64 +1,129 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, datetime, time, timedelta
+from multiprocessing import get_context
+from os import cpu_count, getenv
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Iterable, Optional, Sequence, cast
 from fastapi import HTTPException, status
+from sqlalchemy.orm import selectinload
 from src.database.core import DatabaseSession
 from src.modules.clock_events.models.models import ClockEvents
 from src.modules.clock_events.schemas.schemas import ClockEventTypes
 from src.modules.concept.models.models import Concept
+from src.modules.concept.services.concept_cache import concept_cache
 from src.modules.employees.models.employee import Employee
+from src.modules.employees.models.job import Job
 from src.modules.employees.schemas.employee_models import EmployeeResponse
+from src.modules.employees.services import sector_service
+from src.modules.holiday.services.calendar_cache import HolidayCalendar, calendar_cache
+from src.modules.payroll_calculator import concepts, engine, periods, runs, vectorized
+from src.modules.payroll_calculator.dirty_days import (
+    delete_dirty_days,
+    delete_dirty_days_in_range,
+)
+from src.modules.payroll_calculator.models import PayrollDirtyDay
 from src.modules.payroll_calculator.schemas import (
     ConceptSchema,
     EmployeeHoursSchema,
+    PayrollBatchEmployeeSummary,
+    PayrollBatchRequest,
+    PayrollBatchResponse,
+    PayrollMode,
     PayrollPendingValidationResponse,
+    PayrollRecalculateRequest,
+    PayrollRecalculateResponse,
     PayrollRequest,
     PayrollResponse,
     ShiftSchema,
     PayrollPendingValidationRequest
 )
-from src.modules.employee_hours.models.models import EmployeeHours, RegisterType, payType
-from sqlmodel import delete, select
+from src.modules.employee_hours.models.models import EmployeeHours, payType
+from src.modules.shift.models.models import Shift
+from sqlmodel import and_, col, delete, insert, or_, select
+import pandas as pd
+
+# Recibe (empleados procesados, total de empleados) a medida que avanza el cálculo
+ProgressCallback = Callable[[int, int], None]
+
+
+class PayrollCancelled(Exception):
+    """La lanza el callback de progreso para abortar el cálculo sin guardar nada."""
+
+
+PROCESS_WORKERS = int(getenv("PAYROLL_PROCESS_WORKERS", str(cpu_count() or 1)))
+# Varios lotes por proceso para repartir mejor empleados con más o menos fichadas
+SHARDS_PER_WORKER = 4
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_lock = Lock()
 
 
 def get_pending_validation_hours(
     db: DatabaseSession, request: PayrollPendingValidationRequest
-) -> list[PayrollResponse]:
+) -> list[PayrollPendingValidationResponse]:
+    """
+    Horas a validar ordenadas por (work_date, id), en una sola consulta con el
+    empleado, el concepto y el turno. Para paginar se pasa en `after_work_date`
+    y `after_id` la última fila recibida (paginación por clave, sin OFFSET).
+    """
     if request.start_date and request.end_date and request.end_date < request.start_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="End date must be greater than start date",
         )
+    if (request.after_work_date is None) != (request.after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_work_date and after_id must be sent together",
+        )
 
-    query = select(EmployeeHours).where(EmployeeHours.payroll_status == "PENDING_VALIDATION")
+    # Los empleados sin turno quedan afuera por el JOIN con shift
+    query = (
+        select(EmployeeHours, Employee, Concept, Shift)
+        .join(Employee, cast(Any, EmployeeHours.employee_id == Employee.id))
+        .join(Shift, cast(Any, Employee.shift_id == Shift.id))
+        .join(Concept, cast(Any, EmployeeHours.concept_id == Concept.id))
+        .where(EmployeeHours.payroll_status == payType.PENDING_VALIDATION)
+    )
 
     if request.employee_id:
-        query = query.where(EmployeeHours.employee_id.in_(request.employee_id))
+        query = query.where(col(EmployeeHours.employee_id).in_(request.employee_id))
 
     if request.start_date:
         query = query.where(EmployeeHours.work_date >= request.start_date)
     if request.end_date:
         query = query.where(EmployeeHours.work_date <= request.end_date)
 
-    employee_hours_list = db.exec(query).all()
-
-    responses = []
-    for eh in employee_hours_list:
-        # Acá asumimos que las relaciones están disponibles vía foreign keys
-        concept = db.get(Concept, eh.concept_id)
-        employee = db.exec(
-            select(Employee).where(Employee.id == eh.employee_id)
-        ).one_or_none()
+    if request.after_work_date is not None and request.after_id is not None:
+        query = query.where(
+            or_(
+                col(EmployeeHours.work_date) > request.after_work_date,
+                and_(
+                    EmployeeHours.work_date == request.after_work_date,
+                    col(EmployeeHours.id) > request.after_id,
+                ),
+            )
+        )
 
-        if not employee or not employee.shift:
-            continue  # o lanzá error si es crítico
+    query = query.order_by(
+        cast(Any, EmployeeHours.work_date), cast(Any, EmployeeHours.id)
+    ).limit(request.limit)
 
-        responses.append(PayrollPendingValidationResponse(
-            employee=Employee.model_validate(employee),
+    return [
+        PayrollPendingValidationResponse(
+            # Se pasa la instancia tal cual: model_validate crearía otro Employee
+            # y cargaría todas sus relaciones, una consulta por fila
+            employee=employee,
             employee_hours=EmployeeHoursSchema.model_validate(eh),
             concept=ConceptSchema.model_validate(concept),
-            shift=ShiftSchema.model_validate(employee.shift),
-        ))
-    return responses
+            shift=ShiftSchema.model_validate(shift),
+        )
+        for eh, employee, concept, shift in db.exec(query).all()
+    ]
+
 
 def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     employee = db.exec(select(Employee).where(Employee.id == employee_id)).one_or_none()
@@ -70,20 +135,6 @@ def get_employee_by_id(db: DatabaseSession, employee_id: int) -> Employee:
     return employee
 
 
-def filter_and_sort_clock_events(
-    clock_events: list[ClockEvents], start_date: date, end_date: date
-) -> list[ClockEvents]:
-    # 1) Convertimos los límites a datetime (si queremos incluir TODO el rango del día):
-    start_dt = datetime.combine(start_date, time.min)  # 00:00:00
-    end_dt = datetime.combine(end_date, time.max)  # 23:59:59.999999
-
-    # 2) Filtramos y 3) devolvemos la lista ya ordenada:
-    return sorted(
-        (ev for ev in clock_events if start_dt <= ev.event_date <= end_dt),
-        key=lambda ev: ev.event_date,
-    )
-
-
 def get_date_range(start_date: date, end_date: date) -> list[date]:
     # Determina el orden correcto de las fechas
     start = min(start_date, end_date)
@@ -105,28 +156,27 @@ def get_hours_by_date_range(
             detail="End date must be greater than start date",
         )
     employee = get_employee_by_id(db, request.employee_id)
-    filtered_hours = filter_and_sort_hours(
-        employee.employee_hours, request.start_date, request.end_date
-    )
+    shift = ShiftSchema.model_validate(employee.shift)
+
+    # Solo las filas del rango, ya ordenadas (índice employee_id, work_date)
+    rows = db.exec(
+        select(EmployeeHours, Concept)
+        .join(Concept, cast(Any, EmployeeHours.concept_id == Concept.id))
+        .where(
+            EmployeeHours.employee_id == employee.id,
+            col(EmployeeHours.work_date).between(request.start_date, request.end_date),
+        )
+        .order_by(cast(Any, EmployeeHours.work_date), cast(Any, EmployeeHours.id))
+    ).all()
     return [
         PayrollResponse(
             employee_hours=EmployeeHoursSchema.model_validate(eh),
-            concept=ConceptSchema.model_validate(eh.concept),  # type: ignore
-            shift=ShiftSchema.model_validate(employee.shift),
+            concept=ConceptSchema.model_validate(concept),
+            shift=shift,
         )
-        for eh in filtered_hours
+        for eh, concept in rows
     ]
 
-
-def filter_and_sort_hours(
-    employee_hours: list[EmployeeHours], start_date: date, end_date: date
-):
-    # Compara solo fechas, no datetime
-    return sorted(
-        (eh for eh in employee_hours if start_date <= eh.work_date <= end_date),
-        key=lambda eh: eh.work_date,
-    )
-
 def calculate_hours(db: DatabaseSession, request: PayrollRequest):
     if request.end_date < request.start_date:
         raise HTTPException(
@@ -134,679 +184,661 @@ def calculate_hours(db: DatabaseSession, request: PayrollRequest):
             detail="End date must be greater than start date",
         )
     employee = get_employee_by_id(db, request.employee_id)
-    
-    sorted_events: list[ClockEvents] = []
+    run_payroll(
+        db,
+        [employee],
+        request.start_date,
+        request.end_date,
+        parameters=request.model_dump(mode="json"),
+    )
 
-    date_range = get_date_range(request.start_date, request.end_date)
-    sorted_events = filter_and_sort_clock_events(
-        employee.clock_events,
+
+def calculate_hours_batch(
+    db: DatabaseSession,
+    request: PayrollBatchRequest,
+    on_progress: Optional[ProgressCallback] = None,
+) -> PayrollBatchResponse:
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    employees = get_payroll_employees(db, request)
+    rows_by_employee = run_payroll(
+        db,
+        employees,
         request.start_date,
         request.end_date,
+        request.mode,
+        on_progress,
+        parameters=request.model_dump(mode="json"),
     )
-    
-    events_by_day: dict[date, list[ClockEvents]] = defaultdict(list)
 
-    # 1) Agrupar eventos por día
-    for event in sorted_events:
-        event_day = date(
-            event.event_date.year, event.event_date.month, event.event_date.day
+    summaries = [
+        PayrollBatchEmployeeSummary(employee_id=employee_id, rows_created=rows_created)
+        for employee_id, rows_created in rows_by_employee.items()
+    ]
+    return PayrollBatchResponse(
+        start_date=request.start_date,
+        end_date=request.end_date,
+        rows_created=sum(summary.rows_created for summary in summaries),
+        employees=summaries,
+    )
+
+
+def get_payroll_employees(
+    db: DatabaseSession, request: PayrollBatchRequest
+) -> Sequence[Employee]:
+    """
+    Devuelve los empleados a liquidar: los IDs pedidos o, si no se indican,
+    todos los empleados activos. Los filtros de sector y turno se aplican en
+    ambos casos. Se excluyen los empleados sin turno asignado.
+    """
+    stmt = (
+        select(Employee)
+        .where(col(Employee.shift_id).is_not(None))
+        .options(selectinload(cast(Any, Employee.shift)))
+        .order_by(cast(Any, Employee.id))
+    )
+    if request.employee_ids:
+        stmt = stmt.where(col(Employee.id).in_(request.employee_ids))
+    else:
+        stmt = stmt.where(col(Employee.active).is_(True))
+    if request.sector_id is not None:
+        # Para dar error si no existe el sector
+        sector_service.get_sector_by_id(db, request.sector_id)
+
+        stmt = stmt.join(
+            Job, cast(Any, Employee.job_id == Job.id)
+        ).where(Job.sector_id == request.sector_id)
+    if request.shift_id is not None:
+        stmt = stmt.where(Employee.shift_id == request.shift_id)
+
+    employees = db.exec(stmt).all()
+
+    if request.employee_ids and request.sector_id is None and request.shift_id is None:
+        missing = set(request.employee_ids) - {employee.id for employee in employees}
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"The employees {sorted(missing)} were not found or have no shift",
+            )
+    return employees
+
+
+def clock_events_in_range_query(
+    employee_ids: list[int], start_date: date, end_date: date
+):
+    """
+    Fichadas de los empleados en el rango, ordenadas por empleado y fecha.
+    Incluye el día siguiente a `end_date` para los turnos que cruzan la medianoche.
+    """
+    start_dt = datetime.combine(start_date, time.min)
+    end_dt = datetime.combine(end_date + timedelta(days=1), time.max)
+
+    return (
+        select(ClockEvents.employee_id, ClockEvents.event_date, ClockEvents.event_type)
+        .where(
+            col(ClockEvents.employee_id).in_(employee_ids),
+            col(ClockEvents.event_date).between(start_dt, end_dt),
         )
-        events_by_day[event_day].append(event)
-    try:   
-        if employee.shift.type == "matutino":
-            # 2) Para cada día hábil, procesar según tenga o no eventos
-            process_morning_shift_hours(
-                db, employee, date_range, events_by_day
+        .order_by(cast(Any, ClockEvents.employee_id), cast(Any, ClockEvents.event_date))
+    )
+
+
+def get_clock_events_by_employee(
+    db: DatabaseSession, employee_ids: list[int], start_date: date, end_date: date
+) -> dict[int, list[engine.ClockEvent]]:
+    """
+    Carga en una sola consulta las fichadas de todos los empleados en el rango,
+    agrupadas por empleado.
+    """
+    rows = db.exec(clock_events_in_range_query(employee_ids, start_date, end_date)).all()
+
+    events_by_employee: dict[int, list[engine.ClockEvent]] = defaultdict(list)
+    for employee_id, event_date, event_type in rows:
+        events_by_employee[employee_id].append(engine.ClockEvent(event_date, event_type))
+    return events_by_employee
+
+
+def get_clock_events_frame(
+    db: DatabaseSession, employee_ids: list[int], start_date: date, end_date: date
+) -> pd.DataFrame:
+    """
+    Igual que `get_clock_events_by_employee` pero en columnas, para el modo vectorizado.
+    """
+    rows = db.exec(clock_events_in_range_query(employee_ids, start_date, end_date)).all()
+    events = pd.DataFrame(
+        [
+            (employee_id, event_date, event_type == ClockEventTypes.IN)
+            for employee_id, event_date, event_type in rows
+        ],
+        columns=vectorized.EVENT_COLUMNS,
+    )
+    events["event_date"] = pd.to_datetime(events["event_date"]).astype("datetime64[ns]")
+    return events
+
+
+def get_shift_spec(employee: Employee) -> engine.ShiftSpec:
+    return engine.ShiftSpec(
+        id=employee.shift.id,
+        type=employee.shift.type,
+        working_hours=employee.shift.working_hours,
+        working_days=employee.shift.working_days,
+    )
+
+
+def get_holiday_calendars(
+    db: DatabaseSession, employees: Sequence[Employee], start_date: date, end_date: date
+) -> dict[int, HolidayCalendar]:
+    """Calendario de días no hábiles de cada empleado, según la región de su domicilio."""
+    regions = {
+        cast(int, employee.id): (employee.address_country_id, employee.address_state_id)
+        for employee in employees
+    }
+    calendars = calendar_cache.get_calendars(db, regions.values(), start_date, end_date)
+    return {employee_id: calendars[region] for employee_id, region in regions.items()}
+
+
+def run_payroll(
+    db: DatabaseSession,
+    employees: Sequence[Employee],
+    start_date: date,
+    end_date: date,
+    mode: PayrollMode = PayrollMode.STANDARD,
+    on_progress: Optional[ProgressCallback] = None,
+    parameters: Optional[dict[str, Any]] = None,
+) -> dict[int, int]:
+    """
+    Calcula las horas de todos los empleados en una única transacción y la
+    registra como una corrida (`payroll_run`) con los `parameters` del pedido.
+    Devuelve la cantidad de filas creadas por empleado.
+    """
+    periods.ensure_period_open(db, start_date, end_date)
+    started_at = datetime.now()
+    date_range = get_date_range(start_date, end_date)
+    employee_ids = [cast(int, employee.id) for employee in employees]
+    # Los conceptos se resuelven una vez por corrida, antes de escribir nada
+    concept_ids = concept_cache.get_ids(db, concepts.PAYROLL_CONCEPTS)
+    holidays = get_holiday_calendars(db, employees, start_date, end_date)
+
+    try:
+        calculation_started = perf_counter()
+        if mode == PayrollMode.VECTORIZED:
+            all_rows = evaluate_vectorized(
+                db,
+                employees,
+                start_date,
+                end_date,
+                date_range,
+                concept_ids,
+                holidays,
+                on_progress,
             )
-        elif employee.shift.type == "vespertino":
-            process_afternoon_shift_hours(
-                db, employee, date_range, events_by_day
+        elif mode == PayrollMode.PARALLEL:
+            all_rows = evaluate_parallel(
+                db,
+                employees,
+                start_date,
+                end_date,
+                date_range,
+                concept_ids,
+                holidays,
+                on_progress,
             )
         else:
-            process_night_shift_hours(
-                db, employee, date_range, events_by_day
+            all_rows = evaluate_standard(
+                db,
+                employees,
+                start_date,
+                end_date,
+                date_range,
+                concept_ids,
+                holidays,
+                on_progress,
             )
-            pass
+
+        calculation_ms = round((perf_counter() - calculation_started) * 1000)
+
+        # Reemplazo del rango completo: un DELETE, un INSERT masivo y un commit
+        rows_deleted = delete_employee_hours_in_range(
+            db, employee_ids, start_date, end_date
+        )
+        run_id = runs.record_run(
+            db,
+            kind="range",
+            mode=mode.value,
+            start_date=start_date,
+            end_date=end_date,
+            parameters=parameters,
+            started_at=started_at,
+            calculation_ms=calculation_ms,
+            employees=len(employee_ids),
+            rows_deleted=rows_deleted,
+            rows_created=len(all_rows),
+        )
+        insert_employee_hours(db, all_rows, run_id)
+        # Los días recalculados dejan de estar pendientes
+        delete_dirty_days_in_range(db, employee_ids, start_date, end_date, started_at)
+        db.commit()
+    except (HTTPException, PayrollCancelled):
+        db.rollback()
+        raise
     except Exception as e:
+        db.rollback()
+        # Un concepto borrado desde otro proceso deja IDs viejos en el cache
+        concept_cache.invalidate()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing hours: {str(e)}",
         )
 
-def process_morning_shift_hours(
-    db: DatabaseSession,
-    employee: Employee,
-    date_range: list[date],
-    events_by_day: dict[date, list[ClockEvents]],
-):
-    for day in date_range:
-        # Saltar sábados y domingos
-        existing_employee_hours = db.exec(
-        select(EmployeeHours)
-        .where(
-            EmployeeHours.employee_id == employee.id,
-            EmployeeHours.work_date == day,
-            EmployeeHours.payroll_status != 'archived'
-        )).all()
-
-        if existing_employee_hours:
-            for eh in existing_employee_hours:
-                db.delete(eh)
-                db.commit()
-                
-        if day.weekday() in (5, 6):
-            concept= check_concept(db, "Día no hábil.")
-            create_employee_hours(
-                db=db, 
-                employee=employee, 
-                concept=concept.id, 
-                day=day, 
-                daily_events_count=0, 
-                first_check_in=None, 
-                last_check_out=None, 
-                payroll_status="not payable", 
-                notes="Día no hábil", 
-                sumary_time=None, 
-                extra_hours=None,
-                register_type=RegisterType.DIA_NO_HABIL,
-            )
-            continue
-
-        daily_events = events_by_day.get(day, [])
-        ins = [ev for ev in daily_events if ev.event_type == ClockEventTypes.IN]
-        outs = [ev for ev in daily_events if ev.event_type == ClockEventTypes.OUT]
-
-        # EL EMPLEADO NO REGISTRÓ UNA ENTRADA EN TODO EL DÍA
-        if not ins:
-            concept = check_concept(db, "Ausente sin entrada registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado no registró entrada en el día.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.AUSENCIA,
-            )    
-            continue
-
-        first_check = min(ins, key=lambda ev: ev.event_date).event_date.time()
-
-        # EL EMPLEADO NO REGISTRÓ SU SALIDA
-        if len(ins) > len(outs):
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-            continue
-
-        last_check = max(outs, key=lambda ev: ev.event_date).event_date.time()
-
-        check_in_dt = datetime.combine(day, first_check)
-        check_out_dt = datetime.combine(day, last_check)
-
-        # Cálculo de tiempo trabajado
-        worked_duration = check_out_dt - check_in_dt
-        total_seconds = int(worked_duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) % 3600 // 60
-        seconds = total_seconds % 60
-
-        #  Duración de la jornada como time
-        summary_time = time(hour=hours % 24, minute=minutes, second=seconds) if hours < 24 else None
-
-        #  Cálculo en formato decimal para validar rango
-        worked_hours_float = hours + (minutes / 60)
-
-        #  Lógica de validación según rango 7:30 - 8:30
-        lower_bound = 7.5  # 7h30m
-        upper_bound = 8.5  # 8h30m
-
-        if lower_bound <= worked_hours_float <= upper_bound:
-            # JORNADA COMPLETA
-            concept= check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+    return count_rows_by_employee(employee_ids, all_rows)
 
-        elif worked_hours_float < lower_bound:
-            # HORAS FALTANTES
-            faltante_hours = int(8.0 - worked_hours_float)
-            faltante_minutes = int((8.0 - worked_hours_float - faltante_hours) * 60)
-
-            concept = check_concept(db, "Tiempo faltante")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="not payable",
-                notes=f"Le faltaron {faltante_hours}h {faltante_minutes}m para completar la jornada",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
 
-        else:
-            # HORAS EXTRA
-            extra_hours = int(worked_hours_float - 8.0)
-            extra_minutes = int((worked_hours_float - 8.0 - extra_hours) * 60)
-            extra_time = time(hour=extra_hours, minute=extra_minutes, second=0)
-
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes=f"El empleado completó su jornada laboral.",
-                sumary_time=time(hour=8),
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+def count_rows_by_employee(
+    employee_ids: Iterable[int], rows: list[dict[str, Any]]
+) -> dict[int, int]:
+    rows_by_employee = dict.fromkeys(employee_ids, 0)
+    for row in rows:
+        rows_by_employee[row["employee_id"]] += 1
+    return rows_by_employee
 
-            concept = check_concept(db, "Horas extra")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="pending validation",
-                notes=f"El empleado realizó {extra_hours}h {extra_minutes}m extra",
-                sumary_time=None,
-                extra_hours=extra_time,
-                register_type=RegisterType.PRESENCIA,
-            )
 
-def process_afternoon_shift_hours(
+def evaluate_standard(
     db: DatabaseSession,
-    employee: Employee,
+    employees: Sequence[Employee],
+    start_date: date,
+    end_date: date,
     date_range: list[date],
-    events_by_day: dict[date, list[ClockEvents]],
-):
-    for day in date_range:
-        # Saltar sábados y domingos
-        existing_employee_hours = db.exec(
-        select(EmployeeHours)
-        .where(
-            EmployeeHours.employee_id == employee.id,
-            EmployeeHours.work_date == day,
-            EmployeeHours.payroll_status != 'archived'
-        )).all()
-
-        if existing_employee_hours:
-            for eh in existing_employee_hours:
-                db.delete(eh)
-                db.commit()
-
-        if day.weekday() in (5, 6):
-            concept = check_concept(db, "Día no hábil.")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="Día no hábil",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.DIA_NO_HABIL,
-            )
-            continue
-
-        daily_events = events_by_day.get(day, [])
-        next_day_events = events_by_day.get(day + timedelta(days=1), [])
-
-        ins = [ev for ev in daily_events if ev.event_type == ClockEventTypes.IN]
-        outs_today = [ev for ev in daily_events if ev.event_type == ClockEventTypes.OUT]
-        outs_tomorrow = [ev for ev in next_day_events if ev.event_type == ClockEventTypes.OUT]
-        outs = outs_today + outs_tomorrow
-
-        if not ins:
-            # No entrada
-            concept = check_concept(db, "Ausente sin entrada registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado no registró entrada en el día.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.AUSENCIA,
-            )
-            continue
-
-        first_check = min(ins, key=lambda ev: ev.event_date).event_date.time()
-
-        if not outs:
-            # No salida
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-            continue
-
-        outs_sorted = sorted(outs, key=lambda ev: ev.event_date)
-        first_check_in_dt = datetime.combine(day, first_check)
-        last_check_datetime = next(
-            (ev.event_date for ev in outs_sorted if ev.event_date > first_check_in_dt),
-            None
+    concept_ids: dict[str, int],
+    holidays: dict[int, HolidayCalendar],
+    on_progress: Optional[ProgressCallback] = None,
+) -> list[dict[str, Any]]:
+    events_by_employee = get_clock_events_by_employee(
+        db, [cast(int, employee.id) for employee in employees], start_date, end_date
+    )
+    all_rows: list[dict[str, Any]] = []
+    for processed, employee in enumerate(employees, start=1):
+        employee_id = cast(int, employee.id)
+        shift = get_shift_spec(employee)
+        results = engine.evaluate_shift(
+            shift,
+            events_by_employee.get(employee_id, []),
+            date_range,
+            holidays=holidays.get(employee_id),
         )
-
-        if not last_check_datetime:
-            # No salida válida después del IN
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
+        all_rows.extend(build_employee_hours(employee_id, shift.id, results, concept_ids))
+        if on_progress is not None:
+            on_progress(processed, len(employees))
+    return all_rows
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: el servidor ya tiene hilos (pool de la API, trabajos) y
+            # hacer fork de un proceso con hilos no es seguro
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PROCESS_WORKERS, mp_context=get_context("spawn")
             )
-            continue
+        return _process_pool
 
-        last_check = last_check_datetime.time()
 
-        check_in_dt = first_check_in_dt
-        check_out_day = day if last_check_datetime.date() == day else day + timedelta(days=1)
-        check_out_dt = datetime.combine(check_out_day, last_check)
+def reset_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
 
-        print(f"DEBUG -- Day: {day}, Check-in: {check_in_dt}, Check-out: {check_out_dt}")
 
-        if check_out_dt <= check_in_dt:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Salida inválida: la salida ({check_out_dt}) es anterior o igual a la entrada ({check_in_dt})",
-            )
+EmployeeShard = list[
+    tuple[int, engine.ShiftSpec, list[engine.ClockEvent], HolidayCalendar | None]
+]
 
-        worked_duration = check_out_dt - check_in_dt
-        total_seconds = int(worked_duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) % 60
-        seconds = total_seconds % 60
 
-        if hours >= 24:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"El empleado tiene {int(hours)}h trabajadas, excediendo el máximo permitido de 23h59m.",
-            )
+def evaluate_shard(
+    shard: EmployeeShard, date_range: list[date], concept_ids: dict[str, int]
+) -> list[dict[str, Any]]:
+    """
+    Corre en un proceso del pool: evalúa un lote de empleados con los datos ya
+    cargados, sin sesión de base de datos. Las filas las guarda el proceso padre.
+    """
+    rows: list[dict[str, Any]] = []
+    for employee_id, shift, events, calendar in shard:
+        results = engine.evaluate_shift(shift, events, date_range, holidays=calendar)
+        rows.extend(build_employee_hours(employee_id, shift.id, results, concept_ids))
+    return rows
 
-        summary_time = None
-        if hours < 24:
-            summary_time = time(hour=hours, minute=minutes, second=seconds)
-
-        worked_hours_float = hours + (minutes / 60)
-
-        lower_bound = 7.5  # 7h30m
-        upper_bound = 8.5  # 8h30m
-
-        if lower_bound <= worked_hours_float <= upper_bound:
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        elif worked_hours_float < lower_bound:
-            faltante_hours = int(8.0 - worked_hours_float)
-            faltante_minutes = int((8.0 - worked_hours_float - faltante_hours) * 60)
-            concept = check_concept(db, "Tiempo faltante")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="not payable",
-                notes=f"Le faltaron {faltante_hours}h {faltante_minutes}m para completar la jornada",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        else:
-            # Horas extra
-            extra_seconds = total_seconds - (8 * 3600)
-            extra_hours = extra_seconds // 3600
-            extra_minutes = (extra_seconds % 3600) // 60
-
-            if extra_hours >= 24:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"El empleado tiene {int(extra_hours)}h trabajadas, excediendo el máximo permitido de 23h59m.",
-                )
 
-            extra_time = time(hour=int(extra_hours), minute=int(extra_minutes), second=0)
-
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=time(hour=8),
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+def evaluate_parallel(
+    db: DatabaseSession,
+    employees: Sequence[Employee],
+    start_date: date,
+    end_date: date,
+    date_range: list[date],
+    concept_ids: dict[str, int],
+    holidays: dict[int, HolidayCalendar],
+    on_progress: Optional[ProgressCallback] = None,
+) -> list[dict[str, Any]]:
+    if PROCESS_WORKERS < 2 or len(employees) < 2:
+        return evaluate_standard(
+            db,
+            employees,
+            start_date,
+            end_date,
+            date_range,
+            concept_ids,
+            holidays,
+            on_progress,
+        )
 
-            concept = check_concept(db, "Horas extra")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="pending validation",
-                notes=f"El empleado realizó {int(extra_hours)}h {int(extra_minutes)}m extra",
-                sumary_time=None,
-                extra_hours=extra_time,
-                register_type=RegisterType.PRESENCIA,
-            )
+    events_by_employee = get_clock_events_by_employee(
+        db, [cast(int, employee.id) for employee in employees], start_date, end_date
+    )
+    work = [
+        (
+            cast(int, employee.id),
+            get_shift_spec(employee),
+            events_by_employee.get(cast(int, employee.id), []),
+            holidays.get(cast(int, employee.id)),
+        )
+        for employee in employees
+    ]
+    shard_size = -(-len(work) // (PROCESS_WORKERS * SHARDS_PER_WORKER))
+    shards = [work[i : i + shard_size] for i in range(0, len(work), shard_size)]
 
-def process_night_shift_hours(
+    pool = get_process_pool()
+    futures = [
+        pool.submit(evaluate_shard, shard, date_range, concept_ids) for shard in shards
+    ]
+    shard_sizes = {future: len(shard) for future, shard in zip(futures, shards)}
+    try:
+        pending = set(futures)
+        processed = 0
+        while pending:
+            done, pending = wait(pending, return_when="FIRST_COMPLETED")
+            for future in done:
+                # Propaga el error del worker, si lo hubo
+                future.result()
+                processed += shard_sizes[future]
+            if on_progress is not None:
+                on_progress(processed, len(employees))
+    except BrokenProcessPool:
+        # Un worker murió (p. ej. sin memoria): el pool ya no sirve, se recrea
+        # en la próxima corrida
+        reset_process_pool()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+    # Se arma el resultado en el orden de los empleados, no en el de llegada
+    return [row for future in futures for row in future.result()]
+
+
+def evaluate_vectorized(
     db: DatabaseSession,
-    employee: Employee,
+    employees: Sequence[Employee],
+    start_date: date,
+    end_date: date,
     date_range: list[date],
-    events_by_day: dict[date, list[ClockEvents]],
-):
-    for day in date_range:
-        # Saltar sábados y domingos (día de ingreso)
-        existing_employee_hours = db.exec(
-        select(EmployeeHours)
-        .where(
-            EmployeeHours.employee_id == employee.id,
-            EmployeeHours.work_date == day,
-            EmployeeHours.payroll_status != 'archived'
-        )).all()
-
-        if existing_employee_hours:
-            for eh in existing_employee_hours:
-                db.delete(eh)
-                db.commit()
-
-        if day.weekday() in (5, 6):
-            concept = check_concept(db, "Día no hábil.")
-            create_employee_hours(
-                db=db, 
-                employee=employee, 
-                concept=concept.id, 
-                day=day, 
-                daily_events_count=0, 
-                first_check_in=None, 
-                last_check_out=None, 
-                payroll_status="not payable", 
-                notes="Día no hábil", 
-                sumary_time=None, 
-                extra_hours=None,
-                register_type=RegisterType.DIA_NO_HABIL,
-            )
-            continue
-        
-        # Fichadas del día de ingreso
-        daily_events = events_by_day.get(day, [])
-        # Fichadas del día siguiente
-        next_day_events = events_by_day.get(day + timedelta(days=1), [])
-        
-        # Juntar eventos de entrada (día actual) y salida (día siguiente)
-        ins = [ev for ev in daily_events if ev.event_type == ClockEventTypes.IN]
-        outs = [ev for ev in next_day_events if ev.event_type == ClockEventTypes.OUT]
-
-        if not ins:
-            # No entrada
-            concept = check_concept(db, "Ausente sin entrada registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=0,
-                first_check_in=None,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado no registró entrada en el día.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.AUSENCIA,
-            )    
-            continue
-        
-        first_check = min(ins, key=lambda ev: ev.event_date).event_date.time()
-
-        if not outs:
-            # No salida
-            concept = check_concept(db, "Presente sin salida registrada")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=None,
-                payroll_status="not payable",
-                notes="El empleado registró entrada pero no salida.",
-                sumary_time=None,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-            continue
-        
-        last_check = max(outs, key=lambda ev: ev.event_date).event_date.time()
-        
-        # Construir datetime combinando día y hora
-        check_in_dt = datetime.combine(day, first_check)
-        check_out_dt = datetime.combine(day + timedelta(days=1), last_check)
-
-        worked_duration = check_out_dt - check_in_dt
-        total_seconds = int(worked_duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) % 3600 // 60
-        seconds = total_seconds % 60
-
-        summary_time = time(hour=hours % 24, minute=minutes, second=seconds) if hours < 24 else None
-        worked_hours_float = hours + (minutes / 60)
-
-        lower_bound = 7.5  # 7h30m
-        upper_bound = 8.5  # 8h30m
-
-        if lower_bound <= worked_hours_float <= upper_bound:
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        elif worked_hours_float < lower_bound:
-            faltante_hours = int(8.0 - worked_hours_float)
-            faltante_minutes = int((8.0 - worked_hours_float - faltante_hours) * 60)
-            concept = check_concept(db, "Tiempo faltante")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="not payable",
-                notes=f"Le faltaron {faltante_hours}h {faltante_minutes}m para completar la jornada",
-                sumary_time=summary_time,
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
-        else:
-            extra_hours = int(worked_hours_float - 8.0)
-            extra_minutes = int((worked_hours_float - 8.0 - extra_hours) * 60)
-            extra_time = time(hour=extra_hours, minute=extra_minutes, second=0)
-
-            concept = check_concept(db, "Jornada laboral completa")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="payable",
-                notes="El empleado completó su jornada laboral.",
-                sumary_time=time(hour=8),
-                extra_hours=None,
-                register_type=RegisterType.PRESENCIA,
-            )
+    concept_ids: dict[str, int],
+    holidays: dict[int, HolidayCalendar],
+    on_progress: Optional[ProgressCallback] = None,
+) -> list[dict[str, Any]]:
+    shifts = {cast(int, employee.id): get_shift_spec(employee) for employee in employees}
+    if not shifts:
+        return []
+    events = get_clock_events_frame(db, list(shifts), start_date, end_date)
+    result = vectorized.evaluate_population(
+        shifts, events, date_range, holidays=holidays
+    )
+    # Toda la población se evalúa de una vez: el progreso salta al total
+    if on_progress is not None:
+        on_progress(len(shifts), len(shifts))
+    return vectorized.build_employee_hours(result, concept_ids)
+
+
+def build_employee_hours(
+    employee_id: int,
+    shift_id: int,
+    results: list[engine.DayResult],
+    concept_ids: dict[str, int],
+) -> list[dict[str, Any]]:
+    """
+    Arma en memoria las filas de `employee_hours` de un empleado. Las filas se
+    insertan todas juntas al final del cálculo con `insert_employee_hours`.
+    """
+    return [
+        {
+            "employee_id": employee_id,
+            "concept_id": concept_ids[result.concept],
+            "shift_id": shift_id,
+            "check_count": result.check_count,
+            "work_date": result.work_date,
+            "register_type": result.register_type,
+            "first_check_in": result.first_check_in,
+            "last_check_out": result.last_check_out,
+            "sumary_time": result.sumary_time,
+            "extra_hours": result.extra_hours,
+            "payroll_status": result.payroll_status,
+            "reason_code": result.reason,
+            "notes": result.notes,
+        }
+        for result in results
+    ]
 
-            concept = check_concept(db, "Horas extra")
-            create_employee_hours(
-                db=db,
-                employee=employee,
-                concept=concept.id,
-                day=day,
-                daily_events_count=len(daily_events) + len(next_day_events),
-                first_check_in=first_check,
-                last_check_out=last_check,
-                payroll_status="pending validation",
-                notes=f"El empleado realizó {extra_hours}h {extra_minutes}m extra",
-                sumary_time=None,
-                extra_hours=extra_time,
-                register_type=RegisterType.PRESENCIA,
-            )
 
-def check_concept(db: DatabaseSession, concept_description: str) -> Concept:
-    # Buscar si existe
-    concept = db.exec(
-        select(Concept).where(Concept.description == concept_description)
-    ).one_or_none()
-    
-    # Si no existe, crear
-    if not concept:
-        new_concept = Concept(description=concept_description)
-        db.add(new_concept)
-        db.commit()
-        db.refresh(new_concept)  # Refresca para tener el ID generado
-        return new_concept
+def delete_employee_hours_in_range(
+    db: DatabaseSession, employee_ids: list[int], start_date: date, end_date: date
+) -> int:
+    """
+    Borra con un único DELETE las horas de los empleados en el rango que no
+    pertenecen a un período cerrado.
+    """
+    result = db.execute(
+        delete(EmployeeHours).where(
+            col(EmployeeHours.employee_id).in_(employee_ids),
+            col(EmployeeHours.work_date).between(start_date, end_date),
+            col(EmployeeHours.period_id).is_(None),
+            EmployeeHours.payroll_status != payType.ARCHIVED,
+        )
+    )
+    return result.rowcount
+
+
+def insert_employee_hours(
+    db: DatabaseSession, rows: list[dict[str, Any]], run_id: Optional[int] = None
+) -> None:
+    """
+    Inserta todas las filas calculadas en un único INSERT masivo (executemany),
+    todas con el `run_id` de la corrida.
+    """
+    if rows:
+        # INSERT de Core sobre la tabla: el INSERT del ORM parte el lote en
+        # grupos según qué columnas vienen en None
+        db.execute(
+            insert(EmployeeHours.__table__).values(run_id=run_id),  # type: ignore
+            rows,
+        )
 
-    return concept
 
-def create_employee_hours(
-    db: DatabaseSession,
-    employee: Employee,
-    concept: int,
-    day: date,
-    daily_events_count: int,
-    first_check_in: time | None,
-    last_check_out: time | None,
-    payroll_status: str,
-    notes: str,
-    sumary_time: time | None,
-    extra_hours: time | None,
-    register_type: RegisterType,
-):
-        
-    # Crear nuevo
-    employee_hours = EmployeeHours(
-        employee_id=employee.id,
-        concept_id=concept,
-        shift_id=employee.shift.id,
-        check_count=daily_events_count,
-        work_date=day,
-        register_type=register_type,
-        first_check_in=first_check_in,
-        last_check_out=last_check_out,
-        sumary_time=sumary_time,
-        extra_hours=extra_hours,
-        payroll_status=payType(payroll_status),  # acá le pasas 'archived', 'payable', etc
-        notes=notes,
+def group_consecutive_days(days: Sequence[date]) -> list[tuple[date, date]]:
+    """Agrupa días ordenados en rangos (desde, hasta) de días consecutivos."""
+    ranges: list[tuple[date, date]] = []
+    for day in days:
+        if ranges and day - ranges[-1][1] == timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def get_clock_events_for_days(
+    db: DatabaseSession, days_by_employee: dict[int, list[date]]
+) -> dict[int, list[engine.ClockEvent]]:
+    """
+    Carga en una sola consulta las fichadas de los días indicados (más el día
+    siguiente a cada uno), agrupadas por empleado.
+    """
+    ranges = [
+        and_(
+            ClockEvents.employee_id == employee_id,
+            col(ClockEvents.event_date).between(
+                datetime.combine(first, time.min),
+                datetime.combine(last + timedelta(days=1), time.max),
+            ),
+        )
+        for employee_id, days in days_by_employee.items()
+        for first, last in group_consecutive_days(days)
+    ]
+    rows = db.exec(
+        select(ClockEvents.employee_id, ClockEvents.event_date, ClockEvents.event_type)
+        .where(or_(*ranges))
+        .order_by(cast(Any, ClockEvents.employee_id), cast(Any, ClockEvents.event_date))
+    ).all()
+
+    events_by_employee: dict[int, list[engine.ClockEvent]] = defaultdict(list)
+    for employee_id, event_date, event_type in rows:
+        events_by_employee[employee_id].append(engine.ClockEvent(event_date, event_type))
+    return events_by_employee
+
+
+def delete_employee_hours_on_days(
+    db: DatabaseSession, days_by_employee: dict[int, list[date]]
+) -> int:
+    """Borra con un único DELETE las horas no archivadas de los días indicados."""
+    result = db.execute(
+        delete(EmployeeHours).where(
+            or_(
+                *(
+                    and_(
+                        EmployeeHours.employee_id == employee_id,
+                        col(EmployeeHours.work_date).in_(days),
+                    )
+                    for employee_id, days in days_by_employee.items()
+                )
+            ),
+            col(EmployeeHours.period_id).is_(None),
+            EmployeeHours.payroll_status != payType.ARCHIVED,
+        )
+    )
+    return result.rowcount
+
+
+def recalculate_dirty_days(
+    db: DatabaseSession, request: PayrollRecalculateRequest
+) -> PayrollRecalculateResponse:
+    """
+    Recalcula solo los días marcados por cambios en las fichadas, en una única
+    transacción, en lugar del rango completo.
+    """
+    started_at = datetime.now()
+    stmt = select(PayrollDirtyDay).order_by(
+        cast(Any, PayrollDirtyDay.employee_id), cast(Any, PayrollDirtyDay.work_date)
     )
+    if request.employee_ids:
+        stmt = stmt.where(col(PayrollDirtyDay.employee_id).in_(request.employee_ids))
+
+    dirty_days = db.exec(stmt).all()
+    closed_periods = (
+        periods.get_closed_periods(
+            db,
+            min(dirty_day.work_date for dirty_day in dirty_days),
+            max(dirty_day.work_date for dirty_day in dirty_days),
+        )
+        if dirty_days
+        else []
+    )
+
+    days_by_employee: dict[int, list[date]] = defaultdict(list)
+    closed_days_by_employee: dict[int, list[date]] = defaultdict(list)
+    for dirty_day in dirty_days:
+        # Los días de períodos cerrados no se recalculan: se descarta la marca
+        if periods.is_in_closed_period(closed_periods, dirty_day.work_date):
+            closed_days_by_employee[dirty_day.employee_id].append(dirty_day.work_date)
+        else:
+            days_by_employee[dirty_day.employee_id].append(dirty_day.work_date)
+
+    # Sin turno no hay cálculo posible: las marcas quedan hasta que se asigne uno
+    employees = db.exec(
+        select(Employee)
+        .where(
+            col(Employee.id).in_(list(days_by_employee)),
+            col(Employee.shift_id).is_not(None),
+        )
+        .options(selectinload(cast(Any, Employee.shift)))
+        .order_by(cast(Any, Employee.id))
+    ).all()
+    days_by_employee = {
+        cast(int, employee.id): days_by_employee[cast(int, employee.id)]
+        for employee in employees
+    }
+    if not days_by_employee:
+        if closed_days_by_employee:
+            delete_dirty_days(db, closed_days_by_employee, started_at)
+            db.commit()
+        return PayrollRecalculateResponse(days_recalculated=0, rows_created=0, employees=[])
+
+    concept_ids = concept_cache.get_ids(db, concepts.PAYROLL_CONCEPTS)
+    first_day = min(min(days) for days in days_by_employee.values())
+    last_day = max(max(days) for days in days_by_employee.values())
+    holidays = get_holiday_calendars(db, employees, first_day, last_day)
+    try:
+        calculation_started = perf_counter()
+        events_by_employee = get_clock_events_for_days(db, days_by_employee)
+        all_rows: list[dict[str, Any]] = []
+        for employee in employees:
+            employee_id = cast(int, employee.id)
+            shift = get_shift_spec(employee)
+            results = engine.evaluate_shift(
+                shift,
+                events_by_employee.get(employee_id, []),
+                days_by_employee[employee_id],
+                holidays=holidays.get(employee_id),
+            )
+            all_rows.extend(build_employee_hours(employee_id, shift.id, results, concept_ids))
+
+        calculation_ms = round((perf_counter() - calculation_started) * 1000)
+
+        rows_deleted = delete_employee_hours_on_days(db, days_by_employee)
+        run_id = runs.record_run(
+            db,
+            kind="dirty",
+            mode=PayrollMode.STANDARD.value,
+            start_date=first_day,
+            end_date=last_day,
+            parameters=request.model_dump(mode="json"),
+            started_at=started_at,
+            calculation_ms=calculation_ms,
+            employees=len(days_by_employee),
+            rows_deleted=rows_deleted,
+            rows_created=len(all_rows),
+        )
+        insert_employee_hours(db, all_rows, run_id)
+        delete_dirty_days(db, days_by_employee, started_at)
+        delete_dirty_days(db, closed_days_by_employee, started_at)
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        concept_cache.invalidate()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing hours: {str(e)}",
+        )
 
-    db.add(employee_hours)
-    db.commit()
-    db.refresh(employee_hours)
+    rows_by_employee = count_rows_by_employee(days_by_employee, all_rows)
+    return PayrollRecalculateResponse(
+        days_recalculated=sum(len(days) for days in days_by_employee.values()),
+        rows_created=len(all_rows),
+        employees=[
+            PayrollBatchEmployeeSummary(employee_id=employee_id, rows_created=rows_created)
+            for employee_id, rows_created in rows_by_employee.items()
+        ],
+    )
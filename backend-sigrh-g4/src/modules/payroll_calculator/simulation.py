@@ -0,0 +1,140 @@
+"""
+Simulación de liquidación con reglas alternativas.
+
+Evalúa en memoria, con las fichadas reales, cómo quedaría un período con otras
+reglas (tolerancia, horas nominales) y lo compara con las reglas actuales. Solo
+lee de la base: no borra, no inserta y no crea conceptos.
+"""
+
+from dataclasses import replace
+from datetime import timedelta
+from typing import cast
+import pandas as pd
+from fastapi import HTTPException, status
+from src.database.core import DatabaseSession
+from src.modules.payroll_calculator import concepts, engine, service, vectorized
+from src.modules.payroll_calculator.periods import time_to_seconds
+from src.modules.payroll_calculator.schemas import (
+    PayrollBatchRequest,
+    PayrollRuleVariant,
+    PayrollSimulationRequest,
+    PayrollSimulationResponse,
+    PayrollSimulationTotals,
+    PayrollSimulationVariantResult,
+)
+
+DAY_KEY = ["employee_id", "work_date"]
+
+
+def summarize(result: pd.DataFrame) -> PayrollSimulationTotals:
+    concept_counts = result["concept"].value_counts()
+    overtime = result["concept"] == concepts.OVERTIME
+    return PayrollSimulationTotals(
+        rows=len(result),
+        full_workdays=int(concept_counts.get(concepts.FULL_WORKDAY, 0)),
+        missing_time_days=int(concept_counts.get(concepts.MISSING_TIME, 0)),
+        overtime_days=int(overtime.sum()),
+        without_check_out_days=int(
+            concept_counts.get(concepts.PRESENT_WITHOUT_CHECK_OUT, 0)
+        ),
+        absence_days=int(concept_counts.get(concepts.ABSENT_WITHOUT_CHECK_IN, 0)),
+        non_working_days=int(concept_counts.get(concepts.NON_WORKING_DAY, 0)),
+        worked_seconds=int(result["sumary_time"].map(time_to_seconds).sum()),
+        overtime_seconds=int(
+            result.loc[overtime, "extra_hours"].map(time_to_seconds).sum()
+        ),
+    )
+
+
+def day_signatures(result: pd.DataFrame) -> pd.Series:
+    """Una firma por empleado y día con lo que se liquidaría ese día."""
+    signature = (
+        result["concept"]
+        + "|"
+        + result["sumary_time"].map(str)
+        + "|"
+        + result["extra_hours"].map(str)
+    )
+    return signature.groupby([result[key] for key in DAY_KEY]).agg("/".join)
+
+
+def apply_variant(
+    shifts: dict[int, engine.ShiftSpec], variant: PayrollRuleVariant
+) -> tuple[dict[int, engine.ShiftSpec], engine.ShiftRules]:
+    rules = engine.ShiftRules(tolerance=timedelta(minutes=variant.tolerance_minutes))
+    if variant.working_hours is None:
+        return shifts, rules
+    return (
+        {
+            employee_id: replace(shift, working_hours=variant.working_hours)
+            for employee_id, shift in shifts.items()
+        },
+        rules,
+    )
+
+
+def simulate_payroll(
+    db: DatabaseSession, request: PayrollSimulationRequest
+) -> PayrollSimulationResponse:
+    if request.end_date < request.start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must be greater than start date",
+        )
+    employees = service.get_payroll_employees(
+        db,
+        PayrollBatchRequest(
+            employee_ids=request.employee_ids,
+            sector_id=request.sector_id,
+            shift_id=request.shift_id,
+            start_date=request.start_date,
+            end_date=request.end_date,
+        ),
+    )
+    shifts = {
+        cast(int, employee.id): service.get_shift_spec(employee) for employee in employees
+    }
+    if not shifts:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No employees with a shift match the filters",
+        )
+    date_range = service.get_date_range(request.start_date, request.end_date)
+
+    # Una sola lectura de fichadas, compartida por todas las variantes
+    events = service.get_clock_events_frame(
+        db, list(shifts), request.start_date, request.end_date
+    )
+    holidays = service.get_holiday_calendars(
+        db, employees, request.start_date, request.end_date
+    )
+    baseline = vectorized.evaluate_population(
+        shifts, events, date_range, holidays=holidays
+    )
+    baseline_days = day_signatures(baseline)
+
+    variants = []
+    for variant in request.variants:
+        variant_shifts, rules = apply_variant(shifts, variant)
+        result = vectorized.evaluate_population(
+            variant_shifts, events, date_range, rules, holidays
+        )
+        changed = day_signatures(result).ne(baseline_days)
+        variants.append(
+            PayrollSimulationVariantResult(
+                name=variant.name,
+                totals=summarize(result),
+                changed_days=int(changed.sum()),
+                changed_employees=int(
+                    changed[changed].index.get_level_values("employee_id").nunique()
+                ),
+            )
+        )
+
+    return PayrollSimulationResponse(
+        start_date=request.start_date,
+        end_date=request.end_date,
+        employees=len(shifts),
+        baseline=summarize(baseline),
+        variants=variants,
+    )
@@ -0,0 +1,311 @@
+"""
+Evaluación columnar (pandas/NumPy) de los turnos para poblaciones grandes.
+
+Aplica las mismas reglas que `engine.evaluate_shift` pero sobre toda la grilla
+empleado x día a la vez, con group-by y operaciones vectorizadas en lugar de
+un ciclo por día.
+"""
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Sequence
+import numpy as np
+import pandas as pd
+from src.modules.employee_hours.models.models import RegisterType, payType
+from src.modules.payroll_calculator import concepts, engine, reasons
+
+if TYPE_CHECKING:
+    from src.modules.holiday.services.calendar_cache import HolidayCalendar
+
+# `is_in` es True para las entradas y False para las salidas
+EVENT_COLUMNS = ["employee_id", "event_date", "is_in"]
+
+_NS_PER_SECOND = 1_000_000_000
+_ONE_DAY = pd.Timedelta(days=1)
+
+
+def pair_intervals(events: pd.DataFrame, max_out_offsets: pd.Series) -> pd.DataFrame:
+    """
+    Versión columnar de `engine.pair_intervals`: numera los tramos con una suma
+    acumulada de las entradas que abren tramo y los agrega con group-by. Devuelve
+    un tramo por fila con `employee_id`, `start`, `end` y `event_count`.
+    `max_out_offsets` es el `max_out_offset` de cada empleado (índice `employee_id`).
+    """
+    events = events.sort_values(["employee_id", "event_date"], kind="stable")
+    day = events["event_date"].dt.normalize()
+    employee_id = events["employee_id"]
+    same_employee = employee_id.eq(employee_id.shift())
+    # Entrada repetida: la fichada anterior es una entrada del mismo empleado y día
+    repeated_in = (
+        events["is_in"]
+        & events["is_in"].shift(fill_value=False).astype(bool)
+        & same_employee
+        & day.eq(day.shift())
+    )
+    opens = events["is_in"] & ~repeated_in
+    interval = opens.astype("int64").groupby(employee_id).cumsum()
+
+    # Las fichadas anteriores a la primera entrada no forman tramo
+    in_interval = interval.to_numpy() > 0
+    events = events[in_interval].assign(day=day[in_interval], interval=interval[in_interval])
+    keys = [events["employee_id"], events["interval"]]
+    start = events.groupby(keys)["event_date"].transform("first")
+    elapsed = events["event_date"] - start
+    out_offset = (events["day"] - start.dt.normalize()).dt.days
+    valid_out = (
+        ~events["is_in"]
+        & (elapsed > pd.Timedelta(0))
+        & (elapsed < _ONE_DAY)
+        & (out_offset <= events["employee_id"].map(max_out_offsets))
+    )
+
+    intervals = (
+        events.assign(
+            start=start,
+            end=events["event_date"].where(valid_out),
+            counted=events["is_in"] | valid_out,
+        )
+        .groupby(keys)
+        .agg(start=("start", "first"), end=("end", "max"), event_count=("counted", "sum"))
+        .reset_index()
+    )
+    return intervals[["employee_id", "start", "end", "event_count"]]
+
+
+def day_intervals(intervals: pd.DataFrame) -> pd.DataFrame:
+    """Entrada, salida del último tramo, tiempo trabajado y fichadas por empleado y día."""
+    intervals = intervals.assign(
+        work_date=intervals["start"].dt.normalize(),
+        duration=intervals["end"] - intervals["start"],
+    )
+    keys = ["employee_id", "work_date"]
+    days = intervals.groupby(keys).agg(
+        check_in=("start", "first"),
+        worked=("duration", "sum"),
+        check_count=("event_count", "sum"),
+    )
+    # La salida del último tramo, aunque falte (`last` de group-by salta los vacíos)
+    last = intervals.drop_duplicates(keys, keep="last").set_index(keys)["end"]
+    days["last_end"] = last.reindex(days.index)
+    return days
+
+
+def _seconds_to_time(seconds: pd.Series) -> pd.Series:
+    """Convierte segundos (< 24 h) en `datetime.time`, dejando None donde no hay valor."""
+    times = pd.to_datetime(seconds.fillna(0).astype("int64"), unit="s").dt.time
+    return times.astype(object).where(seconds.notna(), None)
+
+
+def build_grid(
+    shifts: dict[int, engine.ShiftSpec], date_range: Sequence[date]
+) -> pd.DataFrame:
+    """Una fila por empleado y día del rango, con los atributos de su turno."""
+    employees = pd.DataFrame(
+        [
+            (employee_id, shift.id, shift.type.strip().lower(), shift.working_hours, shift.working_days)
+            for employee_id, shift in shifts.items()
+        ],
+        columns=["employee_id", "shift_id", "shift_type", "working_hours", "working_days"],
+    )
+    days = pd.DataFrame(
+        {"work_date": pd.to_datetime(list(date_range)).astype("datetime64[ns]")}
+    )
+    return employees.merge(days, how="cross")
+
+
+def holiday_mask(
+    shifts: dict[int, engine.ShiftSpec],
+    date_range: Sequence[date],
+    holidays: "dict[int, HolidayCalendar] | None",
+) -> np.ndarray:
+    """Feriado o no por fila de la grilla (mismo orden que `build_grid`)."""
+    if not holidays:
+        return np.zeros(len(shifts) * len(date_range), dtype=bool)
+    # Los empleados de una misma región comparten calendario: una máscara por calendario
+    masks: "dict[HolidayCalendar, np.ndarray]" = {}
+    rows = []
+    no_holidays = np.zeros(len(date_range), dtype=bool)
+    for employee_id in shifts:
+        calendar = holidays.get(employee_id)
+        if calendar is None:
+            rows.append(no_holidays)
+            continue
+        if calendar not in masks:
+            masks[calendar] = np.array(calendar.mask(date_range), dtype=bool)
+        rows.append(masks[calendar])
+    return np.concatenate(rows) if rows else no_holidays[:0]
+
+
+def evaluate_population(
+    shifts: dict[int, engine.ShiftSpec],
+    events: pd.DataFrame,
+    date_range: Sequence[date],
+    rules: engine.ShiftRules = engine.ShiftRules(),
+    holidays: "dict[int, HolidayCalendar] | None" = None,
+) -> pd.DataFrame:
+    """
+    Evalúa a todos los empleados de `shifts` sobre `date_range`. `events` tiene
+    las columnas de `EVENT_COLUMNS` e incluye el día siguiente al rango. Devuelve
+    un DataFrame con una fila por cada `employee_hours` a generar. `holidays`
+    tiene el calendario de días no hábiles de cada empleado.
+    """
+    grid = build_grid(shifts, date_range)
+    grid["holiday"] = holiday_mask(shifts, date_range, holidays)
+
+    type_rules = {
+        employee_id: engine.get_shift_type_rule(shift.type)
+        for employee_id, shift in shifts.items()
+    }
+    max_out_offsets = pd.Series(
+        {employee_id: rule.max_out_offset for employee_id, rule in type_rules.items()},
+        dtype="int64",
+    )
+    days = day_intervals(pair_intervals(events, max_out_offsets))
+    keys = pd.MultiIndex.from_arrays([grid["employee_id"], grid["work_date"]])
+    days = days.reindex(keys)
+    grid["check_in"] = days["check_in"].to_numpy()
+    grid["check_count"] = days["check_count"].fillna(0).astype("int64").to_numpy()
+    last_end = pd.Series(days["last_end"].to_numpy(), index=grid.index)
+    worked = pd.Series(days["worked"].to_numpy(), index=grid.index)
+
+    # La jornada la cierra la salida del último tramo, si cae en un día válido
+    # para el tipo de turno
+    closes = pd.Series(False, index=grid.index)
+    out_offset = (last_end.dt.normalize() - grid["work_date"]).dt.days
+    for shift_type, type_grid in grid.groupby("shift_type"):
+        type_rule = engine.get_shift_type_rule(str(shift_type))
+        closes[type_grid.index] = out_offset[type_grid.index].isin(type_rule.out_day_offsets)
+    closes &= worked < _ONE_DAY
+    grid["check_out"] = last_end.where(closes)
+    worked = worked.where(closes)
+    worked_seconds = worked.to_numpy(dtype="int64", na_value=0) // _NS_PER_SECOND
+    worked_minutes = worked_seconds // 60
+    nominal_minutes = (grid["working_hours"] * 60).round().astype("int64").to_numpy()
+    tolerance_minutes = int(rules.tolerance.total_seconds()) // 60
+
+    working_day = (
+        grid["work_date"].dt.weekday.to_numpy() < grid["working_days"].to_numpy()
+    ) & ~grid["holiday"].to_numpy()
+    has_in = grid["check_in"].notna().to_numpy()
+    has_out = grid["check_out"].notna().to_numpy()
+
+    conditions = [
+        ~working_day,
+        ~has_in,
+        ~has_out,
+        worked_minutes < nominal_minutes - tolerance_minutes,
+        worked_minutes <= nominal_minutes + tolerance_minutes,
+    ]
+    outcome = np.select(
+        conditions,
+        ["non_working", "absent", "no_out", "missing", "full"],
+        default="overtime",
+    )
+
+    grid["worked_seconds"] = np.where(has_out, worked_seconds, np.nan)
+    grid["missing_minutes"] = nominal_minutes - worked_minutes
+    grid["extra_minutes"] = worked_minutes - nominal_minutes
+    grid["nominal_minutes"] = nominal_minutes
+    grid["outcome"] = outcome
+    grid.loc[grid["outcome"].isin(["non_working", "absent"]), "check_count"] = 0
+
+    overtime = grid[grid["outcome"] == "overtime"]
+    # Las horas extra generan dos filas: jornada completa + horas extra
+    result = pd.concat(
+        [grid.assign(row_kind=grid["outcome"]), overtime.assign(row_kind="extra")],
+        ignore_index=True,
+    )
+    return _describe(result)
+
+
+def _describe(result: pd.DataFrame) -> pd.DataFrame:
+    kind = result["row_kind"]
+    presence = ~kind.isin(["non_working", "absent"])
+
+    result["concept"] = kind.map(
+        {
+            "non_working": concepts.NON_WORKING_DAY,
+            "absent": concepts.ABSENT_WITHOUT_CHECK_IN,
+            "no_out": concepts.PRESENT_WITHOUT_CHECK_OUT,
+            "missing": concepts.MISSING_TIME,
+            "full": concepts.FULL_WORKDAY,
+            "overtime": concepts.FULL_WORKDAY,
+            "extra": concepts.OVERTIME,
+        }
+    )
+    result["register_type"] = kind.map(
+        {
+            "non_working": RegisterType.DIA_NO_HABIL,
+            "absent": RegisterType.AUSENCIA,
+        }
+    ).where(~presence, RegisterType.PRESENCIA)
+    result["payroll_status"] = kind.map(
+        {
+            "full": payType.PAYABLE,
+            "overtime": payType.PAYABLE,
+            "extra": payType.PENDING_VALIDATION,
+        }
+    ).fillna(payType.NOT_PAYABLE)
+
+    first_check_in = result["check_in"].dt.time.astype(object)
+    last_check_out = result["check_out"].dt.time.astype(object)
+    result["first_check_in"] = first_check_in.where(presence, None)
+    result["last_check_out"] = last_check_out.where(
+        kind.isin(["missing", "full", "overtime", "extra"]), None
+    )
+
+    worked = result["worked_seconds"].where(kind.isin(["missing", "full"]))
+    nominal = (result["nominal_minutes"] * 60).where(kind == "overtime")
+    result["sumary_time"] = _seconds_to_time(worked.fillna(nominal))
+    result["extra_hours"] = _seconds_to_time(
+        (result["extra_minutes"] * 60).where(kind == "extra")
+    )
+
+    result["reason_code"] = kind.map(
+        {
+            "non_working": reasons.NON_WORKING_DAY,
+            "absent": reasons.ABSENT,
+            "no_out": reasons.NO_CHECK_OUT,
+            "missing": reasons.MISSING_TIME,
+            "full": reasons.FULL_WORKDAY,
+            "overtime": reasons.FULL_WORKDAY,
+            "extra": reasons.OVERTIME,
+        }
+    )
+    # Solo el tiempo faltante necesita texto propio (ver `reasons`)
+    missing = kind == "missing"
+    result["notes"] = ""
+    result.loc[missing, "notes"] = (
+        result.loc[missing, "missing_minutes"]
+        .fillna(0)
+        .astype("int64")
+        .map(reasons.missing_time_notes)
+    )
+
+    result["work_date"] = result["work_date"].dt.date
+    return result.sort_values(["employee_id", "work_date"], kind="stable")[
+        [
+            "employee_id",
+            "shift_id",
+            "work_date",
+            "concept",
+            "register_type",
+            "payroll_status",
+            "check_count",
+            "first_check_in",
+            "last_check_out",
+            "sumary_time",
+            "extra_hours",
+            "reason_code",
+            "notes",
+        ]
+    ]
+
+
+def build_employee_hours(
+    result: pd.DataFrame, concept_ids: dict[str, int]
+) -> list[dict[str, Any]]:
+    """Filas listas para `insert_employee_hours` (tipos nativos de Python)."""
+    rows = result.assign(concept_id=result["concept"].map(concept_ids)).drop(
+        columns="concept"
+    )
+    return rows.to_dict("records")